@@ -115,7 +115,11 @@ MIDDLEWARE = [
     # CORS middleware must be placed as high as possible to handle preflight requests
     # 프리플라이트 요청 처리를 위해 CORS 미들웨어는 가능한 최상단에 위치해야 함
     "corsheaders.middleware.CorsMiddleware",
-    
+
+    # Records query count, SQL time and duplicate queries per request
+    # 요청별 쿼리 수, SQL 시간, 중복 쿼리를 기록 (N+1 문제 감지용)
+    "tutor.middleware.QueryInstrumentationMiddleware",
+
     # Enforces security enhancements (e.g., SSL redirect, XSS protection)
     # 보안 강화 (SSL 리다이렉트, XSS 보호 등) 적용
     "django.middleware.security.SecurityMiddleware",
@@ -260,6 +264,66 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 
+# Protected media delivery after the ownership check (`tutor.views.protected_media`)
+# "x-accel": nginx serves the file from an internal location, e.g.
+#   location /protected-media/ { internal; alias /app/media/; }
+# "x-sendfile": Apache/lighttpd serve the absolute file path
+# "": Django streams the file itself with range support (development only)
+# 소유권 확인 후 보호된 미디어 전송 방식 (`tutor.views.protected_media`)
+# "x-accel": nginx가 internal location에서 파일을 전송
+# "x-sendfile": Apache/lighttpd가 절대 경로의 파일을 전송
+# "": Django가 범위 요청을 지원하며 직접 스트리밍 (개발 환경 전용)
+MEDIA_ACCEL_MODE = os.environ.get("MEDIA_ACCEL_MODE", "").lower()
+MEDIA_ACCEL_PREFIX = os.environ.get("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
+# Resumable chunked uploads (exam attachments)
+# Chunks are staged on local disk until the upload is completed.
+# The default (BASE_DIR/tmp/uploads, gitignored) only suits a single host: with several
+# app servers, point CHUNKED_UPLOAD_TEMP_DIR at a volume shared by all of them.
+# 이어받기 가능한 청크 업로드 설정 (시험 첨부파일)
+# 업로드가 완료될 때까지 청크는 로컬 디스크에 임시 저장됨.
+# 기본값(BASE_DIR/tmp/uploads, gitignore 대상)은 단일 호스트에만 적합하며, 앱 서버가
+# 여러 대라면 CHUNKED_UPLOAD_TEMP_DIR을 모든 서버가 공유하는 볼륨으로 지정해야 함
+CHUNKED_UPLOAD_TEMP_DIR = os.environ.get(
+    "CHUNKED_UPLOAD_TEMP_DIR", str(BASE_DIR / "tmp" / "uploads")
+)
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = int(
+    os.environ.get("CHUNKED_UPLOAD_MAX_CHUNK_SIZE", str(8 * 1024 * 1024))
+)
+CHUNKED_UPLOAD_MAX_FILE_SIZE = int(
+    os.environ.get("CHUNKED_UPLOAD_MAX_FILE_SIZE", str(500 * 1024 * 1024))
+)
+# Unfinished uploads older than this are removed by `purge_stale_uploads`
+# 이 시간보다 오래된 미완료 업로드는 `purge_stale_uploads`가 삭제함
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.environ.get("CHUNKED_UPLOAD_EXPIRY_HOURS", "24"))
+
+# Attachment previews (longest side in px), generated by `generate_thumbnails`
+# 첨부파일 미리보기 크기 (긴 변 기준 px), `generate_thumbnails`가 생성함
+ATTACHMENT_THUMBNAIL_SIZE = int(os.environ.get("ATTACHMENT_THUMBNAIL_SIZE", "320"))
+
+# Payment reminders for overdue invoices (`remind_overdue_invoices`, cron daily):
+# repeated every INTERVAL days, at most MAX_COUNT times per invoice
+# 연체 영수증 결제 알림 (`remind_overdue_invoices`, cron 매일):
+# INTERVAL일마다 반복하며, 영수증당 최대 MAX_COUNT회
+INVOICE_REMINDER_INTERVAL_DAYS = int(os.environ.get("INVOICE_REMINDER_INTERVAL_DAYS", "7"))
+INVOICE_REMINDER_MAX_COUNT = int(os.environ.get("INVOICE_REMINDER_MAX_COUNT", "3"))
+
+# Payment term (days after the invoice date) of drafts created by the monthly billing run
+# 월간 일괄 정산으로 생성되는 임시저장 영수증의 결제 기한 (영수증 날짜 기준 일수)
+INVOICE_BILLING_DUE_DAYS = int(os.environ.get("INVOICE_BILLING_DUE_DAYS", "14"))
+
+# Accounts of the DATEV accounting export (SKR03 defaults): collective debtor account and
+# revenue accounts per VAT rate; small businesses (§19 UStG) book to their own account
+# DATEV 회계 내보내기 계정 (SKR03 기본값): 공동 채무자 계정과 부가세율별 매출 계정,
+# 소규모 사업자(§19 UStG)는 별도 계정에 기록
+DATEV_DEBTOR_ACCOUNT = os.environ.get("DATEV_DEBTOR_ACCOUNT", "10000")
+DATEV_REVENUE_ACCOUNTS = {
+    "19": os.environ.get("DATEV_REVENUE_ACCOUNT_19", "8400"),
+    "7": os.environ.get("DATEV_REVENUE_ACCOUNT_7", "8300"),
+    "0": os.environ.get("DATEV_REVENUE_ACCOUNT_0", "8100"),
+}
+DATEV_SMALL_BUSINESS_ACCOUNT = os.environ.get("DATEV_SMALL_BUSINESS_ACCOUNT", "8195")
+
 # Custom user model definition
 # 커스텀 유저 모델 지정
 AUTH_USER_MODEL = "tutor.Tutor"
@@ -305,7 +369,23 @@ SOCIALACCOUNT_ADAPTER = "tutor.adapters.CustomSocialAccountAdapter"
 
 
 # Email Configuration (Brevo API / Anymail)
-EMAIL_BACKEND = "anymail.backends.brevo.EmailBackend"
+# Mail is queued in the database (tutor.mail.OutboxEmailBackend) and delivered through
+# EMAIL_OUTBOX_BACKEND by `send_queued_email` (cron, every minute)
+# 메일은 DB 대기열(tutor.mail.OutboxEmailBackend)에 저장되고,
+# `send_queued_email`(cron, 매분)이 EMAIL_OUTBOX_BACKEND로 발송함
+EMAIL_BACKEND = "tutor.mail.OutboxEmailBackend"
+EMAIL_OUTBOX_BACKEND = os.environ.get(
+    "EMAIL_OUTBOX_BACKEND", "anymail.backends.brevo.EmailBackend"
+)
+# Retry delay doubles per failed attempt (60s, 2m, 4m, ...); after the last attempt
+# the email is kept as dead letter (status DEAD)
+# 재시도 대기 시간은 실패할 때마다 두 배 (60초, 2분, 4분, ...)이며,
+# 마지막 시도 후에는 데드 레터(DEAD 상태)로 보관됨
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.environ.get("EMAIL_OUTBOX_RETRY_DELAY", "60"))
+# A worker that crashed mid-batch releases its emails after this many seconds
+# 배치 처리 중 비정상 종료된 워커의 메일은 이 시간(초) 후 다시 발송 대상이 됨
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.environ.get("EMAIL_OUTBOX_LEASE_SECONDS", "600"))
 ANYMAIL = {
     "BREVO_API_KEY": os.environ.get("BREVO_API_KEY"),
     "SEND_DEFAULTS": {
@@ -438,8 +518,10 @@ ACCOUNT_DEFAULT_HTTP_PROTOCOL = "https"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         # Prioritize JWT Cookie Authentication for stateless API requests
+        # (Tutor lookup is served from a short-TTL cache)
         # 상태가 없는 API 요청을 위해 JWT 쿠키 인증을 최우선으로 설정합니다
-        "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
+        # (Tutor 조회는 짧은 TTL 캐시에서 처리)
+        "tutor.authentication.CachedJWTCookieAuthentication",
         
         # Use Custom Session Authentication that skips CSRF checks
         # CSRF 검사를 건너뛰는 커스텀 세션 인증 사용
@@ -452,6 +534,98 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
 }
 
+# JSON backend of the API: "orjson" (fast, same output as DRF) or "json" (DRF's stdlib renderer)
+# API JSON 백엔드: "orjson" (빠르며 DRF와 동일한 출력) 또는 "json" (DRF 표준 라이브러리 렌더러)
+API_JSON_BACKEND = os.environ.get("API_JSON_BACKEND", "orjson").lower()
+if API_JSON_BACKEND == "orjson":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "tutor.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "tutor.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
+# Cache configuration
+# Use Redis when REDIS_URL is set (shared across workers), otherwise per-process memory
+# 캐시 설정: REDIS_URL이 있으면 Redis(워커 간 공유), 없으면 프로세스별 메모리 캐시 사용
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pf3-manager",
+        }
+    }
+
+# TTL (seconds) of the cached Tutor used by the JWT and session authentication; 0 disables it.
+# Only enabled by default with the shared Redis cache: the per-process memory cache is only
+# invalidated in the worker that saved the user, so a deactivated account would stay
+# authenticated on the other workers until the TTL expires.
+# JWT 및 세션 인증에서 사용하는 Tutor 캐시 TTL(초); 0이면 비활성화됩니다.
+# 공유 Redis 캐시에서만 기본으로 활성화됩니다: 프로세스별 메모리 캐시는 사용자를 저장한
+# 워커에서만 무효화되므로, 비활성화된 계정이 TTL이 끝날 때까지 다른 워커에서 인증될 수 있습니다.
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", "60" if REDIS_URL else "0"))
+
+# TTL (seconds) of cached analytics results; keys also change with every invoice write
+# 캐시된 분석 결과의 TTL(초); 영수증이 변경될 때마다 캐시 키도 바뀜
+ANALYTICS_CACHE_TTL = int(os.environ.get("ANALYTICS_CACHE_TTL", "900"))
+
+# TTL (seconds) of rendered invoice previews, keyed on a hash of the rendered context
+# 렌더링된 영수증 미리보기의 TTL(초), 렌더링 컨텍스트의 해시를 키로 사용
+INVOICE_PREVIEW_CACHE_TTL = int(os.environ.get("INVOICE_PREVIEW_CACHE_TTL", "600"))
+
+# Seconds an identical preview request waits for a render already in progress before
+# rendering itself; kept short because the waiting request holds a worker
+# 동일한 미리보기 요청이 직접 렌더링하기 전에 진행 중인 렌더링을 기다리는 시간(초);
+# 대기 중인 요청이 워커를 점유하므로 짧게 유지함
+INVOICE_PREVIEW_RENDER_WAIT = float(os.environ.get("INVOICE_PREVIEW_RENDER_WAIT", "1"))
+
+# WeasyPrint PDF variant of the archival invoice PDF stored after finalization
+# 확정 후 보관되는 영수증 PDF의 WeasyPrint PDF 형식
+INVOICE_ARCHIVE_PDF_VARIANT = os.environ.get("INVOICE_ARCHIVE_PDF_VARIANT", "pdf/a-3b")
+
+# Seconds after which a RUNNING data export counts as abandoned (worker killed) and fails
+# RUNNING 상태의 데이터 내보내기가 중단된 것으로(작업자 종료) 간주되어 실패 처리되는 시간(초)
+DATA_EXPORT_LEASE = int(os.environ.get("DATA_EXPORT_LEASE", "3600"))
+
+# Maximum number of rows a single bulk request (invoices, lessons) may change
+# 일괄 요청(영수증, 수업) 한 번으로 변경할 수 있는 최대 행 수
+BULK_UPDATE_MAX_ITEMS = int(os.environ.get("BULK_UPDATE_MAX_ITEMS", "500"))
+
+# Query instrumentation (tutor.middleware.QueryInstrumentationMiddleware)
+# DEBUG: Server-Timing header / Production: structured JSON logs
+# 쿼리 계측 설정 (DEBUG: Server-Timing 헤더, 운영: 구조화된 JSON 로그)
+QUERY_INSTRUMENTATION_ENABLED = (
+    os.environ.get("QUERY_INSTRUMENTATION_ENABLED", "True").lower() == "true"
+)
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+SLOW_REQUEST_QUERY_THRESHOLD = int(os.environ.get("SLOW_REQUEST_QUERY_THRESHOLD", "50"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "tutor": {
+            "handlers": ["console"],
+            "level": os.environ.get("TUTOR_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
     SECURE_SSL_REDIRECT = True
@@ -1,11 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
-from django.views.static import serve
 from django.http import JsonResponse
 
-from tutor.views import social_login_callback
+from tutor.views import protected_media, social_login_callback
 
 # Placeholder view for password reset confirmation
 # 비밀번호 재설정 확인을 위한 플레이스홀더 뷰
@@ -52,13 +50,12 @@ urlpatterns = [
     path("api/social/callback/", social_login_callback, name="social_callback"),
 ]
 
-# Serve media files
-# 미디어 파일 제공
+# Serve media files only to their owners (the proxy streams them in production)
+# 미디어 파일은 소유자에게만 제공 (운영 환경에서는 프록시가 전송)
 urlpatterns += [
-    re_path(r"^media/(?P<path>.*)$", serve, {"document_root": settings.MEDIA_ROOT}),
+    re_path(
+        rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$",
+        protected_media,
+        name="protected_media",
+    ),
 ]
-
-# Serve media files during development
-# 개발 중 미디어 파일 제공
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1394,12 +1394,14 @@ export default function InvoiceCreateModal({
     setSubmitError(null);
     try {
       const payload = getInvoicePayload();
-      const response = await api.post("/api/invoices/preview_pdf/", payload, {
+      // HTML preview (no PDF rendering); the PDF is only rendered for the final download
+      // HTML 미리보기 (PDF 렌더링 없음); PDF는 최종 다운로드 시에만 렌더링
+      const response = await api.post("/api/invoices/preview_html/", payload, {
         responseType: "blob",
       });
-      const pdfBlob = new Blob([response.data], { type: "application/pdf" });
-      const pdfUrl = URL.createObjectURL(pdfBlob);
-      window.open(pdfUrl, "_blank");
+      const htmlBlob = new Blob([response.data], { type: "text/html" });
+      const previewUrl = URL.createObjectURL(htmlBlob);
+      window.open(previewUrl, "_blank");
     } catch (err) {
       console.error("Preview failed", err);
       setSubmitError("Die Vorschau konnte nicht geladen werden.");
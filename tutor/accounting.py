@@ -0,0 +1,244 @@
+import csv
+import logging
+import unicodedata
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Invoice
+
+
+logger = logging.getLogger("tutor.accounting")
+
+CENT = Decimal("0.01")
+
+DATEV_ENCODING = "cp1252"
+
+# Latin letters without a decomposition into a base letter and a combining mark
+# 기본 문자와 결합 부호로 분해되지 않는 라틴 문자
+TRANSLITERATIONS = str.maketrans({"Ł": "L", "ł": "l", "Đ": "D", "đ": "d", "ı": "i", "Ħ": "H", "ħ": "h"})
+
+# Chunk size of the invoice iterator (items and adjustments are prefetched per chunk)
+# 영수증 이터레이터의 청크 크기 (항목과 조정 항목은 청크 단위로 prefetch)
+EXPORT_CHUNK_SIZE = 500
+
+# Column names of the DATEV "Buchungsstapel" format, plus the net/VAT split per row
+# DATEV "Buchungsstapel" 형식의 컬럼명과 행별 Netto/USt 분할 정보
+DATEV_COLUMNS = [
+    "Umsatz (ohne Soll/Haben-Kz)",
+    "Soll/Haben-Kennzeichen",
+    "WKZ Umsatz",
+    "Konto",
+    "Gegenkonto (ohne BU-Schlüssel)",
+    "BU-Schlüssel",
+    "Belegdatum",
+    "Belegfeld 1",
+    "Belegfeld 2",
+    "Buchungstext",
+    "Leistungsdatum",
+    "Nettobetrag",
+    "USt-Satz",
+    "USt-Betrag",
+]
+
+
+def to_cents(value):
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def format_amount(value):
+    # DATEV expects a decimal comma without thousands separators
+    # DATEV는 천 단위 구분 기호 없이 쉼표 소수점을 사용함
+    return f"{value:.2f}".replace(".", ",")
+
+
+def format_rate(rate):
+    return f"{rate.normalize():f}"
+
+
+def export_invoices(tutor, start, end):
+    """
+    Finalized invoices of the tutor dated within [start, end] (invoice date, else creation date).
+
+    [start, end] 기간에 발행된 튜터의 확정 영수증 (영수증 날짜, 없으면 생성일 기준).
+    """
+    return (
+        Invoice.objects.filter(
+            Q(invoice_date__range=(start, end))
+            | Q(invoice_date__isnull=True, created_at__date__range=(start, end)),
+            tutor=tutor,
+            is_finalized=True,
+        )
+        .select_related("student")
+        .prefetch_related("items", "adjustments")
+        .order_by("invoice_date", "created_at", "pk")
+    )
+
+
+def vat_split(invoice):
+    """
+    Split an invoice into (vat_rate, net, vat) parts that add up to the totals of
+    Invoice.calculate_financials. Adjustments follow the same rules: discounts reduce
+    every rate in proportion to the item subtotal, surcharges are taxed at 19%
+    (0% for small businesses). Rounding remainders go to the largest part.
+
+    영수증을 (부가세율, Netto, USt) 부분으로 나누며, 합계는 Invoice.calculate_financials의
+    총액과 일치합니다. 조정 항목도 같은 규칙을 따릅니다: 할인은 항목 소계 비율에 따라
+    각 세율에서 차감되고, 추가금은 19%(소규모 사업자는 0%)로 과세됩니다.
+    반올림 차이는 가장 큰 부분에 반영합니다.
+    """
+    items = list(invoice.items.all())
+    adjustments = list(invoice.adjustments.all())
+    calculated = Invoice.calculate_financials(
+        items, adjustments, is_small_business=invoice.is_small_business
+    )
+
+    parts = {}
+    for item in calculated["items"]:
+        part = parts.setdefault(item["vat_rate"], [Decimal("0"), Decimal("0")])
+        part[0] += item["total_price"]
+        part[1] += item["total_price"] * (item["vat_rate"] / 100)
+
+    items_total = calculated["items_total"]
+    item_net = {rate: part[0] for rate, part in parts.items()}
+    for adjustment in calculated["adjustments"]:
+        amount = adjustment["amount"]
+        if adjustment["type"] == "DISCOUNT":
+            if items_total > 0:
+                for rate, part in parts.items():
+                    part[0] -= amount * item_net.get(rate, 0) / items_total
+                    part[1] -= amount * part[1] / items_total
+        else:
+            rate = Decimal("0") if invoice.is_small_business else Decimal("19")
+            part = parts.setdefault(rate, [Decimal("0"), Decimal("0")])
+            part[0] += amount
+            part[1] += amount * rate / 100
+
+    rounded = {rate: [to_cents(net), to_cents(vat)] for rate, (net, vat) in parts.items()}
+    if rounded:
+        # Absorb rounding remainders and the zero floors of calculate_financials
+        # 반올림 차이와 calculate_financials의 0 하한 처리를 보정
+        largest = max(rounded, key=lambda rate: abs(rounded[rate][0]))
+        rounded[largest][0] += to_cents(calculated["subtotal"]) - sum(
+            net for net, _vat in rounded.values()
+        )
+        rounded[largest][1] += to_cents(calculated["vat_amount"]) - sum(
+            vat for _net, vat in rounded.values()
+        )
+    return [
+        (rate, net, vat)
+        for rate, (net, vat) in sorted(rounded.items(), reverse=True)
+        if net or vat
+    ]
+
+
+def revenue_account(invoice, rate):
+    if invoice.is_small_business:
+        return settings.DATEV_SMALL_BUSINESS_ACCOUNT
+    return settings.DATEV_REVENUE_ACCOUNTS.get(format_rate(rate), "")
+
+
+def datev_rows(invoices):
+    """
+    One booking row per invoice and VAT rate: the gross amount is debited to the debtor
+    account against the revenue account of the rate (credit notes are booked as "H").
+
+    영수증 및 부가세율마다 한 개의 분개 행을 생성합니다: 총액을 매출 계정에 대응하여
+    채무자 계정의 차변에 기록합니다 (마이너스 금액은 대변 "H"로 기록).
+    """
+    for invoice in invoices.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        document_date = invoice.invoice_date or invoice.created_at.date()
+        for rate, net, vat in vat_split(invoice):
+            gross = net + vat
+            yield [
+                format_amount(abs(gross)),
+                "S" if gross >= 0 else "H",
+                "EUR",
+                settings.DATEV_DEBTOR_ACCOUNT,
+                revenue_account(invoice, rate),
+                "",
+                document_date.strftime("%d.%m.%Y"),
+                invoice.full_invoice_code,
+                invoice.student.customer_number if invoice.student else "",
+                invoice.recipient_name[:60],
+                invoice.delivery_date_start.strftime("%d.%m.%Y")
+                if invoice.delivery_date_start
+                else "",
+                format_amount(net),
+                format_rate(rate),
+                format_amount(vat),
+            ]
+
+
+class Echo:
+    """
+    Pseudo-buffer for csv.writer: `write` returns the line instead of storing it.
+
+    csv.writer용 의사 버퍼: `write`가 줄을 저장하지 않고 그대로 반환합니다.
+    """
+
+    def write(self, value):
+        return value
+
+
+def to_datev_text(value):
+    """
+    Fit a value into Windows-1252: characters outside it are transliterated to their
+    base letters (e.g. "Dvořák" -> "Dvorák"). Returns (text, complete); `complete` is
+    False if characters without a Latin equivalent (e.g. Hangul) had to be replaced by "?".
+
+    값을 Windows-1252에 맞춥니다: 범위 밖의 문자는 기본 문자로 음역합니다
+    (예: "Dvořák" -> "Dvorák"). (텍스트, complete)를 반환하며, 라틴 문자 대응이 없는
+    문자(예: 한글)를 "?"로 바꿔야 했다면 `complete`는 False입니다.
+    """
+    try:
+        value.encode(DATEV_ENCODING)
+        return value, True
+    except UnicodeEncodeError:
+        pass
+
+    characters = []
+    for character in value.translate(TRANSLITERATIONS):
+        try:
+            character.encode(DATEV_ENCODING)
+        except UnicodeEncodeError:
+            base = "".join(
+                part
+                for part in unicodedata.normalize("NFKD", character)
+                if not unicodedata.combining(part)
+            )
+            try:
+                base.encode(DATEV_ENCODING)
+                character = base
+            except UnicodeEncodeError:
+                pass
+        characters.append(character)
+    text = "".join(characters)
+    return text, text.encode(DATEV_ENCODING, errors="replace").decode(DATEV_ENCODING) == text
+
+
+def stream_datev_csv(invoices):
+    """
+    Yield the DATEV CSV line by line (semicolon separated, Windows-1252 as DATEV expects),
+    so neither the rows nor the file are ever held in memory.
+    Texts outside Windows-1252 are transliterated; a warning names every booking whose
+    text could still not be represented.
+
+    DATEV CSV를 한 줄씩 생성합니다 (DATEV 규격에 따라 세미콜론 구분, Windows-1252).
+    행이나 파일 전체를 메모리에 보관하지 않습니다.
+    Windows-1252 범위 밖의 텍스트는 음역하며, 그래도 표현할 수 없는 텍스트가 있는
+    분개마다 경고를 기록합니다.
+    """
+    writer = csv.writer(Echo(), delimiter=";", quoting=csv.QUOTE_MINIMAL)
+    yield writer.writerow(DATEV_COLUMNS).encode(DATEV_ENCODING)
+    for row in datev_rows(invoices):
+        fields = [to_datev_text(value) for value in row]
+        if not all(complete for _text, complete in fields):
+            logger.warning(
+                "DATEV export: booking text of %s is not representable in Windows-1252 "
+                "and was exported with '?'",
+                row[7],
+            )
+        line = writer.writerow([text for text, _complete in fields])
+        yield line.encode(DATEV_ENCODING, errors="replace")
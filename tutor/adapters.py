@@ -23,6 +23,10 @@ class CustomAccountAdapter(DefaultAccountAdapter):
         """
         Inject backend base URL into allauth email templates so static asset URLs
         can be generated as absolute links.
+        The mail is queued in the outbox (tutor.mail) and delivered by `send_queued_email`.
+
+        정적 파일 URL을 절대 경로로 만들 수 있도록 allauth 메일 템플릿에 백엔드 URL을 주입합니다.
+        메일은 아웃박스(tutor.mail)에 저장되며 `send_queued_email`이 발송합니다.
         """
         backend_base_url = getattr(
             settings, "BACKEND_BASE_URL", "http://127.0.0.1:8000"
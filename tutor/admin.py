@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .models import (
@@ -20,6 +21,8 @@ from .models import (
     Invoice,
     InvoiceItem,
     InvoiceAdjustment,
+    DataExport,
+    OutboundEmail,
 )
 
 
@@ -655,6 +658,11 @@ class InvoiceAdmin(admin.ModelAdmin):
         "vat_amount",
         "total_adjustment_amount",
         "total_amount",
+        "reminder_count",
+        "reminded_at",
+        "archived_pdf",
+        "archived_pdf_sha256",
+        "archived_pdf_status",
     )
 
     fieldsets = (
@@ -687,10 +695,17 @@ class InvoiceAdmin(admin.ModelAdmin):
             },
         ),
         ("Snapshot", {"fields": ("sender_data",)}),
+        (
+            "Archive",
+            {
+                "fields": ("archived_pdf_status", "archived_pdf", "archived_pdf_sha256"),
+                "classes": ("collapse",),
+            },
+        ),
         (
             "Delivery Options",
             {
-                "fields": ("is_sent",),
+                "fields": ("is_sent", "reminder_count", "reminded_at"),
                 "classes": ("collapse",),
             },
         ),
@@ -750,3 +765,49 @@ class InvoiceAdmin(admin.ModelAdmin):
         if obj and obj.is_finalized:
             return False
         return super().has_delete_permission(request, obj)
+
+
+# ==========================================
+# 9. Data Export
+# ==========================================
+@admin.register(DataExport)
+class DataExportAdmin(admin.ModelAdmin):
+    """
+    Data Export Admin Configuration.
+    Shows export jobs with their status and progress (read-only).
+
+    데이터 내보내기 관리자 설정.
+    내보내기 작업의 상태와 진행률을 표시함 (읽기 전용).
+    """
+
+    list_display = ("tutor", "status", "progress", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("status", "progress", "file", "error", "started_at", "finished_at")
+
+
+# ==========================================
+# 10. Email Outbox
+# ==========================================
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """
+    Email Outbox Admin Configuration.
+    Shows queued mail with its delivery state; dead letters can be requeued.
+
+    메일 아웃박스 관리자 설정.
+    대기열 메일과 발송 상태를 표시하며, 데드 레터는 다시 대기열에 넣을 수 있음.
+    """
+
+    list_display = ("subject", "to", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = ("status", "attempts", "next_attempt_at", "last_error", "sent_at")
+    actions = ["requeue"]
+
+    @admin.action(description=_("Erneut senden"))
+    def requeue(self, request, queryset):
+        queryset.exclude(status=OutboundEmail.StatusChoices.SENT).update(
+            status=OutboundEmail.StatusChoices.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
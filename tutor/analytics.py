@@ -0,0 +1,153 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField, DecimalField, F, Func, Max, Q, Sum, Value, Window
+from django.db.models.functions import Coalesce, Lag, Rank, TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import Invoice
+
+
+class WindowSum(Func):
+    """
+    SUM() usable as a window over grouped aggregates
+    (Django's Sum refuses an aggregate as its argument).
+
+    그룹 집계 결과 위에서 윈도우로 사용할 수 있는 SUM()
+    (Django의 Sum은 집계 결과를 인자로 받지 않음).
+    """
+
+    function = "SUM"
+    window_compatible = True
+
+
+ZERO = Value(Decimal("0.00"), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def amount(field, **filters):
+    return Coalesce(Sum(field, filter=Q(**filters) if filters else None), ZERO)
+
+
+def period_invoices(tutor, start, end):
+    """
+    Finalized invoices of the tutor dated within [start, end] (invoice date, else creation date).
+
+    [start, end] 기간에 발행된 튜터의 확정 영수증 (영수증 날짜, 없으면 생성일 기준).
+    """
+    return Invoice.objects.filter(
+        Q(invoice_date__range=(start, end))
+        | Q(invoice_date__isnull=True, created_at__date__range=(start, end)),
+        tutor=tutor,
+        is_finalized=True,
+    )
+
+
+def monthly_revenue(invoices):
+    """
+    Invoiced, paid and outstanding amounts and VAT per month, with the running total
+    and the previous month's amount computed by window functions over the groups.
+
+    월별 청구액, 입금액, 미수금 및 부가세를 집계하며, 누적 합계와 전월 청구액은
+    그룹 위에서 윈도우 함수로 계산합니다.
+    """
+    month = TruncMonth(
+        Coalesce("invoice_date", TruncDate("created_at")), output_field=DateField()
+    )
+    by_month = F("month").asc()
+    return (
+        invoices.annotate(month=month)
+        .values("month")
+        .annotate(
+            invoice_count=Count("pk"),
+            invoiced=amount("total_amount"),
+            paid=amount("total_amount", is_paid=True),
+            outstanding=amount("total_amount", is_paid=False),
+            net=amount("subtotal"),
+            vat=amount("vat_amount"),
+        )
+        .annotate(
+            cumulative_invoiced=Window(WindowSum(F("invoiced")), order_by=by_month),
+            previous_invoiced=Window(Lag("invoiced"), order_by=by_month),
+        )
+        .order_by("month")
+    )
+
+
+def student_ranking(invoices, limit):
+    """
+    Revenue per student ranked by invoiced amount (RANK() over the groups), top `limit`.
+
+    학생별 매출을 청구액 기준으로 순위를 매겨(그룹 위의 RANK()) 상위 `limit`명을 반환합니다.
+    """
+    return (
+        invoices.filter(student__isnull=False)
+        .values("student_id", student_name=F("student__name"))
+        .annotate(
+            invoice_count=Count("pk"),
+            invoiced=amount("total_amount"),
+            paid=amount("total_amount", is_paid=True),
+            outstanding=amount("total_amount", is_paid=False),
+        )
+        .annotate(rank=Window(Rank(), order_by=F("invoiced").desc()))
+        .order_by("rank", "student_name", "student_id")[:limit]
+    )
+
+
+def revenue_totals(invoices, today):
+    return invoices.aggregate(
+        invoice_count=Count("pk"),
+        invoiced=amount("total_amount"),
+        paid=amount("total_amount", is_paid=True),
+        outstanding=amount("total_amount", is_paid=False),
+        overdue=amount("total_amount", is_paid=False, due_date__lt=today),
+        net=amount("subtotal"),
+        vat=amount("vat_amount"),
+    )
+
+
+def revenue_cache_key(tutor, start, end, limit, today):
+    """
+    Cache key per (tutor, range). It contains the invoice count and latest `updated_at`
+    of the tutor, so every create, update or delete (also bulk writes that bypass
+    signals) leads to a new key instead of a stale result.
+
+    (튜터, 기간)별 캐시 키입니다. 튜터의 영수증 개수와 최신 `updated_at`을 포함하므로
+    생성/수정/삭제(시그널을 거치지 않는 bulk 작업 포함) 시 오래된 결과 대신 새 키가 사용됩니다.
+    """
+    state = Invoice.objects.filter(tutor=tutor).aggregate(
+        count=Count("pk"), latest=Max("updated_at")
+    )
+    latest = state["latest"].isoformat() if state["latest"] else "-"
+    return (
+        f"analytics:revenue:{tutor.pk}:{start}:{end}:{limit}:{today}:"
+        f"{state['count']}:{latest}"
+    )
+
+
+def revenue_report(tutor, start, end, limit=10):
+    """
+    Revenue and receivables of a tutor over [start, end], computed in the database
+    with grouped aggregates and window functions and cached per (tutor, range).
+
+    튜터의 [start, end] 기간 매출 및 미수금 현황으로, DB에서 그룹 집계와
+    윈도우 함수로 계산하며 (튜터, 기간)별로 캐시합니다.
+    """
+    today = timezone.localdate()
+    key = revenue_cache_key(tutor, start, end, limit, today)
+    report = cache.get(key)
+    if report is not None:
+        return report
+
+    invoices = period_invoices(tutor, start, end)
+    report = {
+        "start": start,
+        "end": end,
+        "totals": revenue_totals(invoices, today),
+        "months": [
+            {**row, "month": row["month"].strftime("%Y-%m")} for row in monthly_revenue(invoices)
+        ],
+        "students": list(student_ranking(invoices, limit)),
+    }
+    cache.set(key, report, settings.ANALYTICS_CACHE_TTL)
+    return report
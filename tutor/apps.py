@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class TutorConfig(AppConfig):
     name = 'tutor'
+
+    def ready(self):
+        # Register signal handlers (auth cache invalidation)
+        # 시그널 핸들러 등록 (인증 캐시 무효화)
+        from . import signals  # noqa: F401
@@ -1,4 +1,87 @@
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_lazy as _
+
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
 from rest_framework.authentication import SessionAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def tutor_cache_key(user_id):
+    """
+    Cache key of the authenticated Tutor row for the given user id.
+
+    주어진 사용자 ID에 대한 인증된 Tutor 캐시 키를 반환합니다.
+    """
+    return f"auth:tutor:{user_id}"
+
+
+def tutor_cache_ttl():
+    """
+    TTL of the cached Tutor; 0 (the default without a shared cache) disables caching.
+
+    캐시된 Tutor의 TTL입니다. 0(공유 캐시가 없을 때의 기본값)이면 캐시를 사용하지 않습니다.
+    """
+    return getattr(settings, "AUTH_USER_CACHE_TTL", 0)
+
+
+def invalidate_cached_tutor(user_id):
+    """
+    Drop the cached Tutor so the next request reloads it from the database.
+    Called from the Tutor post_save/post_delete signals and on account deletion.
+
+    캐시된 Tutor를 삭제하여 다음 요청에서 DB로부터 다시 불러오도록 합니다.
+    Tutor의 post_save/post_delete 시그널과 계정 삭제 시 호출됩니다.
+    """
+    cache.delete(tutor_cache_key(user_id))
+
+
+class CachedJWTCookieAuthentication(JWTCookieAuthentication):
+    """
+    JWT Cookie Authentication that resolves the user through a short-TTL cache.
+    Token validation is unchanged; only the Tutor lookup by the user id claim is cached,
+    which removes one query from every authenticated API request.
+    Active and revoked-token checks are still applied to cached users.
+    Caching is off unless AUTH_USER_CACHE_TTL is set (by default only with Redis).
+
+    짧은 TTL 캐시를 통해 사용자를 조회하는 JWT 쿠키 인증 클래스입니다.
+    토큰 검증은 그대로이며, user id 클레임으로 Tutor를 조회하는 부분만 캐시하여
+    인증된 모든 API 요청에서 쿼리 하나를 줄입니다.
+    캐시된 사용자에게도 활성 상태 및 토큰 폐기 검사는 동일하게 적용됩니다.
+    AUTH_USER_CACHE_TTL이 설정되지 않으면(기본적으로 Redis 사용 시에만 설정됨) 캐시하지 않습니다.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or tutor_cache_ttl() <= 0:
+            return super().get_user(validated_token)
+
+        key = tutor_cache_key(user_id)
+        user = cache.get(key)
+
+        if user is None:
+            # Cache miss: load from DB with the default checks, then store
+            # 캐시 미스: 기본 검사를 거쳐 DB에서 불러온 뒤 캐시에 저장
+            user = super().get_user(validated_token)
+            cache.set(key, user, tutor_cache_ttl())
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
 
 
 class CsrfExemptSessionAuthentication(SessionAuthentication):
@@ -6,11 +89,44 @@ class CsrfExemptSessionAuthentication(SessionAuthentication):
     Custom Session Authentication that bypasses CSRF checks.
     Useful for Cross-Domain environments (Frontend/Backend separated)
     where CSRF tokens cannot be easily shared via cookies.
+    The session user is resolved through the same short-TTL Tutor cache as
+    CachedJWTCookieAuthentication; the session hash is still verified on every request.
 
     CSRF 검사를 우회하는 커스텀 세션 인증 클래스입니다.
     CSRF 토큰을 쿠키로 공유하기 어려운 크로스 도메인 환경(프론트엔드/백엔드 분리)에서 유용합니다.
+    세션 사용자는 CachedJWTCookieAuthentication과 동일한 짧은 TTL의 Tutor 캐시로 조회하며,
+    세션 해시는 매 요청마다 그대로 검증합니다.
     """
 
+    def authenticate(self, request):
+        django_request = request._request
+        session = getattr(django_request, "session", None)
+        user_id = session.get(SESSION_KEY) if session is not None else None
+        backend_path = session.get(BACKEND_SESSION_KEY) if session is not None else None
+        if (
+            user_id is None
+            or backend_path not in settings.AUTHENTICATION_BACKENDS
+            or tutor_cache_ttl() <= 0
+        ):
+            return super().authenticate(request)
+
+        key = tutor_cache_key(user_id)
+        user = cache.get(key)
+        # Cached users are only accepted with a matching session hash; anything else
+        # (e.g. a hash signed with a fallback key) goes through Django's full check
+        # 세션 해시가 일치하는 경우에만 캐시된 사용자를 사용하며, 그 외(예: 이전 키로 서명된
+        # 해시)는 Django의 전체 검사를 거침
+        if user is not None and constant_time_compare(
+            session.get(HASH_SESSION_KEY, ""), user.get_session_auth_hash()
+        ):
+            django_request.user = user
+            return super().authenticate(request)
+
+        result = super().authenticate(request)
+        if result is not None:
+            cache.set(key, result[0], tutor_cache_ttl())
+        return result
+
     def enforce_csrf(self, request):
         """
         Overridden to disable CSRF validation.
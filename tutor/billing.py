@@ -0,0 +1,395 @@
+from calendar import monthrange
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Subquery
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from .invoice_rendering import format_date_de
+from .models import (
+    BusinessProfile,
+    CourseRegistration,
+    Invoice,
+    InvoiceItem,
+    Lesson,
+    Student,
+)
+from .serializers import BusinessProfileSerializer
+
+
+# What a billing run invoices: unbilled course registrations or completed lesson hours
+# 정산 대상: 미청구 수강 등록 또는 완료된 수업 시간
+BILLING_SOURCES = ("registrations", "lessons")
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value):
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def month_bounds(month):
+    """
+    First and last day of the month containing `month`.
+
+    `month`가 속한 달의 첫날과 마지막 날을 반환합니다.
+    """
+    start = month.replace(day=1)
+    return start, start.replace(day=monthrange(start.year, start.month)[1])
+
+
+def lesson_hours(lesson):
+    start = datetime.combine(lesson.date, lesson.start_time)
+    end = datetime.combine(lesson.date, lesson.end_time)
+    return max(Decimal("0"), Decimal((end - start).total_seconds()) / 3600)
+
+
+def registration_candidates(tutor, start, end):
+    """
+    Unbilled course registrations that overlap the billing period, one invoice each.
+    A registration with completed lessons that a lesson invoice already covers
+    (`source=lessons`) is skipped, so its hours are never billed twice.
+
+    정산 기간과 겹치는 미청구 수강 등록으로, 등록마다 영수증 하나를 생성합니다.
+    수업 영수증(`source=lessons`)으로 이미 청구된 완료 수업이 있는 수강 등록은
+    같은 시간이 두 번 청구되지 않도록 제외합니다.
+    """
+    lesson_billed = Invoice.objects.filter(
+        student=OuterRef("student"),
+        course_registration__isnull=True,
+        delivery_date_start__lte=OuterRef("date"),
+        delivery_date_end__gte=OuterRef("date"),
+    )
+    billed_lessons = Lesson.objects.filter(
+        course_registration=OuterRef("pk"), status=Lesson.StatusChoices.COMPLETED
+    ).filter(Exists(lesson_billed))
+    registrations = (
+        CourseRegistration.objects.filter(
+            student__tutor=tutor,
+            invoice__isnull=True,
+            is_paid=False,
+            start_date__lte=end,
+            end_date__gte=start,
+        )
+        .annotate(lessons_billed=Exists(billed_lessons))
+        .select_related("student")
+        .order_by("student__name", "start_date", "pk")
+    )
+    candidates, skipped = [], []
+    for registration in registrations:
+        if registration.lessons_billed:
+            skipped.append(
+                {
+                    "student": registration.student_id,
+                    "student_name": registration.student.name,
+                    "course_registration": registration.pk,
+                    "reason": _(
+                        "Unterrichtsstunden dieses Kurses wurden bereits einzeln abgerechnet."
+                    ),
+                }
+            )
+            continue
+        candidates.append(
+            {
+                "student": registration.student,
+                "course_registration": registration,
+                "delivery_date_start": registration.start_date,
+                "delivery_date_end": registration.end_date,
+                "lines": [
+                    {
+                        "description": _("Deutschunterricht %(start)s – %(end)s") % {
+                            "start": format_date_de(registration.start_date),
+                            "end": format_date_de(registration.end_date),
+                        },
+                        "hours": registration.total_hours,
+                        "rate": registration.hourly_rate,
+                    }
+                ],
+            }
+        )
+    return candidates, skipped
+
+
+def lesson_candidates(tutor, start, end):
+    """
+    Completed lessons of the billing period, one invoice per student and one line per
+    hourly rate. Lessons of an already invoiced registration are skipped, as are
+    students that already have a lesson invoice for this period.
+    The rate comes from the lesson's registration, else the student's latest one.
+
+    정산 기간의 완료된 수업으로, 학생마다 영수증 하나, 시급마다 항목 하나를 생성합니다.
+    이미 청구된 수강 등록의 수업과, 해당 기간의 수업 영수증이 이미 있는 학생은 제외합니다.
+    시급은 수업의 수강 등록에서, 없으면 학생의 최근 수강 등록에서 가져옵니다.
+    """
+    billed = Invoice.objects.filter(
+        student=OuterRef("student"),
+        course_registration__isnull=True,
+        delivery_date_start=start,
+        delivery_date_end=end,
+    )
+    lessons = (
+        Lesson.objects.filter(
+            Q(course_registration__isnull=True) | Q(course_registration__invoice__isnull=True),
+            student__tutor=tutor,
+            status=Lesson.StatusChoices.COMPLETED,
+            date__range=(start, end),
+        )
+        .filter(~Exists(billed))
+        .select_related("student", "course_registration")
+        .order_by("student__name", "student_id", "date", "start_time")
+    )
+
+    by_student = {}
+    for lesson in lessons:
+        by_student.setdefault(lesson.student_id, []).append(lesson)
+
+    # Latest registration per student (the dict keeps the last row)
+    # 학생별 최근 수강 등록 (dict에는 마지막 행이 남음)
+    latest_rates = dict(
+        CourseRegistration.objects.filter(student_id__in=by_student)
+        .order_by("student_id", "start_date", "pk")
+        .values_list("student_id", "hourly_rate")
+    )
+
+    candidates, skipped = [], []
+    for student_id, student_lessons in by_student.items():
+        student = student_lessons[0].student
+        hours_by_rate = {}
+        for lesson in student_lessons:
+            registration = lesson.course_registration
+            rate = registration.hourly_rate if registration else latest_rates.get(student_id)
+            if rate is None:
+                break
+            hours_by_rate[rate] = hours_by_rate.get(rate, Decimal("0")) + lesson_hours(lesson)
+        else:
+            candidates.append(
+                {
+                    "student": student,
+                    "course_registration": None,
+                    "delivery_date_start": start,
+                    "delivery_date_end": end,
+                    "lines": [
+                        {
+                            "description": _(
+                                "Deutschunterricht %(start)s – %(end)s (%(count)s Termine)"
+                            ) % {
+                                "start": format_date_de(start),
+                                "end": format_date_de(end),
+                                "count": len(student_lessons),
+                            },
+                            "hours": hours,
+                            "rate": rate,
+                        }
+                        for rate, hours in sorted(hours_by_rate.items())
+                    ],
+                }
+            )
+            continue
+        skipped.append(
+            {
+                "student": student_id,
+                "student_name": student.name,
+                "reason": _("Kein Stundensatz gefunden."),
+            }
+        )
+    return candidates, skipped
+
+
+def latest_templates(student_ids):
+    """
+    The latest finalized invoice per student (the same source as `template_candidates`),
+    loaded with one query. Its texts are reused for the generated drafts.
+
+    학생별 최신 확정 영수증(`template_candidates`와 동일한 기준)을 쿼리 하나로 조회합니다.
+    생성되는 임시저장 영수증에 해당 문구를 재사용합니다.
+    """
+    if not student_ids:
+        return {}
+    latest = (
+        Invoice.objects.filter(student=OuterRef("pk"), is_finalized=True)
+        .order_by("-invoice_date", "-created_at")
+        .values("pk")[:1]
+    )
+    invoices = Invoice.objects.filter(
+        pk__in=Student.objects.filter(pk__in=student_ids).values(latest=Subquery(latest))
+    ).only("student_id", "header_text", "footer_text")
+    return {invoice.student_id: invoice for invoice in invoices}
+
+
+def allocate_numbers(profile, count):
+    """
+    Reserve the next `count` free invoice numbers starting at the profile's next number
+    (numbers already in use are skipped). Returns (numbers, next_number).
+    The caller holds the BusinessProfile row lock, so the block is allocated at once.
+
+    프로필의 다음 번호부터 사용되지 않은 영수증 번호 `count`개를 예약합니다
+    (이미 사용 중인 번호는 건너뜀). (번호 목록, 다음 번호)를 반환합니다.
+    호출자가 BusinessProfile 행 잠금을 보유하므로 번호 블록이 한 번에 할당됩니다.
+    """
+    used = set(
+        Invoice.objects.filter(
+            tutor=profile.tutor_id, invoice_number__gte=profile.next_invoice_number
+        ).values_list("invoice_number", flat=True)
+    )
+    numbers = []
+    sequence = profile.next_invoice_number
+    while len(numbers) < count:
+        if sequence not in used:
+            numbers.append(sequence)
+        sequence += 1
+    while sequence in used:
+        sequence += 1
+    return numbers, sequence
+
+
+def build_invoice(profile, sender_data, candidate, number, invoice_date, template, subject):
+    """
+    Build an unsaved draft Invoice and its items, totals calculated like `calculate_totals`.
+    Rates are entered in the profile's price mode and stored as net prices.
+
+    저장되지 않은 임시저장 Invoice와 항목을 생성하며, 총액은 `calculate_totals`와 같이 계산합니다.
+    시급은 프로필의 가격 입력 방식으로 해석되어 Netto 가격으로 저장됩니다.
+    """
+    student = candidate["student"]
+    vat_rate = Decimal("0") if profile.is_small_business else Decimal("19")
+
+    item_data = []
+    for line in candidate["lines"]:
+        unit_price = Decimal(line["rate"])
+        if profile.price_input_type == BusinessProfile.PriceInputChoices.BRUTTO:
+            unit_price = unit_price / (1 + vat_rate / 100)
+        item_data.append(
+            {
+                "description": line["description"][:255],
+                "quantity": to_cents(line["hours"]),
+                "unit": InvoiceItem.UnitChoices.HOUR,
+                "unit_price": to_cents(unit_price),
+                "vat_rate": vat_rate,
+                "discount_value": Decimal("0"),
+                "discount_unit": InvoiceItem.DiscountUnitChoices.PERCENT,
+            }
+        )
+    calculated = Invoice.calculate_financials(
+        item_data, [], is_small_business=profile.is_small_business
+    )
+
+    invoice = Invoice(
+        tutor_id=profile.tutor_id,
+        student=student,
+        course_registration=candidate["course_registration"],
+        invoice_number=number,
+        full_invoice_code=f"RE-{number}{invoice_date.strftime('%y%m')}",
+        invoice_date=invoice_date,
+        delivery_date_start=candidate["delivery_date_start"],
+        delivery_date_end=candidate["delivery_date_end"],
+        due_date=invoice_date + timedelta(days=settings.INVOICE_BILLING_DUE_DAYS),
+        sender_data=sender_data,
+        recipient_name=(student.billing_name or student.name)[:100],
+        recipient_address={
+            "street": student.street,
+            "zip": student.postcode,
+            "city": student.city,
+            "country": student.country,
+        },
+        subject=subject,
+        header_text=template.header_text if template else profile.default_intro_text,
+        footer_text=template.footer_text if template else "",
+        price_mode=profile.price_input_type,
+        is_small_business=profile.is_small_business,
+        is_finalized=False,
+        subtotal=to_cents(calculated["subtotal"]),
+        vat_amount=to_cents(calculated["vat_amount"]),
+        total_adjustment_amount=to_cents(calculated["total_adjustment_amount"]),
+        total_amount=to_cents(calculated["total_amount"]),
+    )
+    items = [
+        InvoiceItem(
+            invoice=invoice,
+            position_number=position,
+            total_price=to_cents(result["total_price"]),
+            **data,
+        )
+        for position, (data, result) in enumerate(zip(item_data, calculated["items"]), 1)
+    ]
+    return invoice, items
+
+
+def summarize(invoice, items):
+    return {
+        "id": invoice.pk,
+        "student": invoice.student_id,
+        "student_name": invoice.student.name,
+        "course_registration": invoice.course_registration_id,
+        "invoice_number": invoice.invoice_number,
+        "full_invoice_code": invoice.full_invoice_code,
+        "delivery_date_start": invoice.delivery_date_start,
+        "delivery_date_end": invoice.delivery_date_end,
+        "due_date": invoice.due_date,
+        "hours": str(sum((item.quantity for item in items), Decimal("0.00"))),
+        "subtotal": str(invoice.subtotal),
+        "vat_amount": str(invoice.vat_amount),
+        "total_amount": str(invoice.total_amount),
+    }
+
+
+def run_billing(tutor, month, source="registrations", preview=False, invoice_date=None):
+    """
+    Monthly billing run: create draft invoices for the tutor's unbilled registrations or
+    completed lessons of the month containing `month`.
+    Everything happens in one transaction: the BusinessProfile row is locked, the invoice
+    numbers are allocated as one block and invoices and items are written with bulk inserts.
+    With `preview` nothing is written or locked and the projected invoices are returned.
+    Raises BusinessProfile.DoesNotExist when the tutor has no business profile.
+
+    월간 일괄 정산: `month`가 속한 달의 미청구 수강 등록 또는 완료된 수업에 대해
+    임시저장 영수증을 생성합니다.
+    모든 작업은 하나의 트랜잭션에서 처리됩니다: BusinessProfile 행을 잠그고,
+    영수증 번호를 한 블록으로 할당하며, 영수증과 항목을 bulk insert로 저장합니다.
+    `preview`이면 아무것도 저장하거나 잠그지 않고 생성될 영수증 목록만 반환합니다.
+    튜터에게 사업자 프로필이 없으면 BusinessProfile.DoesNotExist를 발생시킵니다.
+    """
+    start, end = month_bounds(month)
+    invoice_date = invoice_date or timezone.localdate()
+    collect = registration_candidates if source == "registrations" else lesson_candidates
+
+    with transaction.atomic():
+        profiles = BusinessProfile.objects.select_related("tutor")
+        if not preview:
+            profiles = profiles.select_for_update(of=("self",))
+        profile = profiles.get(tutor=tutor)
+
+        candidates, skipped = collect(tutor, start, end)
+        templates = latest_templates([candidate["student"].pk for candidate in candidates])
+        numbers, next_number = allocate_numbers(profile, len(candidates))
+        sender_data = BusinessProfileSerializer(profile).data
+        subject = _("Rechnung %(month)s") % {"month": start.strftime("%m/%Y")}
+
+        built = [
+            build_invoice(
+                profile,
+                sender_data,
+                candidate,
+                number,
+                invoice_date,
+                templates.get(candidate["student"].pk),
+                subject,
+            )
+            for candidate, number in zip(candidates, numbers)
+        ]
+
+        if not preview and built:
+            Invoice.objects.bulk_create([invoice for invoice, _items in built])
+            InvoiceItem.objects.bulk_create([item for _invoice, items in built for item in items])
+            profile.next_invoice_number = next_number
+            profile.save(update_fields=["next_invoice_number", "updated_at"])
+
+    return {
+        "month": start.strftime("%Y-%m"),
+        "source": source,
+        "preview": preview,
+        "invoices": [summarize(invoice, items) for invoice, items in built],
+        "skipped": skipped,
+    }
@@ -0,0 +1,186 @@
+import hashlib
+
+from django.db.models import Count, F, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin for conditional GET (ETag/Last-Modified) on list/retrieve requests.
+    The validator is the row count plus the latest `updated_at` of the rows and of the
+    related rows named in `conditional_timestamps` (N:1 paths only, so the count stays exact).
+    Creates and updates move the timestamp, deletes change the count, and nested
+    children bump their parent through TouchParentMixin.
+
+    - Conditional requests (`If-None-Match`) first run one aggregate query and return
+      304 before the queryset is evaluated or serialized.
+    - Regular requests derive the validator from the rows being serialized anyway
+      (the timestamps are annotated onto the same query), so no query is added.
+
+    `If-Modified-Since` is only honored for single objects: a deleted row leaves the
+    latest timestamp of a list unchanged, so lists are validated by ETag alone.
+    Paginated views are passed through unchanged.
+
+    list/retrieve 요청에 조건부 GET(ETag/Last-Modified)을 제공하는 ViewSet 믹스인입니다.
+    검증값은 행 개수와 행 및 `conditional_timestamps`에 지정된 관련 행의 최신 `updated_at`
+    입니다 (개수가 정확하도록 N:1 경로만 허용).
+    생성과 수정은 타임스탬프를, 삭제는 개수를 바꾸며, 중첩된 자식 데이터는
+    TouchParentMixin을 통해 부모의 타임스탬프를 갱신합니다.
+
+    - 조건부 요청(`If-None-Match`)은 먼저 집계 쿼리 하나를 실행하여, QuerySet을 평가하거나
+      직렬화하기 전에 304를 반환합니다.
+    - 일반 요청은 어차피 직렬화되는 행에서 검증값을 계산하므로
+      (타임스탬프를 같은 쿼리에 annotate) 쿼리가 추가되지 않습니다.
+
+    `If-Modified-Since`는 단일 객체에만 적용됩니다: 삭제된 행은 목록의 최신 타임스탬프를
+    바꾸지 않으므로 목록은 ETag로만 검증합니다.
+    페이지네이션이 적용된 뷰는 그대로 통과시킵니다.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    conditional_timestamps = ("updated_at",)
+
+    def get_timestamp_annotations(self):
+        # Relations left out by `?fields=` (SparseFieldsetViewMixin) are not joined for the ETag
+        # `?fields=`(SparseFieldsetViewMixin)로 제외된 관계는 ETag 계산을 위해 JOIN 하지 않음
+        reads_relation = getattr(self, "reads_relation", lambda relation: True)
+        paths = [
+            path
+            for path in self.conditional_timestamps
+            if "__" not in path or reads_relation(path.rpartition("__")[0])
+        ]
+        return {f"conditional_ts_{index}": path for index, path in enumerate(paths)}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.conditional_actions:
+            return queryset
+        return queryset.annotate(
+            **{name: F(path) for name, path in self.get_timestamp_annotations().items()}
+        )
+
+    def make_validators(self, count, timestamps):
+        """
+        Build (etag, last_modified) from the row count and the latest timestamps.
+
+        행 개수와 최신 타임스탬프로 (etag, last_modified)를 생성합니다.
+        """
+        # The body also depends on the query string, language and output format
+        # 응답 본문은 쿼리 문자열, 언어, 출력 형식에도 영향을 받음
+        key = "|".join(
+            [
+                self.request.get_full_path(),
+                get_language() or "",
+                getattr(self.request, "accepted_media_type", "") or "",
+                str(self.request.user.pk),
+                str(count),
+                *(value.isoformat() if value else "-" for value in timestamps),
+            ]
+        )
+        etag = quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+        present = [value for value in timestamps if value is not None]
+        return etag, max(present) if present else None
+
+    def get_validators(self):
+        """
+        Compute the validators with a single aggregate query, or None when the
+        requested object does not exist (the regular 404 path handles it).
+
+        단일 집계 쿼리로 검증값을 계산하며, 요청한 객체가 없으면
+        None을 반환합니다 (일반 404 처리로 넘김).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        annotations = self.get_timestamp_annotations()
+        values = queryset.order_by().aggregate(
+            conditional_count=Count("pk"),
+            **{name: Max(path) for name, path in annotations.items()},
+        )
+        if self.action == "retrieve" and not values["conditional_count"]:
+            return None
+        return self.make_validators(
+            values["conditional_count"], [values[name] for name in annotations]
+        )
+
+    def get_validators_for(self, instances):
+        """
+        Compute the validators from already loaded (annotated) instances.
+
+        이미 조회된 (annotate 된) 인스턴스에서 검증값을 계산합니다.
+        """
+        timestamps = []
+        for name in self.get_timestamp_annotations():
+            values = [
+                getattr(instance, name) for instance in instances
+                if getattr(instance, name) is not None
+            ]
+            timestamps.append(max(values) if values else None)
+        return self.make_validators(len(instances), timestamps)
+
+    def set_validators(self, response, validators):
+        etag, last_modified = validators
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        # Browsers must revalidate, which is a cheap 304 when nothing changed
+        # 브라우저는 매번 재검증해야 하며, 변경이 없으면 저렴한 304로 응답됨
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def get_not_modified_response(self, request):
+        """
+        Return the 304 (or 412) response for a matching conditional request, else None.
+
+        일치하는 조건부 요청이면 304(또는 412) 응답을, 아니면 None을 반환합니다.
+        """
+        use_last_modified = self.action == "retrieve"
+        if not (
+            "If-None-Match" in request.headers
+            or (use_last_modified and "If-Modified-Since" in request.headers)
+        ):
+            return None
+
+        validators = self.get_validators()
+        if validators is None:
+            return None
+
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=(
+                int(last_modified.timestamp()) if use_last_modified and last_modified else None
+            ),
+        )
+        if response is None:
+            return None
+        return self.set_validators(response, validators)
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer(queryset, many=True)
+        response = Response(serializer.data)
+        return self.set_validators(response, self.get_validators_for(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        return self.set_validators(response, self.get_validators_for([instance]))
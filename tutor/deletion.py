@@ -0,0 +1,135 @@
+import logging
+
+from django.db import transaction
+
+from .models import (
+    AttachmentUpload,
+    BusinessProfile,
+    CourseRegistration,
+    DataExport,
+    ExamAttachment,
+    ExamDetailResult,
+    ExamRecord,
+    ExamScoreInput,
+    Invoice,
+    InvoiceAdjustment,
+    InvoiceItem,
+    Lesson,
+    OfficialExamResult,
+    Student,
+    Todo,
+)
+from .uploads import discard_uploads
+
+
+logger = logging.getLogger("tutor.deletion")
+
+# File fields whose stored files are removed together with the rows.
+# Attachment, logo and archived invoice PDF blobs are released by post_delete signals
+# (tutor.signals), so listing them here as well would release their references twice.
+# 행과 함께 저장 파일도 삭제해야 하는 파일 필드.
+# 첨부파일, 로고, 보관용 영수증 PDF 블롭은 post_delete 시그널(tutor.signals)에서
+# 참조가 해제되므로, 여기에도 등록하면 참조가 두 번 해제됨.
+FILE_FIELDS = {
+    DataExport: "file",
+}
+
+
+def _purge_plan(tutor):
+    """
+    Querysets of the tutor's data ordered leaf-first.
+    Each step only references rows that are deleted in a later step,
+    so the cascade collector never has to load dependent objects.
+
+    튜터 데이터의 QuerySet을 말단(leaf) 모델부터 순서대로 반환합니다.
+    각 단계는 이후 단계에서 삭제되는 행만 참조하므로
+    cascade collector가 연관 객체를 메모리에 불러올 필요가 없습니다.
+    """
+    return [
+        ("exam_detail_results", ExamDetailResult.objects.filter(exam_record__student__tutor=tutor)),
+        ("exam_score_inputs", ExamScoreInput.objects.filter(exam_record__student__tutor=tutor)),
+        ("exam_attachments", ExamAttachment.objects.filter(exam_record__student__tutor=tutor)),
+        ("exam_records", ExamRecord.objects.filter(student__tutor=tutor)),
+        ("official_results", OfficialExamResult.objects.filter(student__tutor=tutor)),
+        ("lessons", Lesson.objects.filter(student__tutor=tutor)),
+        ("invoice_items", InvoiceItem.objects.filter(invoice__tutor=tutor)),
+        ("invoice_adjustments", InvoiceAdjustment.objects.filter(invoice__tutor=tutor)),
+        ("invoices", Invoice.objects.filter(tutor=tutor)),
+        ("course_registrations", CourseRegistration.objects.filter(student__tutor=tutor)),
+        ("students", Student.objects.filter(tutor=tutor)),
+        ("todos", Todo.objects.filter(tutor=tutor)),
+        ("business_profile", BusinessProfile.objects.filter(tutor=tutor)),
+        ("data_exports", DataExport.objects.filter(tutor=tutor)),
+    ]
+
+
+def _stored_files(model, pks):
+    """
+    Return (storage, name) pairs of files referenced by the given rows.
+
+    주어진 행이 참조하는 파일의 (storage, name) 쌍을 반환합니다.
+    """
+    field_name = FILE_FIELDS.get(model)
+    if field_name is None:
+        return []
+    field = model._meta.get_field(field_name)
+
+    names = model.objects.filter(pk__in=pks).exclude(**{field.name: ""}).values_list(
+        field.name, flat=True
+    )
+    return [(field.storage, name) for name in names if name]
+
+
+def _delete_files(files):
+    """
+    Delete files from storage after the rows are gone.
+    Failures are logged and do not stop the purge.
+
+    행 삭제 후 스토리지에서 파일을 삭제합니다.
+    실패는 로그로만 남기고 삭제 작업은 계속 진행합니다.
+    """
+    for storage, name in files:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception("Failed to delete stored file %s", name)
+
+
+def purge_tutor(tutor, chunk_size=1000, progress=None):
+    """
+    Delete all data of a tutor in bounded chunks, leaf models first, then the tutor.
+    Every chunk runs in its own short transaction so locks are held briefly,
+    and stored files are released once the rows are deleted.
+    Returns a dict with the number of deleted rows per step.
+
+    튜터의 모든 데이터를 말단 모델부터 제한된 크기의 청크로 삭제한 뒤 튜터를 삭제합니다.
+    각 청크는 짧은 개별 트랜잭션으로 실행되어 잠금 시간을 최소화하며,
+    저장 파일은 행이 삭제된 후 해제됩니다.
+    단계별 삭제 행 수를 담은 dict를 반환합니다.
+    """
+    deleted = {
+        # Unfinished uploads keep staging files outside storage
+        # 미완료 업로드는 스토리지 외부에 임시 파일을 가지고 있음
+        "attachment_uploads": discard_uploads(AttachmentUpload.objects.filter(tutor=tutor)),
+    }
+
+    for step, queryset in _purge_plan(tutor):
+        model = queryset.model
+        deleted[step] = 0
+
+        while True:
+            pks = list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                break
+
+            files = _stored_files(model, pks)
+            with transaction.atomic():
+                count, _per_model = model.objects.filter(pk__in=pks).delete()
+            _delete_files(files)
+
+            deleted[step] += count
+            if progress:
+                progress(step, deleted[step])
+
+    tutor.delete()
+    return deleted
@@ -0,0 +1,307 @@
+import csv
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from .invoice_rendering import build_invoice_context, invoice_pdf_filename, render_invoice_html
+from .models import (
+    BusinessProfile,
+    CourseRegistration,
+    DataExport,
+    ExamAttachment,
+    ExamDetailResult,
+    ExamRecord,
+    ExamScoreInput,
+    Invoice,
+    InvoiceAdjustment,
+    InvoiceItem,
+    Lesson,
+    OfficialExamResult,
+    Student,
+    Todo,
+    Tutor,
+)
+
+
+logger = logging.getLogger("tutor.exports")
+
+EXPORT_CHUNK_SIZE = 2000
+FILE_COPY_BUFFER = 1024 * 1024
+
+# Account fields included in the export (password hash and permissions are excluded)
+# 내보내기에 포함되는 계정 필드 (비밀번호 해시 및 권한 정보는 제외)
+ACCOUNT_FIELDS = ["id", "username", "email", "name", "provider", "date_joined", "created_at"]
+
+
+def _table_members(tutor):
+    """
+    Table members of the export archive: (archive name, format, model, queryset).
+    Large leaf tables are written as CSV, everything else as NDJSON.
+
+    내보내기 아카이브의 테이블 항목 목록: (아카이브 이름, 형식, 모델, QuerySet).
+    행 수가 많은 말단 테이블은 CSV로, 나머지는 NDJSON으로 작성합니다.
+    """
+    return [
+        ("account.ndjson", "ndjson", Tutor, Tutor.objects.filter(pk=tutor.pk)),
+        ("business_profile.ndjson", "ndjson", BusinessProfile, BusinessProfile.objects.filter(tutor=tutor)),
+        ("students.ndjson", "ndjson", Student, Student.objects.filter(tutor=tutor)),
+        ("course_registrations.ndjson", "ndjson", CourseRegistration, CourseRegistration.objects.filter(student__tutor=tutor)),
+        ("lessons.csv", "csv", Lesson, Lesson.objects.filter(student__tutor=tutor)),
+        ("exam_records.ndjson", "ndjson", ExamRecord, ExamRecord.objects.filter(student__tutor=tutor)),
+        ("exam_detail_results.csv", "csv", ExamDetailResult, ExamDetailResult.objects.filter(exam_record__student__tutor=tutor)),
+        ("exam_score_inputs.csv", "csv", ExamScoreInput, ExamScoreInput.objects.filter(exam_record__student__tutor=tutor)),
+        ("exam_attachments.ndjson", "ndjson", ExamAttachment, ExamAttachment.objects.filter(exam_record__student__tutor=tutor)),
+        ("official_exam_results.ndjson", "ndjson", OfficialExamResult, OfficialExamResult.objects.filter(student__tutor=tutor)),
+        ("todos.ndjson", "ndjson", Todo, Todo.objects.filter(tutor=tutor)),
+        ("invoices.ndjson", "ndjson", Invoice, Invoice.objects.filter(tutor=tutor)),
+        ("invoice_items.csv", "csv", InvoiceItem, InvoiceItem.objects.filter(invoice__tutor=tutor)),
+        ("invoice_adjustments.csv", "csv", InvoiceAdjustment, InvoiceAdjustment.objects.filter(invoice__tutor=tutor)),
+    ]
+
+
+def _export_fields(model):
+    if model is Tutor:
+        return ACCOUNT_FIELDS
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+class ProgressTracker:
+    """
+    Tracks processed units and persists the percentage only when it changes.
+
+    처리된 작업 단위를 추적하고, 진행률(%)이 바뀔 때만 DB에 저장합니다.
+    """
+
+    def __init__(self, export, total):
+        self.export = export
+        self.total = max(total, 1)
+        self.done = 0
+        self.percent = 0
+
+    def advance(self, units=1):
+        self.done += units
+        percent = min(99, self.done * 100 // self.total)
+        if percent != self.percent:
+            self.percent = percent
+            DataExport.objects.filter(pk=self.export.pk).update(progress=percent)
+
+
+class ExportWriter:
+    """
+    Writes tables and stored files of one tutor into a ZIP archive member by member.
+    Rows are streamed with `.values().iterator(chunk_size=...)` and files are copied
+    in fixed-size buffers, so memory stays bounded regardless of the account size.
+
+    한 튜터의 테이블과 저장 파일을 ZIP 아카이브에 항목별로 기록합니다.
+    행은 `.values().iterator(chunk_size=...)`로 스트리밍하고 파일은 고정 크기 버퍼로 복사하므로
+    계정 크기와 관계없이 메모리 사용량이 일정하게 유지됩니다.
+    """
+
+    def __init__(self, tutor, archive, tracker, chunk_size=EXPORT_CHUNK_SIZE):
+        self.tutor = tutor
+        self.archive = archive
+        self.tracker = tracker
+        self.chunk_size = chunk_size
+
+    def _open_text(self, arcname):
+        raw = self.archive.open(arcname, "w", force_zip64=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+    def write_table(self, arcname, fmt, model, queryset):
+        fields = _export_fields(model)
+        rows = queryset.order_by("pk").values(*fields).iterator(chunk_size=self.chunk_size)
+
+        with self._open_text(arcname) as fh:
+            if fmt == "csv":
+                writer = csv.DictWriter(fh, fieldnames=fields)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+                    self.tracker.advance()
+            else:
+                for row in rows:
+                    fh.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+                    fh.write("\n")
+                    self.tracker.advance()
+
+    def write_stored_file(self, fieldfile, arcname):
+        """
+        Copy a stored file into the archive. Missing files are logged and skipped.
+
+        저장된 파일을 아카이브로 복사합니다. 누락된 파일은 로그를 남기고 건너뜁니다.
+        """
+        try:
+            with fieldfile.storage.open(fieldfile.name, "rb") as src, self.archive.open(
+                arcname, "w", force_zip64=True
+            ) as dst:
+                shutil.copyfileobj(src, dst, FILE_COPY_BUFFER)
+        except OSError:
+            logger.warning("Export %s: stored file %s is missing", self.tracker.export.pk, fieldfile.name)
+
+    def write_files(self):
+        profile = BusinessProfile.objects.filter(tutor=self.tutor).first()
+        if profile and profile.logo:
+            self.write_stored_file(profile.logo, f"files/logo/{os.path.basename(profile.logo.name)}")
+
+        attachments = (
+            ExamAttachment.objects.filter(exam_record__student__tutor=self.tutor)
+            .order_by("pk")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for attachment in attachments:
+            if attachment.file:
+                # Stored names are content hashes, so prefer the uploaded file name
+                # 저장 이름은 콘텐츠 해시이므로 업로드 시 파일명을 우선 사용
+                filename = os.path.basename(attachment.original_name or attachment.file.name)
+                arcname = f"files/exam_attachments/{attachment.exam_record_id}/{attachment.pk}_{filename}"
+                self.write_stored_file(attachment.file, arcname)
+            self.tracker.advance()
+
+    def write_invoice_pdfs(self):
+        """
+        Add a PDF for every finalized invoice (the archived file, else a fresh render).
+
+        확정된 모든 영수증의 PDF를 추가합니다 (보관된 파일, 없으면 새로 렌더링).
+        """
+        from weasyprint import HTML
+
+        invoices = (
+            Invoice.objects.filter(tutor=self.tutor, is_finalized=True)
+            .select_related("student")
+            .prefetch_related("items", "adjustments")
+            .order_by("pk")
+            .iterator(chunk_size=100)
+        )
+        for invoice in invoices:
+            arcname = f"files/invoices/{invoice_pdf_filename(invoice)}"
+            # Archived invoices are copied as stored instead of being rendered again
+            # 보관된 영수증은 다시 렌더링하지 않고 저장된 파일을 그대로 복사
+            if invoice.archived_pdf_status == Invoice.ArchiveStatusChoices.READY:
+                self.write_stored_file(invoice.archived_pdf, arcname)
+                self.tracker.advance()
+                continue
+            html_string = render_invoice_html(build_invoice_context(invoice))
+            # Only one rendered PDF is held in memory at a time
+            # 한 번에 하나의 렌더링된 PDF만 메모리에 유지
+            self.archive.writestr(arcname, HTML(string=html_string).write_pdf())
+            self.tracker.advance()
+
+
+def build_export(export, chunk_size=EXPORT_CHUNK_SIZE, include_invoice_pdfs=True):
+    """
+    Build the ZIP archive for a DataExport and attach it to the record.
+    The archive is written to a temporary file on disk, then streamed to storage.
+
+    DataExport에 대한 ZIP 아카이브를 생성하여 레코드에 첨부합니다.
+    아카이브는 디스크의 임시 파일에 작성된 뒤 스토리지로 스트리밍됩니다.
+    """
+    tutor = export.tutor
+    members = _table_members(tutor)
+
+    total = sum(queryset.count() for _name, _fmt, _model, queryset in members)
+    total += ExamAttachment.objects.filter(exam_record__student__tutor=tutor).count()
+    if include_invoice_pdfs:
+        total += Invoice.objects.filter(tutor=tutor, is_finalized=True).count()
+    tracker = ProgressTracker(export, total)
+
+    with tempfile.TemporaryFile() as tmp:
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            writer = ExportWriter(tutor, archive, tracker, chunk_size=chunk_size)
+            for arcname, fmt, model, queryset in members:
+                writer.write_table(arcname, fmt, model, queryset)
+            writer.write_files()
+            if include_invoice_pdfs:
+                writer.write_invoice_pdfs()
+
+        tmp.seek(0)
+        filename = f"export-{tutor.pk}-{timezone.now():%Y%m%d-%H%M%S}.zip"
+        export.file.save(filename, File(tmp, name=filename), save=False)
+
+
+def expire_stale_exports(tutor=None):
+    """
+    Mark exports still RUNNING after DATA_EXPORT_LEASE seconds as failed.
+    Their worker was killed (OOM, deploy), so they would otherwise block new exports forever.
+    Returns the number of expired exports.
+
+    DATA_EXPORT_LEASE초가 지나도 RUNNING 상태인 내보내기를 실패로 표시합니다.
+    작업자가 종료된(OOM, 배포) 경우이므로, 그대로 두면 새 내보내기를 영구히 막게 됩니다.
+    만료된 내보내기 수를 반환합니다.
+    """
+    now = timezone.now()
+    stale = DataExport.objects.filter(
+        status=DataExport.StatusChoices.RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.DATA_EXPORT_LEASE),
+    )
+    if tutor is not None:
+        stale = stale.filter(tutor=tutor)
+    return stale.update(
+        status=DataExport.StatusChoices.FAILED,
+        error=_("Der Export wurde abgebrochen. Bitte fordern Sie ihn erneut an."),
+        finished_at=now,
+    )
+
+
+def run_export(export, chunk_size=EXPORT_CHUNK_SIZE, include_invoice_pdfs=True):
+    """
+    Claim a pending export, build it and record its final status.
+    The export is claimed with a conditional update, so overlapping workers never build
+    the same export twice; returns None if another worker claimed it first.
+    The final status is only written while the export is still RUNNING, so an export
+    expired by `expire_stale_exports` in the meantime stays FAILED.
+
+    대기 중인 내보내기 작업을 선점하여 생성하고 최종 상태를 기록합니다.
+    조건부 업데이트로 작업을 선점하므로 동시에 실행된 작업자가 같은 내보내기를 두 번
+    생성하지 않으며, 다른 작업자가 먼저 선점한 경우 None을 반환합니다.
+    최종 상태는 내보내기가 아직 RUNNING 상태일 때만 기록되므로, 그 사이
+    `expire_stale_exports`로 만료된 내보내기는 FAILED 상태로 유지됩니다.
+    """
+    started_at = timezone.now()
+    claimed = DataExport.objects.filter(
+        pk=export.pk, status=DataExport.StatusChoices.PENDING
+    ).update(status=DataExport.StatusChoices.RUNNING, started_at=started_at, progress=0)
+    if not claimed:
+        return None
+    export.status = DataExport.StatusChoices.RUNNING
+    export.started_at = started_at
+    export.progress = 0
+
+    try:
+        build_export(export, chunk_size=chunk_size, include_invoice_pdfs=include_invoice_pdfs)
+    except Exception:
+        # The exception text may contain paths or SQL; it is only kept in the log
+        # 예외 메시지에는 경로나 SQL이 포함될 수 있으므로 로그에만 남김
+        logger.exception("Data export %s failed", export.pk)
+        export.status = DataExport.StatusChoices.FAILED
+        export.error = _("Der Export konnte nicht erstellt werden. Bitte fordern Sie ihn erneut an.")
+    else:
+        export.status = DataExport.StatusChoices.COMPLETED
+        export.progress = 100
+
+    export.finished_at = timezone.now()
+    finished = DataExport.objects.filter(
+        pk=export.pk, status=DataExport.StatusChoices.RUNNING
+    ).update(
+        status=export.status,
+        progress=export.progress,
+        file=export.file.name or "",
+        error=export.error,
+        finished_at=export.finished_at,
+    )
+    if not finished:
+        logger.warning("Data export %s expired while it was being built", export.pk)
+        if export.file:
+            export.file.delete(save=False)
+        export.refresh_from_db()
+    return export
@@ -0,0 +1,221 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def _split_param(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _flatten_select_related(tree, prefix=""):
+    """
+    Turn Django's nested select_related dict into lookup paths.
+
+    Django의 중첩된 select_related dict를 조회 경로 목록으로 변환합니다.
+    """
+    paths = []
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        paths.append(path)
+        paths.extend(_flatten_select_related(children, f"{path}__"))
+    return paths
+
+
+def _needs(paths, relation):
+    """
+    True if any data path traverses (or ends at) the given relation.
+
+    데이터 경로 중 하나라도 해당 관계를 거치거나 그 관계에서 끝나면 True를 반환합니다.
+    """
+    return any(path == relation or path.startswith(f"{relation}__") for path in paths)
+
+
+def restrict_queryset(queryset, paths):
+    """
+    Reduce a queryset to the data needed for the given field paths.
+    Prefetches and select_related joins nobody reads are dropped and
+    only() limits the loaded columns (the primary key is always loaded).
+
+    주어진 필드 경로에 필요한 데이터만 조회하도록 QuerySet을 축소합니다.
+    아무도 읽지 않는 prefetch와 select_related JOIN은 제거하고,
+    only()로 조회 컬럼을 제한합니다 (기본 키는 항상 조회됨).
+    """
+    model = queryset.model
+    try:
+        for path in paths:
+            model._meta.get_field(path.split("__")[0])
+    except FieldDoesNotExist:
+        # Sources like model properties may read anything, so keep the queryset as is
+        # 모델 프로퍼티 같은 source는 무엇이든 읽을 수 있으므로 QuerySet을 그대로 유지
+        return queryset
+
+    prefetches = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if _needs(paths, lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup)
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+
+    joined = []
+    if isinstance(queryset.query.select_related, dict):
+        joined = [
+            relation
+            for relation in _flatten_select_related(queryset.query.select_related)
+            if any(path.startswith(f"{relation}__") for path in paths)
+        ]
+        queryset = queryset.select_related(None)
+        if joined:
+            queryset = queryset.select_related(*joined)
+
+    columns = {model._meta.pk.name}
+    for path in paths:
+        name, _sep, rest = path.partition("__")
+        field = model._meta.get_field(name)
+        if not field.concrete:
+            # Reverse relations are prefetched by primary key
+            # 역참조 관계는 기본 키로 prefetch 됨
+            continue
+        columns.add(name)
+
+        if rest and name in joined:
+            related_name = rest.split("__")[0]
+            try:
+                related_field = field.related_model._meta.get_field(related_name)
+            except FieldDoesNotExist:
+                continue
+            if related_field.concrete and not related_field.many_to_many:
+                columns.add(f"{name}__{related_name}")
+
+    return queryset.only(*columns)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin that keeps only the fields selected with `?fields=`/`?expand=`.
+    The selection is resolved by SparseFieldsetViewMixin and passed in the context.
+    `sparse_sources` declares the model paths read by fields without a plain `source`
+    (e.g. SerializerMethodField), so the view can trim the queryset accordingly.
+
+    `?fields=`/`?expand=`로 선택된 필드만 유지하는 시리얼라이저 믹스인입니다.
+    선택 결과는 SparseFieldsetViewMixin이 계산하여 context로 전달합니다.
+    `sparse_sources`는 일반 `source`가 없는 필드(예: SerializerMethodField)가 읽는
+    모델 경로를 선언하여, 뷰가 그에 맞게 QuerySet을 축소할 수 있게 합니다.
+    """
+
+    sparse_sources = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get("sparse_fields")
+        parent = getattr(self, "parent", None)
+        is_root = parent is None or (
+            isinstance(parent, serializers.ListSerializer) and parent.parent is None
+        )
+        if selected is None or not is_root:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+    @classmethod
+    def field_paths(cls, fields):
+        """
+        Model lookup paths read by the given serializer fields,
+        or None if a field's data requirements are unknown.
+
+        주어진 시리얼라이저 필드가 읽는 모델 조회 경로 목록을 반환하며,
+        필요한 데이터를 알 수 없는 필드가 있으면 None을 반환합니다.
+        """
+        paths = []
+        for name, field in fields.items():
+            if name in cls.sparse_sources:
+                paths.extend(cls.sparse_sources[name])
+            elif isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+                return None
+            else:
+                paths.append(field.source.replace(".", "__"))
+        return paths
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin for `?fields=a,b` and `?expand=nested` on list/retrieve requests.
+    Nested serializers are only included when requested (or when neither parameter
+    is given), and the queryset is reduced to the columns, joins and prefetches
+    the remaining fields actually read.
+
+    list/retrieve 요청에서 `?fields=a,b`와 `?expand=nested`를 지원하는 ViewSet 믹스인입니다.
+    중첩 시리얼라이저는 요청된 경우(또는 두 파라미터가 모두 없는 경우)에만 포함되며,
+    QuerySet은 남은 필드가 실제로 읽는 컬럼, JOIN, prefetch로 축소됩니다.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_sparse_fields(self):
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+
+        self._sparse_fields = None
+        params = self.request.query_params
+        if self.action not in self.sparse_actions or not (
+            "fields" in params or "expand" in params
+        ):
+            return None
+
+        all_fields = self.get_serializer_class()(
+            context=super().get_serializer_context()
+        ).fields
+        expandable = {
+            name
+            for name, field in all_fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        }
+        requested = _split_param(params.get("fields", ""))
+        expand = _split_param(params.get("expand", ""))
+
+        unknown = [name for name in requested + expand if name not in all_fields]
+        if unknown:
+            raise ValidationError(
+                {"fields": _("Unbekannte Felder: %(names)s") % {"names": ", ".join(unknown)}}
+            )
+
+        if requested:
+            selected = set(requested) | set(expand)
+        else:
+            selected = (set(all_fields) - expandable) | set(expand)
+
+        self._sparse_fields = {
+            name: field for name, field in all_fields.items() if name in selected
+        }
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is not None:
+            context["sparse_fields"] = frozenset(sparse_fields)
+        return context
+
+    def get_sparse_paths(self):
+        """
+        Model lookup paths read by the selected fields, or None without a selection
+        (or when a selected field's data requirements are unknown).
+
+        선택된 필드가 읽는 모델 조회 경로 목록을 반환하며, 선택이 없거나
+        필요한 데이터를 알 수 없는 필드가 있으면 None을 반환합니다.
+        """
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is None:
+            return None
+        return self.get_serializer_class().field_paths(sparse_fields)
+
+    def reads_relation(self, relation):
+        paths = self.get_sparse_paths()
+        return paths is None or _needs(paths, relation)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        paths = self.get_sparse_paths()
+        if paths is None:
+            return queryset
+        return restrict_queryset(queryset, paths)
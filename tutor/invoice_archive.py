@@ -0,0 +1,108 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .invoice_rendering import build_invoice_context, invoice_pdf_filename, render_invoice_html
+from .models import Invoice
+
+
+logger = logging.getLogger("tutor.invoice_archive")
+
+Status = Invoice.ArchiveStatusChoices
+
+
+def render_archival_pdf(invoice):
+    """
+    Render the invoice as an archival PDF (variant INVOICE_ARCHIVE_PDF_VARIANT, PDF/A).
+
+    영수증을 보관용 PDF(INVOICE_ARCHIVE_PDF_VARIANT 형식, PDF/A)로 렌더링합니다.
+    """
+    from weasyprint import HTML
+
+    html_string = render_invoice_html(build_invoice_context(invoice))
+    return HTML(string=html_string).write_pdf(pdf_variant=settings.INVOICE_ARCHIVE_PDF_VARIANT)
+
+
+def archive_invoice_pdf(invoice):
+    """
+    Render a finalized invoice once, store the PDF on the storage backend and record
+    its SHA-256 checksum. Returns the resulting archive status.
+    An existing archive is the legally issued document and is never replaced.
+
+    확정 영수증을 한 번 렌더링하여 PDF를 스토리지에 저장하고 SHA-256 체크섬을 기록합니다.
+    결과 보관 상태를 반환합니다.
+    기존 보관 파일은 법적으로 발행된 문서이므로 절대 대체하지 않습니다.
+    """
+    if invoice.archived_pdf:
+        logger.warning("Invoice %s is already archived; keeping the issued PDF", invoice.pk)
+        Invoice.objects.filter(
+            pk=invoice.pk, archived_pdf_status__in=[Status.PENDING, Status.FAILED]
+        ).update(archived_pdf_status=Status.READY)
+        return Status.READY
+
+    try:
+        data = render_archival_pdf(invoice)
+        name = invoice.archived_pdf.storage.save(
+            invoice_pdf_filename(invoice), ContentFile(data)
+        )
+    except Exception:
+        logger.exception("Archival PDF rendering failed for invoice %s", invoice.pk)
+        Invoice.objects.filter(pk=invoice.pk, archived_pdf_status=Status.PENDING).update(
+            archived_pdf_status=Status.FAILED
+        )
+        return Status.FAILED
+
+    checksum = hashlib.sha256(data).hexdigest()
+    # Conditional update: a parallel run that archived the invoice first wins and
+    # the extra reference to the stored file is released again
+    # 조건부 업데이트: 병렬 실행에서 먼저 보관한 쪽이 우선하며,
+    # 저장된 파일에 추가된 참조는 다시 해제함
+    updated = Invoice.objects.filter(
+        pk=invoice.pk,
+        archived_pdf="",
+        archived_pdf_status__in=[Status.PENDING, Status.FAILED],
+    ).update(
+        archived_pdf=name,
+        archived_pdf_sha256=checksum,
+        archived_pdf_status=Status.READY,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        invoice.archived_pdf.storage.delete(name)
+        return Status.READY
+
+    invoice.archived_pdf.name = name
+    invoice.archived_pdf_sha256 = checksum
+    invoice.archived_pdf_status = Status.READY
+    return Status.READY
+
+
+def archive_pending_invoices(limit=None, retry_failed=False, chunk_size=100):
+    """
+    Archive all finalized invoices waiting for their PDF.
+    Returns a dict with the number of invoices per resulting status.
+
+    PDF 보관을 기다리는 모든 확정 영수증을 보관 처리합니다.
+    결과 상태별 영수증 수를 담은 dict를 반환합니다.
+    """
+    statuses = [Status.PENDING]
+    if retry_failed:
+        statuses.append(Status.FAILED)
+
+    queryset = (
+        Invoice.objects.filter(is_finalized=True, archived_pdf_status__in=statuses)
+        .select_related("student")
+        .prefetch_related("items", "adjustments")
+        .order_by("pk")
+    )
+    if limit:
+        queryset = queryset[:limit]
+
+    results = {}
+    for invoice in queryset.iterator(chunk_size=chunk_size):
+        status = archive_invoice_pdf(invoice)
+        results[status] = results.get(status, 0) + 1
+    return results
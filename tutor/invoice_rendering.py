@@ -0,0 +1,328 @@
+import hashlib
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from html import escape
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from .models import BusinessProfile
+from .serializers import BusinessProfileSerializer
+
+
+INVOICE_TEMPLATE = "invoices/invoice_pdf.html"
+
+# Unit labels printed on the invoice
+# 영수증에 출력되는 단위 표기
+UNIT_LABELS = {
+    "DAY": "Tag(e)",
+    "HOUR": "Std.",
+    "PIECE": "Stk.",
+    "FLAT_RATE": "pauschal",
+}
+
+# Markup the rich text editor produces for the intro text; everything else is stripped
+# 서식 편집기가 소개 문구에 생성하는 마크업; 그 외는 모두 제거됨
+RICH_TEXT_TAGS = {
+    "p", "br", "strong", "b", "em", "i", "u", "s", "span", "blockquote", "hr",
+    "h1", "h2", "h3", "h4", "ul", "ol", "li",
+    "table", "colgroup", "col", "thead", "tbody", "tr", "th", "td",
+}
+RICH_TEXT_ATTRIBUTES = {"colspan", "rowspan", "colwidth"}
+RICH_TEXT_VOID_TAGS = {"br", "hr", "col"}
+# Tags dropped together with their content
+# 내용과 함께 제거되는 태그
+RICH_TEXT_DROPPED_TAGS = {
+    "script", "style", "iframe", "object", "embed", "template", "noscript", "svg", "math",
+}
+
+
+def format_de(value):
+    """
+    Format a number to German standard (e.g., 1.000,00).
+
+    숫자를 독일 표준 형식으로 변환합니다 (예: 1.000,00).
+    """
+    if value is None:
+        return "0,00"
+    try:
+        val = Decimal(str(value))
+    except Exception:
+        return "0,00"
+    s = "{:,.2f}".format(val)
+    # Swap dots and commas
+    # 점과 쉼표를 교체
+    return s.replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def format_date_de(d):
+    """
+    Format a date to German standard (DD.MM.YYYY).
+
+    날짜를 독일 표준 형식(DD.MM.YYYY)으로 변환합니다.
+    """
+    if not d:
+        return ""
+    if isinstance(d, str):
+        try:
+            d = datetime.strptime(d, "%Y-%m-%d")
+        except ValueError:
+            return d
+    return d.strftime("%d.%m.%Y")
+
+
+class RichTextSanitizer(HTMLParser):
+    """
+    Allow-list HTML sanitizer for the rich text intro: known tags and attributes are
+    kept, other tags are removed, and script-like elements are dropped with their content.
+
+    소개 문구 서식 텍스트를 위한 허용 목록 기반 HTML 정리기: 허용된 태그와 속성만 유지하고,
+    그 외 태그는 제거하며, 스크립트 계열 요소는 내용과 함께 삭제합니다.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.dropped_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in RICH_TEXT_DROPPED_TAGS:
+            self.dropped_depth += 1
+            return
+        if self.dropped_depth or tag not in RICH_TEXT_TAGS:
+            return
+        attributes = "".join(
+            f' {name}="{escape(value)}"'
+            for name, value in attrs
+            if name in RICH_TEXT_ATTRIBUTES and value is not None
+        )
+        self.parts.append(f"<{tag}{attributes}>")
+
+    def handle_endtag(self, tag):
+        if tag in RICH_TEXT_DROPPED_TAGS:
+            self.dropped_depth = max(0, self.dropped_depth - 1)
+            return
+        if self.dropped_depth or tag not in RICH_TEXT_TAGS or tag in RICH_TEXT_VOID_TAGS:
+            return
+        self.parts.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        if not self.dropped_depth:
+            self.parts.append(escape(data, quote=False))
+
+
+def sanitize_rich_text(value):
+    """
+    Sanitize user-entered rich text before it is rendered unescaped (`|safe`).
+
+    사용자가 입력한 서식 텍스트를 이스케이프 없이(`|safe`) 렌더링하기 전에 정리합니다.
+    """
+    if not value:
+        return ""
+    sanitizer = RichTextSanitizer()
+    sanitizer.feed(str(value))
+    sanitizer.close()
+    return "".join(sanitizer.parts)
+
+
+def normalize_recipient_address(raw_address):
+    """
+    Normalize recipient addresses from either JSON strings or objects.
+    Returns a stable dict shape for rendering and persistence.
+
+    수신자 주소를 JSON 문자열 또는 객체 입력 모두에서 정규화합니다.
+    렌더링과 저장에 사용할 고정된 딕셔너리 형태로 반환합니다.
+    """
+    if isinstance(raw_address, str):
+        try:
+            raw_address = json.loads(raw_address)
+        except json.JSONDecodeError:
+            raw_address = {}
+    elif not isinstance(raw_address, dict):
+        raw_address = {}
+
+    return {
+        "street": str(raw_address.get("street", "") or ""),
+        "zip": str(raw_address.get("zip", "") or ""),
+        "city": str(raw_address.get("city", "") or ""),
+        "country": str(raw_address.get("country", "") or ""),
+    }
+
+
+def infer_salutation(header_text):
+    """
+    Infer the recipient salutation from the header text.
+
+    헤더 텍스트에서 수신자 인사말(Frau/Herr)을 추론합니다.
+    """
+    header_text = header_text or ""
+    if "Frau" in header_text and "Herr" not in header_text:
+        return "Frau"
+    if "Herr" in header_text and "Frau" not in header_text:
+        return "Herr"
+    return ""
+
+
+def invoice_pdf_filename(invoice):
+    return f"Rechnung_{invoice.full_invoice_code}.pdf"
+
+
+def build_invoice_context(invoice):
+    """
+    Build the PDF template context for a stored invoice.
+    Uses the sender snapshot stored on the invoice, falling back to the current profile.
+    Items and adjustments are read through `invoice.items.all()` so prefetched data is reused.
+
+    저장된 영수증의 PDF 템플릿 컨텍스트를 생성합니다.
+    영수증에 저장된 발신자 스냅샷을 사용하고, 없으면 현재 프로필을 조회합니다.
+    항목과 조정 내역은 `invoice.items.all()`로 읽으므로 prefetch된 데이터를 재사용합니다.
+    """
+    # Use stored snapshot data if available, else fetch current profile
+    # 저장된 스냅샷 데이터가 있으면 사용하고, 없으면 현재 프로필 조회
+    sender_data = invoice.sender_data
+
+    if not sender_data:
+        try:
+            profile = BusinessProfile.objects.get(tutor_id=invoice.tutor_id)
+            sender_data = BusinessProfileSerializer(profile).data
+        except BusinessProfile.DoesNotExist:
+            sender_data = {}
+
+    r_addr = normalize_recipient_address(invoice.recipient_address)
+
+    customer_no = ""
+    if invoice.student and invoice.student.customer_number:
+        customer_no = invoice.student.customer_number
+
+    recipient_data = {
+        "name": invoice.recipient_name,
+        "salutation": infer_salutation(invoice.header_text),
+        "customer_no": customer_no,
+        "street": r_addr.get("street", ""),
+        "zip": r_addr.get("zip", ""),
+        "city": r_addr.get("city", ""),
+        "country": r_addr.get("country", ""),
+    }
+
+    # Footer Processing
+    # 푸터 처리
+    raw_footer = invoice.footer_text or ""
+    formatted_due_date = format_date_de(invoice.due_date)
+    raw_footer = raw_footer.replace("[%ZAHLUNGSZIEL%]", formatted_due_date)
+    raw_footer = raw_footer.replace(
+        "[%KONTAKTPERSON%]", sender_data.get("manager_name", "")
+    )
+
+    delivery_text = format_date_de(invoice.delivery_date_start)
+    if invoice.delivery_date_end:
+        delivery_text += f" - {format_date_de(invoice.delivery_date_end)}"
+
+    items_data = []
+    items_sum_decimal = Decimal("0.00")
+
+    for item in invoice.items.all():
+        items_sum_decimal += item.total_price
+
+        items_data.append(
+            {
+                "description": item.description,
+                "quantity": format_de(item.quantity),
+                "unit_display": UNIT_LABELS.get(item.unit, item.unit),
+                "unit_price": format_de(item.unit_price),
+                "discount_value": format_de(item.discount_value),
+                "vat_rate": format_de(item.vat_rate),
+                "total_price": format_de(item.total_price),
+                "discount_unit": item.discount_unit,
+            }
+        )
+
+    processed_adjustments = []
+    for adj in invoice.adjustments.all():
+        processed_adjustments.append(
+            {
+                "label": adj.label,
+                "type": adj.type,
+                "value": format_de(adj.value),
+                "unit": adj.unit,
+                "amount": format_de(adj.amount),
+            }
+        )
+
+    return {
+        "document_title": invoice_pdf_filename(invoice),
+        "invoice_number": invoice.full_invoice_code,
+        "invoice_date": format_date_de(invoice.invoice_date) or invoice.created_at.strftime("%d.%m.%Y"),
+        "delivery_date": delivery_text,
+        "subject": invoice.subject,
+        "header_text": sanitize_rich_text(invoice.header_text),
+        "footer_text": raw_footer,
+        "sender": sender_data,
+        "recipient": recipient_data,
+        "items": items_data,
+        "items_total": format_de(items_sum_decimal),
+        "subtotal": format_de(invoice.subtotal),
+        "vat_amount": format_de(invoice.vat_amount),
+        "total_amount": format_de(invoice.total_amount),
+        "adjustments": processed_adjustments,
+        "is_small_business": invoice.is_small_business,
+        "due_date": formatted_due_date,
+    }
+
+
+def render_invoice_html(context):
+    return render_to_string(INVOICE_TEMPLATE, context)
+
+
+def preview_cache_key(kind, context):
+    """
+    Cache key of a rendered preview: a hash of everything the template receives,
+    so identical payloads share one render and profile or student changes do not.
+
+    렌더링된 미리보기의 캐시 키: 템플릿에 전달되는 모든 값의 해시이므로
+    동일한 요청은 렌더링을 공유하고, 프로필이나 학생 정보가 바뀌면 새로 렌더링됩니다.
+    """
+    payload = json.dumps(context, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha256(f"{INVOICE_TEMPLATE}:{payload}".encode()).hexdigest()
+    return f"invoice-preview:{kind}:{digest}"
+
+
+def cached_preview(kind, context, render):
+    """
+    Return the cached preview for the context, rendering it once where possible.
+    While one request renders, identical requests (double clicks, retries) briefly
+    wait up to INVOICE_PREVIEW_RENDER_WAIT seconds (about one) for its result and then
+    render themselves, so a slow render never ties up the waiting workers for long.
+
+    컨텍스트에 대한 캐시된 미리보기를 반환하며, 가능한 한 한 번만 렌더링합니다.
+    한 요청이 렌더링하는 동안 동일한 요청(중복 클릭, 재시도)은 최대
+    INVOICE_PREVIEW_RENDER_WAIT초(약 1초) 동안만 그 결과를 기다린 뒤 직접 렌더링하므로,
+    렌더링이 느려도 대기 중인 워커가 오래 묶이지 않습니다.
+    """
+    key = preview_cache_key(kind, context)
+    content = cache.get(key)
+    if content is not None:
+        return content
+
+    lock_key = f"{key}:rendering"
+    locked = cache.add(lock_key, 1, timeout=settings.INVOICE_PREVIEW_RENDER_WAIT)
+    if not locked:
+        deadline = time.monotonic() + settings.INVOICE_PREVIEW_RENDER_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            content = cache.get(key)
+            if content is not None:
+                return content
+
+    try:
+        content = render(context)
+        cache.set(key, content, settings.INVOICE_PREVIEW_CACHE_TTL)
+    finally:
+        # Only the request holding the lock releases it
+        # 잠금을 획득한 요청만 잠금을 해제함
+        if locked:
+            cache.delete(lock_key)
+    return content
@@ -0,0 +1,207 @@
+import base64
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+logger = logging.getLogger(__name__)
+
+Status = OutboundEmail.StatusChoices
+
+
+def serialize_message(message):
+    """
+    Convert an EmailMessage into OutboundEmail field values.
+
+    EmailMessage를 OutboundEmail 필드 값으로 변환합니다.
+    """
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            # Prebuilt MIME parts cannot be stored as JSON
+            # 미리 생성된 MIME 파트는 JSON으로 저장할 수 없음
+            raise ValueError("MIME attachments are not supported by the email outbox.")
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append([filename, base64.b64encode(content).decode("ascii"), mimetype])
+
+    return {
+        "subject": str(message.subject),
+        "body": str(message.body),
+        "from_email": message.from_email or settings.DEFAULT_FROM_EMAIL,
+        "to": list(message.to),
+        "cc": list(message.cc),
+        "bcc": list(message.bcc),
+        "reply_to": list(message.reply_to),
+        "headers": dict(message.extra_headers),
+        "alternatives": [
+            [str(content), mimetype] for content, mimetype in getattr(message, "alternatives", [])
+        ],
+        "attachments": attachments,
+    }
+
+
+def build_message(email, connection=None):
+    """
+    Rebuild the EmailMessage of a queued OutboundEmail.
+
+    대기열의 OutboundEmail에서 EmailMessage를 다시 생성합니다.
+    """
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        headers=email.headers,
+        connection=connection,
+    )
+    for content, mimetype in email.alternatives:
+        message.attach_alternative(content, mimetype)
+    for filename, content, mimetype in email.attachments:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """
+    Email backend that stores messages in the OutboundEmail table instead of sending them.
+    Inside a transaction the rows are written as part of it, so rolling it back sends no
+    mail (there is no ATOMIC_REQUESTS: outside of one they are committed right away).
+    A slow provider never blocks the request. `send_queued_email` delivers them
+    through EMAIL_OUTBOX_BACKEND.
+
+    메일을 발송하는 대신 OutboundEmail 테이블에 저장하는 이메일 백엔드입니다.
+    트랜잭션 안에서는 행이 해당 트랜잭션의 일부로 기록되므로 롤백하면 메일을 보내지 않습니다
+    (ATOMIC_REQUESTS가 없으므로 트랜잭션 밖에서는 즉시 커밋됨).
+    느린 메일 제공자가 요청을 지연시키지 않습니다. `send_queued_email`이
+    EMAIL_OUTBOX_BACKEND를 통해 발송합니다.
+    """
+
+    def send_messages(self, email_messages):
+        rows = [
+            OutboundEmail(**serialize_message(message))
+            for message in email_messages
+            if message.recipients()
+        ]
+        try:
+            OutboundEmail.objects.bulk_create(rows)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(rows)
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff: EMAIL_OUTBOX_RETRY_DELAY seconds, doubled per failed attempt.
+
+    지수 백오프: EMAIL_OUTBOX_RETRY_DELAY초에서 실패할 때마다 두 배로 증가합니다.
+    """
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim_batch(batch_size):
+    """
+    Lease a batch of due emails to this worker.
+    Rows are locked with SKIP LOCKED (where supported) so parallel workers take
+    different batches; an expired lease (crashed worker) makes the row due again.
+
+    발송 예정 메일 한 묶음을 이 워커에 임대합니다.
+    (지원되는 경우) SKIP LOCKED로 행을 잠가 병렬 워커가 서로 다른 묶음을 가져가며,
+    임대가 만료되면(워커 비정상 종료) 행은 다시 발송 대상이 됩니다.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=[Status.PENDING, Status.SENDING], next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=ids).update(
+            status=Status.SENDING,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+        )
+    return list(OutboundEmail.objects.filter(pk__in=ids).order_by("next_attempt_at", "pk"))
+
+
+def record_failure(email, error):
+    email.attempts += 1
+    email.last_error = error
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = Status.DEAD
+        logger.error(
+            "Email %s moved to dead letter after %s attempts: %s", email.pk, email.attempts, error
+        )
+    else:
+        email.status = Status.PENDING
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def deliver_batch(emails):
+    """
+    Send a batch over a single provider connection.
+    Returns (sent, failed).
+
+    하나의 제공자 연결로 메일 묶음을 발송합니다.
+    (발송 수, 실패 수)를 반환합니다.
+    """
+    connection = get_connection(settings.EMAIL_OUTBOX_BACKEND, fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        for email in emails:
+            record_failure(email, repr(exc))
+        return 0, len(emails)
+
+    sent_ids = []
+    try:
+        for email in emails:
+            try:
+                if not connection.send_messages([build_message(email, connection)]):
+                    raise RuntimeError("The email backend did not send the message.")
+            except Exception as exc:
+                record_failure(email, repr(exc))
+            else:
+                sent_ids.append(email.pk)
+    finally:
+        connection.close()
+
+    OutboundEmail.objects.filter(pk__in=sent_ids).update(
+        status=Status.SENT, sent_at=timezone.now(), last_error=""
+    )
+    return len(sent_ids), len(emails) - len(sent_ids)
+
+
+def deliver_queued_email(batch_size=50, limit=None):
+    """
+    Deliver due emails batch by batch until none are left (or `limit` is reached).
+    Returns a dict with the number of sent and failed attempts.
+
+    발송 예정 메일이 없을 때까지(또는 `limit`에 도달할 때까지) 묶음 단위로 발송합니다.
+    발송 및 실패한 시도 수를 담은 dict를 반환합니다.
+    """
+    totals = {"sent": 0, "failed": 0}
+    processed = 0
+    while limit is None or processed < limit:
+        emails = claim_batch(batch_size if limit is None else min(batch_size, limit - processed))
+        if not emails:
+            break
+        sent, failed = deliver_batch(emails)
+        totals["sent"] += sent
+        totals["failed"] += failed
+        processed += len(emails)
+    return totals
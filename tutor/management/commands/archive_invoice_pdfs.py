@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from tutor.invoice_archive import archive_pending_invoices
+
+
+class Command(BaseCommand):
+    """
+    Render the archival PDF/A of finalized invoices once and store it with its checksum.
+    Intended to run periodically (cron); `download_pdf` serves the stored file afterwards.
+
+    확정 영수증의 보관용 PDF/A를 한 번 렌더링하여 체크섬과 함께 저장합니다.
+    주기적으로(cron) 실행하도록 설계되었으며, 이후 `download_pdf`는 저장된 파일을 제공합니다.
+
+    Usage: python manage.py archive_invoice_pdfs [--limit 500] [--retry-failed]
+    """
+
+    help = "Render and store archival PDFs of finalized invoices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Also retry invoices whose archival rendering failed before.",
+        )
+
+    def handle(self, *args, **options):
+        results = archive_pending_invoices(
+            limit=options["limit"], retry_failed=options["retry_failed"]
+        )
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(results.items()))
+        self.stdout.write(self.style.SUCCESS(f"Invoice PDFs archived ({summary or 'none'})."))
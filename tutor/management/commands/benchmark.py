@@ -0,0 +1,300 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from tutor.models import Tutor, Invoice
+
+
+DEFAULT_ENDPOINTS = [
+    "dashboard_stats",
+    "exam_stats",
+    "lessons_range",
+    "exam_records",
+    "invoice_save_draft",
+    "invoice_create_full",
+    "invoice_download_pdf",
+]
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the hot API endpoints against a seeded database.
+    Each endpoint is called repeatedly through the full Django/DRF stack and the
+    p50/p95/p99 latency, query count and peak Python memory are recorded.
+    Write endpoints run inside a rolled-back transaction so repeated runs stay comparable.
+    Results are written to a JSON file for comparison between runs.
+    The command fails if any endpoint answered with a non-2xx status, since its
+    timings would then measure the error path instead of the real request.
+
+    시드 데이터가 채워진 DB를 대상으로 주요 API 엔드포인트를 벤치마크합니다.
+    각 엔드포인트를 Django/DRF 전체 스택을 통해 반복 호출하여
+    p50/p95/p99 응답 시간, 쿼리 수, 최대 Python 메모리 사용량을 기록합니다.
+    쓰기 엔드포인트는 롤백되는 트랜잭션 안에서 실행되어 반복 실행 결과를 비교할 수 있습니다.
+    결과는 실행 간 비교를 위해 JSON 파일로 저장됩니다.
+    엔드포인트가 2xx가 아닌 상태 코드로 응답하면 측정값이 실제 요청이 아닌 오류 경로를
+    측정한 것이므로 명령이 실패합니다.
+
+    Usage: python manage.py benchmark --iterations 50 --output benchmarks/run.json
+    """
+
+    help = "Benchmark hot API endpoints and write latency/query/memory stats to JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tutor",
+            help="Username of the tutor to benchmark as (default: tutor with most students)",
+        )
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=DEFAULT_ENDPOINTS,
+            default=DEFAULT_ENDPOINTS,
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of the JSON results file (default: benchmarks/<timestamp>.json)",
+        )
+
+    def handle(self, *args, **options):
+        self.tutor = self._get_tutor(options["tutor"])
+        self.student = self.tutor.students.order_by("pk").first()
+        if self.student is None:
+            raise CommandError("The selected tutor has no students. Run seed_load first.")
+
+        self.client = APIClient(SERVER_NAME=settings.ALLOWED_HOSTS[0] or "localhost")
+        self.client.force_authenticate(user=self.tutor)
+
+        results = {
+            "created_at": timezone.now().isoformat(),
+            "tutor": self.tutor.username,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "debug": settings.DEBUG,
+            "iterations": options["iterations"],
+            "dataset": self._dataset_size(),
+            "endpoints": {},
+        }
+
+        failed = []
+        for name in options["endpoints"]:
+            method, url, payload = getattr(self, f"_request_{name}")()
+            stats = self._run(method, url, payload, options["iterations"], options["warmup"])
+            results["endpoints"][name] = {"method": method.upper(), "url": url, **stats}
+            line = (
+                f"{name:<22} p50={stats['p50_ms']:>8.1f}ms p95={stats['p95_ms']:>8.1f}ms "
+                f"p99={stats['p99_ms']:>8.1f}ms queries={stats['queries']:>4} "
+                f"peak={stats['peak_memory_kb']:>8.1f}KB status={stats['status']}"
+            )
+            if stats["ok"]:
+                self.stdout.write(line)
+            else:
+                failed.append(f"{name} ({stats['status']})")
+                self.stdout.write(self.style.ERROR(line))
+
+        output = Path(
+            options["output"]
+            or settings.BASE_DIR / "benchmarks" / f"{timezone.now():%Y%m%d-%H%M%S}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        if failed:
+            raise CommandError(
+                f"Non-2xx responses from {', '.join(failed)}; results written to {output} "
+                "do not measure the successful request path."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def _get_tutor(self, username):
+        """
+        Resolve the benchmark tutor, defaulting to the one with the largest data set.
+
+        벤치마크 대상 튜터를 조회하며, 기본값은 데이터가 가장 많은 튜터입니다.
+        """
+        if username:
+            try:
+                return Tutor.objects.get(username=username)
+            except Tutor.DoesNotExist:
+                raise CommandError(f"Tutor '{username}' does not exist.")
+
+        tutor = (
+            Tutor.objects.annotate(student_count=Count("students"))
+            .order_by("-student_count", "pk")
+            .first()
+        )
+        if tutor is None:
+            raise CommandError("No tutors found. Run seed_load first.")
+        return tutor
+
+    def _dataset_size(self):
+        return {
+            "students": self.tutor.students.count(),
+            "lessons": self.tutor.students.aggregate(n=Count("lessons"))["n"],
+            "exam_records": self.tutor.students.aggregate(n=Count("exam_records"))["n"],
+            "invoices": self.tutor.invoices.count(),
+        }
+
+    def _run(self, method, url, payload, iterations, warmup):
+        """
+        Call one endpoint repeatedly and aggregate latency, query and memory metrics.
+        Memory is traced in a separate pass so tracemalloc overhead does not skew latency.
+
+        하나의 엔드포인트를 반복 호출하고 응답 시간, 쿼리, 메모리 지표를 집계합니다.
+        tracemalloc 오버헤드가 응답 시간에 영향을 주지 않도록 메모리는 별도 실행에서 측정합니다.
+        """
+        for _ in range(warmup):
+            self._call(method, url, payload)
+
+        timings = []
+        queries = []
+        statuses = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                statuses.append(self._call(method, url, payload))
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(context.captured_queries))
+
+        # Report the first failing status, if any, rather than the last one
+        # 마지막 상태 코드가 아닌 첫 번째 실패 상태 코드를 보고함
+        failures = [code for code in statuses if not 200 <= code < 300]
+
+        tracemalloc.start()
+        try:
+            self._call(method, url, payload)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if len(timings) > 1:
+            cut_points = statistics.quantiles(timings, n=100, method="inclusive")
+            p50, p95, p99 = cut_points[49], cut_points[94], cut_points[98]
+        else:
+            p50 = p95 = p99 = timings[0]
+
+        return {
+            "status": failures[0] if failures else statuses[-1],
+            "ok": not failures,
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "queries": max(queries),
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+    def _call(self, method, url, payload):
+        """
+        Execute one request. Write requests are rolled back after the response.
+
+        요청을 한 번 실행합니다. 쓰기 요청은 응답 후 롤백됩니다.
+        """
+        if method == "get":
+            response = self.client.get(url, payload)
+            # Streaming responses must be consumed to measure the full cost
+            # 전체 비용 측정을 위해 스트리밍 응답은 끝까지 소비해야 함
+            if response.streaming:
+                b"".join(response.streaming_content)
+            return response.status_code
+
+        with transaction.atomic():
+            response = self.client.post(url, payload, format="json")
+            transaction.set_rollback(True)
+        return response.status_code
+
+    # --- Endpoint definitions ---
+    # --- 엔드포인트 정의 ---
+
+    def _request_dashboard_stats(self):
+        return "get", "/api/dashboard/stats/", None
+
+    def _request_exam_stats(self):
+        return "get", "/api/exams/stats/", None
+
+    def _request_lessons_range(self):
+        today = timezone.localdate()
+        return (
+            "get",
+            "/api/lessons/",
+            {
+                "start_date": (today - timedelta(days=35)).isoformat(),
+                "end_date": (today + timedelta(days=7)).isoformat(),
+            },
+        )
+
+    def _request_exam_records(self):
+        return "get", "/api/exam-records/", None
+
+    def _request_invoice_save_draft(self):
+        return "post", "/api/invoices/save_draft/", self._invoice_payload()
+
+    def _request_invoice_create_full(self):
+        return "post", "/api/invoices/create_full/", self._invoice_payload()
+
+    def _request_invoice_download_pdf(self):
+        invoice = (
+            Invoice.objects.filter(tutor=self.tutor, is_finalized=True)
+            .order_by("pk")
+            .first()
+        )
+        if invoice is None:
+            raise CommandError("The selected tutor has no finalized invoices.")
+        return "get", f"/api/invoices/{invoice.pk}/download_pdf/", None
+
+    def _invoice_payload(self):
+        """
+        Build a realistic invoice payload with several items and an adjustment.
+
+        여러 항목과 조정 내역을 포함한 현실적인 영수증 payload를 생성합니다.
+        """
+        today = timezone.localdate()
+        student = self.student
+        return {
+            "student": student.pk,
+            "recipient_name": student.billing_name or student.name,
+            "recipient_address": {
+                "street": student.street,
+                "zip": student.postcode,
+                "city": student.city,
+                "country": student.country,
+            },
+            "invoice_date": today.isoformat(),
+            "delivery_date_start": today.replace(day=1).isoformat(),
+            "delivery_date_end": today.isoformat(),
+            "due_date": (today + timedelta(days=14)).isoformat(),
+            "price_mode": "NETTO",
+            "subject": "Rechnung",
+            "header_text": "<p>Sehr geehrte Damen und Herren,</p>",
+            "footer_text": "Bitte bis [%ZAHLUNGSZIEL%] zahlen.",
+            "items": [
+                {
+                    "description": f"Deutschunterricht Position {position}",
+                    "quantity": "2.00",
+                    "unit": "HOUR",
+                    "unit_price": "45.00",
+                    "discount_value": "0.00",
+                    "discount_unit": "PERCENT",
+                    "vat_rate": "19.00",
+                    "total_price": "90.00",
+                }
+                for position in range(1, 6)
+            ],
+            "adjustments": [
+                {"label": "Rabatt", "type": "DISCOUNT", "value": "5.00", "unit": "PERCENT"}
+            ],
+        }
@@ -0,0 +1,151 @@
+import io
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tutor.models import Tutor
+from tutor.parsers import ORJSONParser
+from tutor.renderers import ORJSONRenderer
+
+
+PAYLOADS = {
+    "exam_records": "/api/exam-records/",
+    "invoices": "/api/invoices/",
+    "dashboard_stats": "/api/dashboard/stats/",
+}
+
+
+class Command(BaseCommand):
+    """
+    Compare DRF's default JSON renderer/parser with the orjson implementation.
+    Payloads are the real serializer output of list endpoints for a seeded tutor
+    (exam records with nested detail results, invoices with items), so the
+    Decimal/date handling is measured on realistic data. Both renderers must
+    produce identical bytes; the command fails otherwise.
+
+    DRF 기본 JSON 렌더러/파서와 orjson 구현을 비교합니다.
+    페이로드는 시드 데이터 튜터의 목록 엔드포인트 실제 시리얼라이저 출력
+    (중첩 상세 결과를 포함한 시험 기록, 항목을 포함한 영수증)이므로
+    현실적인 데이터에서 Decimal/날짜 처리 비용을 측정합니다.
+    두 렌더러의 출력 바이트가 동일해야 하며, 다르면 커맨드가 실패합니다.
+
+    Usage: python manage.py benchmark_json --iterations 50
+    """
+
+    help = "Benchmark the orjson renderer/parser against DRF's JSON renderer/parser."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tutor",
+            help="Username of the tutor whose data is rendered (default: tutor with most exam records)",
+        )
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument(
+            "--payloads", nargs="+", choices=list(PAYLOADS), default=list(PAYLOADS)
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of the JSON results file (default: benchmarks/json-<timestamp>.json)",
+        )
+
+    def handle(self, *args, **options):
+        tutor = self._get_tutor(options["tutor"])
+        client = APIClient(SERVER_NAME=settings.ALLOWED_HOSTS[0] or "localhost")
+        client.force_authenticate(user=tutor)
+
+        results = {
+            "created_at": timezone.now().isoformat(),
+            "tutor": tutor.username,
+            "python": platform.python_version(),
+            "iterations": options["iterations"],
+            "payloads": {},
+        }
+
+        for name in options["payloads"]:
+            response = client.get(PAYLOADS[name])
+            if response.status_code != 200:
+                raise CommandError(f"{PAYLOADS[name]} returned {response.status_code}.")
+
+            stats = self._compare(response.data, options["iterations"])
+            results["payloads"][name] = stats
+            self.stdout.write(
+                f"{name:<16} {stats['bytes']:>10} bytes  "
+                f"render {stats['render_json_ms']:>8.2f}ms -> {stats['render_orjson_ms']:>8.2f}ms "
+                f"(x{stats['render_speedup']})  "
+                f"parse {stats['parse_json_ms']:>8.2f}ms -> {stats['parse_orjson_ms']:>8.2f}ms "
+                f"(x{stats['parse_speedup']})"
+            )
+
+        output = Path(
+            options["output"]
+            or settings.BASE_DIR / "benchmarks" / f"json-{timezone.now():%Y%m%d-%H%M%S}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def _get_tutor(self, username):
+        if username:
+            try:
+                return Tutor.objects.get(username=username)
+            except Tutor.DoesNotExist:
+                raise CommandError(f"Tutor '{username}' does not exist.")
+
+        tutor = (
+            Tutor.objects.annotate(record_count=Count("students__exam_records"))
+            .order_by("-record_count", "pk")
+            .first()
+        )
+        if tutor is None:
+            raise CommandError("No tutors found. Run seed_load first.")
+        return tutor
+
+    def _compare(self, data, iterations):
+        """
+        Time rendering and parsing of one payload with both implementations.
+
+        하나의 페이로드에 대해 두 구현의 렌더링 및 파싱 시간을 측정합니다.
+        """
+        default_bytes = JSONRenderer().render(data)
+        orjson_bytes = ORJSONRenderer().render(data)
+        if default_bytes != orjson_bytes:
+            raise CommandError("ORJSONRenderer output differs from JSONRenderer output.")
+
+        render_json = self._median(lambda: JSONRenderer().render(data), iterations)
+        render_orjson = self._median(lambda: ORJSONRenderer().render(data), iterations)
+        parse_json = self._median(
+            lambda: JSONParser().parse(io.BytesIO(default_bytes)), iterations
+        )
+        parse_orjson = self._median(
+            lambda: ORJSONParser().parse(io.BytesIO(default_bytes)), iterations
+        )
+
+        return {
+            "bytes": len(default_bytes),
+            "identical": True,
+            "render_json_ms": round(render_json, 3),
+            "render_orjson_ms": round(render_orjson, 3),
+            "render_speedup": round(render_json / max(render_orjson, 1e-6), 1),
+            "parse_json_ms": round(parse_json, 3),
+            "parse_orjson_ms": round(parse_orjson, 3),
+            "parse_speedup": round(parse_json / max(parse_orjson, 1e-6), 1),
+        }
+
+    def _median(self, func, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tutor.models import BusinessProfile, ExamAttachment
+from tutor.storage import BLOB_PREFIX
+
+
+class Command(BaseCommand):
+    """
+    Move files uploaded before content-addressed storage into deduplicated blobs.
+    Each legacy file is hashed, stored once under its hash and the row is repointed;
+    the legacy file is removed afterwards.
+
+    내용 주소 기반 스토리지 도입 이전에 업로드된 파일을 중복 제거된 블롭으로 옮깁니다.
+    각 기존 파일을 해시하여 한 번만 저장하고 행이 새 경로를 가리키도록 수정한 뒤,
+    기존 파일을 삭제합니다.
+
+    Usage: python manage.py dedupe_media
+    """
+
+    help = "Migrate legacy attachment and logo files into content-addressed blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = 0
+        for model, field_name in ((ExamAttachment, "file"), (BusinessProfile, "logo")):
+            legacy = (
+                model.objects.exclude(**{f"{field_name}__startswith": f"{BLOB_PREFIX}/"})
+                .exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .order_by("pk")
+            )
+            moved = 0
+            for instance in legacy.iterator(chunk_size=options["chunk_size"]):
+                fieldfile = getattr(instance, field_name)
+                storage = fieldfile.storage
+                old_name = fieldfile.name
+
+                if not storage.exists(old_name):
+                    self.stderr.write(f"Missing file skipped: {old_name}")
+                    continue
+
+                with transaction.atomic():
+                    with storage.open(old_name, "rb") as fh:
+                        new_name = storage.save(old_name, fh)
+                    changes = {field_name: new_name, "updated_at": timezone.now()}
+                    if model is ExamAttachment:
+                        # The cached thumbnail is removed with the legacy file
+                        # 캐시된 썸네일은 기존 파일과 함께 삭제됨
+                        changes.update(
+                            thumbnail="",
+                            thumbnail_status=ExamAttachment.ThumbnailStatusChoices.PENDING,
+                        )
+                    model.objects.filter(pk=instance.pk).update(**changes)
+                    if model is ExamAttachment:
+                        instance.touch_parent_row()
+
+                # Legacy names have no blob row, so this removes the old file directly
+                # 기존 이름은 블롭 행이 없으므로 기존 파일이 바로 삭제됨
+                storage.delete(old_name)
+                moved += 1
+
+            self.stdout.write(f"{model.__name__}: {moved} file(s) deduplicated")
+            total += moved
+
+        self.stdout.write(self.style.SUCCESS(f"Done ({total} files)."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from tutor.thumbnails import generate_pending_thumbnails
+
+
+class Command(BaseCommand):
+    """
+    Generate preview thumbnails for exam attachments (images and PDF first pages).
+    Intended to run periodically (cron) next to the other background commands.
+
+    시험 첨부파일(이미지 및 PDF 첫 페이지)의 미리보기 썸네일을 생성합니다.
+    다른 백그라운드 커맨드와 함께 주기적으로(cron) 실행하도록 설계되었습니다.
+
+    Usage: python manage.py generate_thumbnails [--limit 500] [--retry-failed]
+    """
+
+    help = "Generate thumbnails for exam attachments that do not have one yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Also retry attachments whose thumbnail generation failed before.",
+        )
+
+    def handle(self, *args, **options):
+        results = generate_pending_thumbnails(
+            limit=options["limit"], retry_failed=options["retry_failed"]
+        )
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(results.items()))
+        self.stdout.write(self.style.SUCCESS(f"Thumbnails processed ({summary or 'none'})."))
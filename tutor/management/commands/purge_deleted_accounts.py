@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from tutor.deletion import purge_tutor
+from tutor.models import Tutor
+
+
+class Command(BaseCommand):
+    """
+    Purge the data of accounts that were marked for deletion.
+    Intended to run periodically (e.g. cron) as the background part of account deletion.
+
+    삭제 요청된 계정의 데이터를 실제로 삭제합니다.
+    계정 삭제의 백그라운드 처리 부분으로 주기적으로(예: cron) 실행하도록 설계되었습니다.
+
+    Usage: python manage.py purge_deleted_accounts --chunk-size 1000
+    """
+
+    help = "Purge data of accounts marked for deletion in bounded chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Maximum number of accounts per run"
+        )
+
+    def handle(self, *args, **options):
+        tutors = Tutor.objects.filter(
+            is_active=False, deletion_requested_at__isnull=False
+        ).order_by("deletion_requested_at")
+        if options["limit"]:
+            tutors = tutors[: options["limit"]]
+
+        purged = 0
+        for tutor in tutors:
+            self.stdout.write(f"Purging account {tutor.pk} ...")
+            deleted = purge_tutor(
+                tutor,
+                chunk_size=options["chunk_size"],
+                progress=lambda step, count: self.stdout.write(f"  {step}: {count}"),
+            )
+            self.stdout.write(f"  done ({sum(deleted.values())} rows)")
+            purged += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} account(s)."))
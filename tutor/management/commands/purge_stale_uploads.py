@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tutor.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    """
+    Remove unfinished chunked uploads older than CHUNKED_UPLOAD_EXPIRY_HOURS.
+
+    CHUNKED_UPLOAD_EXPIRY_HOURS보다 오래된 미완료 청크 업로드를 삭제합니다.
+
+    Usage: python manage.py purge_stale_uploads
+    """
+
+    help = "Remove expired unfinished attachment uploads and their staging files."
+
+    def handle(self, *args, **options):
+        removed = purge_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} stale upload(s)."))
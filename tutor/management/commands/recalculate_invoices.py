@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from tutor.models import Invoice
+from tutor.recalculation import recalculate_invoices
+
+
+class Command(BaseCommand):
+    """
+    Recalculate the stored totals of invoices in bulk, e.g. after a tax or rounding fix.
+    Each batch is loaded with one query per table, calculated in fixed-point integers
+    and written back with bulk_update; unchanged rows are not written.
+
+    세금 또는 반올림 수정 후 등에 영수증의 저장된 총액을 일괄 재계산합니다.
+    각 묶음은 테이블마다 한 번의 쿼리로 불러와 고정소수점 정수로 계산하고
+    bulk_update로 저장하며, 변경되지 않은 행은 저장하지 않습니다.
+    Finalized invoices are skipped unless --include-finalized is given, and archived
+    ones (whose PDF/A was already issued) are never changed.
+    --include-finalized를 지정하지 않으면 확정 영수증은 건너뛰며,
+    PDF/A가 이미 발행된 보관 영수증은 절대 변경하지 않습니다.
+
+    Usage: python manage.py recalculate_invoices [--tutor 1] [--include-finalized] [--dry-run]
+    """
+
+    help = "Recalculate stored invoice, item and adjustment totals in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Number of invoices per transaction"
+        )
+        parser.add_argument("--tutor", type=int, help="Only recalculate this tutor (ID)")
+        parser.add_argument(
+            "--include-finalized",
+            action="store_true",
+            help="Also recalculate finalized invoices whose archival PDF is not rendered yet",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Count the changes without saving them"
+        )
+
+    def handle(self, *args, **options):
+        invoices = Invoice.objects.all()
+        if options["tutor"]:
+            invoices = invoices.filter(tutor_id=options["tutor"])
+
+        totals = recalculate_invoices(
+            invoices,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            include_finalized=options["include_finalized"],
+        )
+        verb = "Would change" if options["dry_run"] else "Changed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {totals['invoices']} invoice(s). {verb} {totals['changed']} "
+                f"invoice(s), {totals['items']} item(s) and {totals['adjustments']} adjustment(s)."
+            )
+        )
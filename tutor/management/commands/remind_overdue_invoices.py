@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tutor.reminders import remind_overdue_invoices
+
+
+class Command(BaseCommand):
+    """
+    Create payment reminders for finalized invoices that are past due and unpaid.
+    Intended to run daily (cron); an invoice is reminded again every
+    INVOICE_REMINDER_INTERVAL_DAYS days, at most INVOICE_REMINDER_MAX_COUNT times.
+
+    만기가 지났지만 결제되지 않은 확정 영수증에 대한 결제 알림을 생성합니다.
+    매일(cron) 실행하도록 설계되었으며, 영수증마다 INVOICE_REMINDER_INTERVAL_DAYS일마다
+    최대 INVOICE_REMINDER_MAX_COUNT회까지 다시 알립니다.
+
+    Usage: python manage.py remind_overdue_invoices [--batch-size 200] [--email] [--no-todos]
+    """
+
+    help = "Create reminder todos and/or emails for overdue invoices."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="Number of tutors per query"
+        )
+        parser.add_argument(
+            "--email", action="store_true", help="Queue one summary email per tutor"
+        )
+        parser.add_argument(
+            "--no-todos", action="store_true", help="Do not create reminder todos"
+        )
+
+    def handle(self, *args, **options):
+        if options["no_todos"] and not options["email"]:
+            raise CommandError("Nothing to do: --no-todos requires --email.")
+
+        totals = remind_overdue_invoices(
+            batch_size=options["batch_size"],
+            create_todos=not options["no_todos"],
+            send_emails=options["email"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reminded {totals['invoices']} invoice(s): {totals['todos']} todo(s), "
+                f"{totals['emails']} email(s) queued."
+            )
+        )
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from tutor.exports import EXPORT_CHUNK_SIZE, expire_stale_exports, run_export
+from tutor.models import DataExport
+
+
+class Command(BaseCommand):
+    """
+    Build queued data exports (GDPR) as ZIP archives.
+    Intended to run periodically (e.g. cron) as the background worker for /api/exports/.
+
+    대기 중인 데이터 내보내기(GDPR)를 ZIP 아카이브로 생성합니다.
+    /api/exports/의 백그라운드 작업자로 주기적으로(예: cron) 실행하도록 설계되었습니다.
+    Exports left RUNNING longer than DATA_EXPORT_LEASE by a killed worker are marked failed.
+    종료된 작업자가 DATA_EXPORT_LEASE보다 오래 RUNNING 상태로 남긴 내보내기는 실패로 표시합니다.
+    Each export is claimed before it is built, so overlapping runs never build it twice.
+    각 내보내기는 생성 전에 선점되므로 겹쳐서 실행되어도 두 번 생성되지 않습니다.
+
+    Usage: python manage.py run_data_exports --chunk-size 2000
+    """
+
+    help = "Build pending data exports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+        parser.add_argument(
+            "--skip-invoice-pdfs",
+            action="store_true",
+            help="Do not render PDFs of finalized invoices",
+        )
+
+    def handle(self, *args, **options):
+        expired = expire_stale_exports()
+        if expired:
+            self.stdout.write(self.style.WARNING(f"Expired {expired} abandoned export(s)."))
+
+        pending = DataExport.objects.filter(
+            status=DataExport.StatusChoices.PENDING
+        ).select_related("tutor").order_by("created_at")
+
+        for export in pending:
+            self.stdout.write(f"Building export {export.pk} for tutor {export.tutor_id} ...")
+            if run_export(
+                export,
+                chunk_size=options["chunk_size"],
+                include_invoice_pdfs=not options["skip_invoice_pdfs"],
+            ) is None:
+                self.stdout.write("  claimed by another worker, skipped")
+                continue
+            style = self.style.SUCCESS if export.status == DataExport.StatusChoices.COMPLETED else self.style.ERROR
+            self.stdout.write(style(f"  {export.status}"))
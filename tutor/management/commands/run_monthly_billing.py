@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tutor.billing import BILLING_SOURCES, run_billing
+from tutor.models import Tutor
+
+
+class Command(BaseCommand):
+    """
+    Monthly billing run: create draft invoices for unbilled course registrations
+    (or completed lessons) of a month, for every tutor with a business profile.
+    Intended to run at the start of a month (cron) for the previous month.
+    Each tutor is billed in its own transaction with one locked block of invoice numbers.
+
+    월간 일괄 정산: 사업자 프로필이 있는 모든 튜터에 대해 해당 월의 미청구 수강 등록
+    (또는 완료된 수업)에 대한 임시저장 영수증을 생성합니다.
+    매월 초(cron)에 지난달을 대상으로 실행하도록 설계되었습니다.
+    튜터마다 별도의 트랜잭션에서 잠긴 영수증 번호 블록 하나로 처리됩니다.
+
+    Usage: python manage.py run_monthly_billing [--month 2026-09] [--source lessons] [--preview]
+    """
+
+    help = "Create draft invoices for a month's unbilled registrations or lessons."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", help="YYYY-MM (default: previous month)")
+        parser.add_argument("--source", choices=BILLING_SOURCES, default="registrations")
+        parser.add_argument("--tutor", type=int, help="Only bill this tutor (ID)")
+        parser.add_argument(
+            "--preview", action="store_true", help="List the invoices without creating them"
+        )
+
+    def handle(self, *args, **options):
+        if options["month"]:
+            try:
+                month = datetime.strptime(options["month"], "%Y-%m").date()
+            except ValueError as exc:
+                raise CommandError("--month must be formatted as YYYY-MM.") from exc
+        else:
+            month = timezone.localdate().replace(day=1) - timedelta(days=1)
+
+        tutors = Tutor.objects.filter(is_active=True, business_profile__isnull=False)
+        if options["tutor"]:
+            tutors = tutors.filter(pk=options["tutor"])
+
+        total = 0
+        for tutor in tutors.order_by("pk"):
+            result = run_billing(
+                tutor, month, source=options["source"], preview=options["preview"]
+            )
+            for invoice in result["invoices"]:
+                self.stdout.write(
+                    f"  {tutor.pk}: {invoice['full_invoice_code']} {invoice['student_name']} "
+                    f"{invoice['hours']} h {invoice['total_amount']} EUR"
+                )
+            for skipped in result["skipped"]:
+                self.stdout.write(
+                    f"  {tutor.pk}: skipped {skipped['student_name']}: {skipped['reason']}"
+                )
+            total += len(result["invoices"])
+
+        verb = "Would create" if options["preview"] else "Created"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} draft invoice(s) for {month:%Y-%m}."))
@@ -0,0 +1,521 @@
+import random
+import time as timer
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from allauth.account.models import EmailAddress
+
+from tutor.models import (
+    Tutor,
+    BusinessProfile,
+    Student,
+    CourseRegistration,
+    ExamStandard,
+    ExamRecord,
+    ExamDetailResult,
+    ExamScoreInput,
+    OfficialExamResult,
+    Lesson,
+    Todo,
+    Invoice,
+    InvoiceItem,
+    InvoiceAdjustment,
+)
+
+
+CENT = Decimal("0.01")
+
+FIRST_NAMES = [
+    "Anna", "Ben", "Clara", "David", "Elif", "Felix", "Greta", "Hannah", "Ivan",
+    "Jana", "Karim", "Lena", "Mehmet", "Nina", "Oskar", "Paula", "Quentin",
+    "Rosa", "Sven", "Tamara", "Uwe", "Vera", "Wiktor", "Yasmin", "Zoe",
+]
+LAST_NAMES = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner",
+    "Becker", "Hoffmann", "Schulz", "Koch", "Richter", "Klein", "Wolf", "Kim",
+    "Park", "Nowak", "Yilmaz", "Popescu", "Rossi",
+]
+CITIES = [
+    ("Berlin", "10115"), ("Hamburg", "20095"), ("München", "80331"),
+    ("Köln", "50667"), ("Frankfurt am Main", "60311"), ("Leipzig", "04109"),
+]
+TOPICS = [
+    "Kapitel {n} - Grammatik", "Hörverstehen Übung {n}", "Leseverstehen Teil {n}",
+    "Schreiben: Brief {n}", "Sprechen: Präsentation {n}", "Wortschatz Lektion {n}",
+]
+TODO_CONTENTS = [
+    "Material für {name} vorbereiten", "Rechnung an {name} senden",
+    "Prüfungsanmeldung für {name} prüfen", "Hausaufgaben von {name} korrigieren",
+]
+LEVELS = ["A1", "A2", "B1", "B2", "C1"]
+
+
+class Command(BaseCommand):
+    """
+    Generate a realistic synthetic data set for load testing and benchmarks.
+    Creates tutors with students, course registrations, lessons, mock exams with
+    full detail results per ExamStandard section, official results, todos and
+    draft/finalized invoices. All rows are inserted with batched bulk_create,
+    one transaction per tutor, and generation is deterministic for a given seed.
+
+    부하 테스트 및 벤치마크를 위한 현실적인 합성 데이터를 생성합니다.
+    튜터별로 학생, 수강 등록, 수업, ExamStandard 섹션에 맞춘 상세 결과를 포함한 모의고사,
+    정규 시험 결과, 투두, 임시저장/확정 영수증을 생성합니다.
+    모든 행은 배치 bulk_create로 튜터 단위 트랜잭션 안에서 삽입되며,
+    동일한 seed에 대해 항상 같은 데이터를 생성합니다.
+
+    Usage: python manage.py seed_load --tutors 10 --students 100 --seed 42
+    """
+
+    help = "Generate a deterministic synthetic data set for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=1)
+        parser.add_argument("--students", type=int, default=100, help="Students per tutor")
+        parser.add_argument("--lessons", type=int, default=40, help="Lessons per student")
+        parser.add_argument("--exams", type=int, default=4, help="Mock exams per student")
+        parser.add_argument("--official", type=int, default=1, help="Official results per student")
+        parser.add_argument("--invoices", type=int, default=3, help="Invoices per student")
+        parser.add_argument("--todos", type=int, default=50, help="Todos per tutor")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--prefix",
+            default="loadtest",
+            help="Prefix for generated tutor usernames/e-mails (must be unique per run)",
+        )
+        parser.add_argument(
+            "--password",
+            default="Loadtest!2026",
+            help="Password shared by all generated tutors",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.options = options
+        self.today = date.today()
+
+        self.standards = self._load_exam_standards()
+        if not self.standards:
+            raise CommandError(
+                "No ExamStandard with modules and sections found. "
+                "Load the exam standards (admin/fixtures) before seeding."
+            )
+
+        prefix = options["prefix"]
+        if Tutor.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Tutors with prefix '{prefix}' already exist. Use another --prefix.")
+
+        # Hash once and share it: per-user PBKDF2 would dominate the runtime
+        # 비밀번호 해시는 한 번만 계산하여 공유 (사용자별 PBKDF2 연산이 실행 시간을 지배하므로)
+        password_hash = make_password(options["password"])
+        started = timer.perf_counter()
+        total_rows = 0
+
+        for index in range(options["tutors"]):
+            tutor_started = timer.perf_counter()
+            with transaction.atomic():
+                rows = self._seed_tutor(index, prefix, password_hash)
+            total_rows += rows
+            self.stdout.write(
+                f"[{index + 1}/{options['tutors']}] {rows} rows "
+                f"in {timer.perf_counter() - tutor_started:.1f}s"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {total_rows} rows for {options['tutors']} tutors "
+                f"in {timer.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def _load_exam_standards(self):
+        """
+        Load exam standards with their sections grouped by module type.
+
+        시험 표준과 섹션을 모듈 유형별로 그룹화하여 불러옵니다.
+        """
+        standards = []
+        for standard in ExamStandard.objects.prefetch_related("modules__sections").order_by("pk"):
+            sections = {
+                module.module_type: list(module.sections.all())
+                for module in standard.modules.all()
+            }
+            if any(sections.values()):
+                standards.append((standard, sections))
+        return standards
+
+    def _bulk(self, model, objects):
+        """
+        Insert objects in batches and return them with primary keys set.
+
+        객체를 배치 단위로 삽입하고 기본 키가 설정된 객체 목록을 반환합니다.
+        """
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def _random_date(self, days_back, days_ahead=0):
+        return self.today + timedelta(days=self.rng.randint(-days_back, days_ahead))
+
+    def _seed_tutor(self, index, prefix, password_hash):
+        """
+        Generate the full data set for a single tutor.
+        Returns the number of inserted rows.
+
+        튜터 한 명에 대한 전체 데이터 세트를 생성합니다.
+        삽입된 행 수를 반환합니다.
+        """
+        rng = self.rng
+        options = self.options
+
+        username = f"{prefix}-{index:05d}"
+        tutor = Tutor.objects.create(
+            username=username,
+            email=f"{username}@loadtest.invalid",
+            name=f"Loadtest Tutor {index}",
+            password=password_hash,
+        )
+        EmailAddress.objects.create(user=tutor, email=tutor.email, primary=True, verified=True)
+        is_small_business = index % 4 == 0
+        city, postcode = rng.choice(CITIES)
+        profile = BusinessProfile.objects.create(
+            tutor=tutor,
+            manager_name=tutor.name,
+            street=f"Lehrerstraße {index + 1}",
+            postcode=postcode,
+            city=city,
+            email=tutor.email,
+            iban="DE02120300000000202051",
+            bic="BYLADEM1001",
+            is_small_business=is_small_business,
+        )
+        rows = 3
+
+        # Students
+        # 학생
+        students = []
+        for number in range(options["students"]):
+            city, postcode = rng.choice(CITIES)
+            current = rng.randrange(len(LEVELS) - 1)
+            students.append(
+                Student(
+                    tutor=tutor,
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    customer_number=f"KD-L{tutor.pk}-{number}",
+                    gender=rng.choice(["M", "F"]),
+                    age=rng.randint(16, 60),
+                    current_level=LEVELS[current],
+                    target_level=LEVELS[current + 1],
+                    street=f"Schülerweg {number + 1}",
+                    postcode=postcode,
+                    city=city,
+                    status=rng.choices(["ACTIVE", "PAUSED", "FINISHED"], [7, 1, 2])[0],
+                )
+            )
+        students = self._bulk(Student, students)
+        rows += len(students)
+
+        # Course registrations (one per month of activity)
+        # 수강 등록 (활동 월마다 하나씩)
+        registrations = []
+        for student in students:
+            for month_offset in range(rng.randint(1, 4)):
+                start = (self.today.replace(day=1) - timedelta(days=30 * month_offset)).replace(day=1)
+                hourly_rate = Decimal(rng.choice(["35.00", "40.00", "45.00", "50.00"]))
+                total_hours = Decimal(rng.choice(["8.0", "10.0", "12.0", "16.0"]))
+                registrations.append(
+                    CourseRegistration(
+                        student=student,
+                        status="ACTIVE" if month_offset == 0 else "FINISHED",
+                        start_date=start,
+                        end_date=start + timedelta(days=27),
+                        hourly_rate=hourly_rate,
+                        total_hours=total_hours,
+                        total_fee=hourly_rate * total_hours,
+                        is_paid=month_offset > 0 or rng.random() < 0.5,
+                    )
+                )
+        registrations = self._bulk(CourseRegistration, registrations)
+        rows += len(registrations)
+
+        registrations_by_student = {}
+        for registration in registrations:
+            registrations_by_student.setdefault(registration.student_id, []).append(registration)
+
+        # Lessons (past lessons are mostly completed)
+        # 수업 (지난 수업은 대부분 완료 상태)
+        lessons = []
+        for student in students:
+            student_registrations = registrations_by_student[student.pk]
+            for _ in range(options["lessons"]):
+                lesson_date = self._random_date(days_back=365, days_ahead=60)
+                start_hour = rng.randint(8, 19)
+                if lesson_date < self.today:
+                    lesson_status = rng.choices(
+                        ["COMPLETED", "CANCELLED", "NOSHOW"], [90, 7, 3]
+                    )[0]
+                else:
+                    lesson_status = "SCHEDULED"
+                lessons.append(
+                    Lesson(
+                        student=student,
+                        course_registration=rng.choice(student_registrations),
+                        date=lesson_date,
+                        start_time=time(start_hour, rng.choice([0, 30])),
+                        end_time=time(start_hour + 1, rng.choice([0, 30])),
+                        topic=rng.choice(TOPICS).format(n=rng.randint(1, 12)),
+                        memo="Hausaufgabe: Übung {}".format(rng.randint(1, 20)),
+                        status=lesson_status,
+                    )
+                )
+        rows += len(self._bulk(Lesson, lessons))
+
+        # Mock exams with full section results
+        # 섹션별 전체 결과를 포함한 모의고사
+        records = []
+        record_sections = []
+        for student in students:
+            for _ in range(options["exams"]):
+                standard, sections_by_module = rng.choice(self.standards)
+                exam_mode = rng.choices(["FULL", "WRITTEN", "ORAL"], [6, 3, 1])[0]
+                if exam_mode == "FULL":
+                    sections = [s for group in sections_by_module.values() for s in group]
+                else:
+                    sections = sections_by_module.get(exam_mode, [])
+                if not sections:
+                    continue
+                records.append(
+                    ExamRecord(
+                        student=student,
+                        exam_standard=standard,
+                        exam_date=self._random_date(days_back=365),
+                        exam_mode=exam_mode,
+                        source=rng.choice(["Telc Modelltest", "Goethe Übungssatz", None]),
+                    )
+                )
+                record_sections.append(sections)
+        records = self._bulk(ExamRecord, records)
+        rows += len(records)
+
+        detail_results = []
+        score_inputs = []
+        for record, sections in zip(records, record_sections):
+            skill = rng.uniform(0.4, 0.95)
+            total = Decimal("0.00")
+            for section in sections:
+                if section.is_question_based:
+                    first = section.question_start_num or 1
+                    last = section.question_end_num or first
+                    points = section.points_per_question or Decimal("1.00")
+                    for question in range(first, last + 1):
+                        is_correct = rng.random() < skill
+                        score = points if is_correct else Decimal("0.00")
+                        total += score
+                        detail_results.append(
+                            ExamDetailResult(
+                                exam_record=record,
+                                exam_section=section,
+                                question_number=question,
+                                is_correct=is_correct,
+                                score=score,
+                            )
+                        )
+                else:
+                    score = (Decimal(section.section_max_score) * Decimal(str(round(skill, 2)))).quantize(CENT)
+                    total += score
+                    score_inputs.append(
+                        ExamScoreInput(exam_record=record, exam_section=section, score=score)
+                    )
+            record.total_score = total
+
+        rows += len(self._bulk(ExamDetailResult, detail_results))
+        rows += len(self._bulk(ExamScoreInput, score_inputs))
+        ExamRecord.objects.bulk_update(records, ["total_score"], batch_size=self.batch_size)
+
+        # Official results
+        # 정규 시험 결과
+        official_results = []
+        for student in students:
+            for _ in range(options["official"]):
+                standard, _sections = rng.choice(self.standards)
+                exam_date = self._random_date(days_back=365, days_ahead=90)
+                official_results.append(
+                    OfficialExamResult(
+                        student=student,
+                        exam_standard=standard,
+                        exam_date=exam_date,
+                        exam_mode=rng.choices(["FULL", "WRITTEN", "ORAL"], [6, 3, 1])[0],
+                        status=(
+                            "WAITING"
+                            if exam_date >= self.today
+                            else rng.choices(["PASSED", "FAILED"], [7, 3])[0]
+                        ),
+                    )
+                )
+        rows += len(self._bulk(OfficialExamResult, official_results))
+
+        # Todos
+        # 투두
+        todos = [
+            Todo(
+                tutor=tutor,
+                content=rng.choice(TODO_CONTENTS).format(name=rng.choice(students).name),
+                is_completed=rng.random() < 0.6,
+                due_date=self._random_date(days_back=60, days_ahead=30),
+                priority=rng.choice([1, 2, 3]),
+                category=rng.choice(["PREP", "ADMIN", "STUDENT", "PERSONAL"]),
+            )
+            for _ in range(options["todos"])
+        ]
+        rows += len(self._bulk(Todo, todos))
+
+        rows += self._seed_invoices(tutor, profile, students, registrations_by_student)
+        return rows
+
+    def _seed_invoices(self, tutor, profile, students, registrations_by_student):
+        """
+        Generate draft and finalized invoices with items and adjustments.
+        Totals are computed with Invoice.calculate_financials so they match the API.
+
+        항목과 조정 내역을 포함한 임시저장/확정 영수증을 생성합니다.
+        총액은 API와 동일하도록 Invoice.calculate_financials로 계산합니다.
+        """
+        rng = self.rng
+        vat_rate = Decimal("0.00") if profile.is_small_business else Decimal("19.00")
+        sender_data = {
+            "manager_name": profile.manager_name,
+            "street": profile.street,
+            "postcode": profile.postcode,
+            "city": profile.city,
+            "country": profile.country,
+            "email": profile.email,
+            "iban": profile.iban,
+            "bic": profile.bic,
+            "is_small_business": profile.is_small_business,
+        }
+
+        invoices = []
+        invoice_items = []
+        invoice_adjustments = []
+        sequence = profile.next_invoice_number
+
+        for student in students:
+            student_registrations = registrations_by_student[student.pk]
+            for number in range(self.options["invoices"]):
+                registration = student_registrations[number] if number < len(student_registrations) else None
+                invoice_date = (
+                    registration.start_date if registration else self._random_date(days_back=365)
+                )
+                items = [
+                    {
+                        "description": f"Deutschunterricht {invoice_date:%m/%Y}",
+                        "quantity": registration.total_hours if registration else Decimal("4.00"),
+                        "unit": "HOUR",
+                        "unit_price": registration.hourly_rate if registration else Decimal("45.00"),
+                        "discount_value": Decimal(rng.choice(["0.00", "0.00", "5.00", "10.00"])),
+                        "discount_unit": "PERCENT",
+                        "vat_rate": vat_rate,
+                    }
+                ]
+                if rng.random() < 0.3:
+                    items.append(
+                        {
+                            "description": "Lehrmaterial",
+                            "quantity": Decimal("1.00"),
+                            "unit": "FLAT_RATE",
+                            "unit_price": Decimal("19.90"),
+                            "discount_value": Decimal("0.00"),
+                            "discount_unit": "CURRENCY",
+                            "vat_rate": vat_rate,
+                        }
+                    )
+                adjustments = []
+                if rng.random() < 0.2:
+                    adjustments.append(
+                        {"label": "Treuerabatt", "type": "DISCOUNT", "value": Decimal("5.00"), "unit": "PERCENT"}
+                    )
+
+                calculated = Invoice.calculate_financials(
+                    items, adjustments, is_small_business=profile.is_small_business
+                )
+                is_finalized = number < self.options["invoices"] - 1 or rng.random() < 0.5
+                invoice = Invoice(
+                    tutor=tutor,
+                    student=student,
+                    # OneToOne link: only one invoice per registration
+                    # 1:1 관계이므로 수강 등록당 영수증은 하나만 연결
+                    course_registration=registration,
+                    invoice_number=sequence,
+                    full_invoice_code=f"RE-{sequence}{invoice_date:%y%m}-{tutor.pk}",
+                    invoice_date=invoice_date,
+                    delivery_date_start=invoice_date,
+                    delivery_date_end=invoice_date + timedelta(days=27),
+                    due_date=invoice_date + timedelta(days=14),
+                    sender_data=sender_data,
+                    recipient_name=student.name,
+                    recipient_address={
+                        "street": student.street,
+                        "zip": student.postcode,
+                        "city": student.city,
+                        "country": student.country,
+                    },
+                    subject="Rechnung",
+                    subtotal=calculated["subtotal"].quantize(CENT),
+                    vat_amount=calculated["vat_amount"].quantize(CENT),
+                    total_adjustment_amount=calculated["total_adjustment_amount"].quantize(CENT),
+                    total_amount=calculated["total_amount"].quantize(CENT),
+                    is_paid=is_finalized and invoice_date < self.today - timedelta(days=30),
+                    is_sent=is_finalized,
+                    is_finalized=is_finalized,
+                    is_small_business=profile.is_small_business,
+                )
+                invoices.append(invoice)
+                invoice_items.append(calculated["items"])
+                invoice_adjustments.append(calculated["adjustments"])
+                sequence += 1
+
+        invoices = self._bulk(Invoice, invoices)
+
+        items = []
+        adjustments = []
+        for invoice, calculated_items, calculated_adjustments in zip(
+            invoices, invoice_items, invoice_adjustments
+        ):
+            for position, item in enumerate(calculated_items, start=1):
+                items.append(
+                    InvoiceItem(
+                        invoice=invoice,
+                        position_number=position,
+                        description=item["description"],
+                        quantity=item["quantity"],
+                        unit=item["unit"],
+                        unit_price=item["unit_price"],
+                        discount_value=item["discount_value"],
+                        discount_unit=item["discount_unit"],
+                        vat_rate=item["vat_rate"],
+                        total_price=item["total_price"].quantize(CENT),
+                    )
+                )
+            for adjustment in calculated_adjustments:
+                adjustments.append(
+                    InvoiceAdjustment(
+                        invoice=invoice,
+                        label=adjustment["label"],
+                        type=adjustment["type"],
+                        value=adjustment["value"],
+                        unit=adjustment["unit"],
+                        amount=adjustment["amount"].quantize(CENT),
+                    )
+                )
+
+        rows = len(invoices)
+        rows += len(self._bulk(InvoiceItem, items))
+        rows += len(self._bulk(InvoiceAdjustment, adjustments))
+
+        profile.next_invoice_number = sequence
+        profile.save(update_fields=["next_invoice_number"])
+        return rows
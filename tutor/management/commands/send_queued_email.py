@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from tutor.mail import deliver_queued_email
+
+
+class Command(BaseCommand):
+    """
+    Deliver queued outbound emails (tutor.mail.OutboxEmailBackend).
+    Intended to run every minute (cron); failed deliveries are retried with
+    exponential backoff and moved to the dead letter state after
+    EMAIL_OUTBOX_MAX_ATTEMPTS attempts.
+
+    대기열의 발송 메일(tutor.mail.OutboxEmailBackend)을 발송합니다.
+    매분(cron) 실행하도록 설계되었으며, 실패한 발송은 지수 백오프로 재시도되고
+    EMAIL_OUTBOX_MAX_ATTEMPTS회 시도 후 데드 레터 상태로 이동합니다.
+
+    Usage: python manage.py send_queued_email [--batch-size 50] [--limit 500]
+    """
+
+    help = "Deliver queued outbound emails with batching and retries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--limit", type=int, default=None)
+
+    def handle(self, *args, **options):
+        totals = deliver_queued_email(
+            batch_size=options["batch_size"], limit=options["limit"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Emails sent: {totals['sent']}, failed: {totals['failed']}.")
+        )
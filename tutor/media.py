@@ -0,0 +1,183 @@
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
+
+from .invoice_rendering import invoice_pdf_filename
+from .models import BusinessProfile, DataExport, ExamAttachment, Invoice
+from .storage import BLOB_PREFIX
+
+
+RANGE_HEADER_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def find_owned_file(user, name):
+    """
+    Look up a stored file referenced by one of the user's rows.
+    Ownership follows the same relations as the API querysets
+    (e.g. ExamAttachment -> ExamRecord -> Student -> Tutor).
+    Returns (storage, download name) or None.
+
+    사용자의 데이터가 참조하는 저장 파일을 조회합니다.
+    소유권은 API QuerySet과 동일한 관계를 따릅니다
+    (예: ExamAttachment -> ExamRecord -> Student -> Tutor).
+    (storage, 다운로드 파일명) 또는 None을 반환합니다.
+    """
+    attachment = (
+        ExamAttachment.objects.filter(exam_record__student__tutor=user)
+        .filter(Q(file=name) | Q(thumbnail=name))
+        .only("file", "thumbnail", "original_name")
+        .first()
+    )
+    if attachment is not None:
+        if attachment.file.name == name:
+            return attachment.file.storage, attachment.original_name
+        return attachment.thumbnail.storage, None
+
+    if BusinessProfile.objects.filter(tutor=user, logo=name).exists():
+        return BusinessProfile._meta.get_field("logo").storage, None
+
+    if DataExport.objects.filter(tutor=user, file=name).exists():
+        return DataExport._meta.get_field("file").storage, None
+
+    invoice = Invoice.objects.filter(tutor=user, archived_pdf=name).only("full_invoice_code").first()
+    if invoice is not None:
+        return Invoice._meta.get_field("archived_pdf").storage, invoice_pdf_filename(invoice)
+
+    return None
+
+
+def parse_range(header, size):
+    """
+    Parse a single `Range: bytes=...` header into an inclusive (start, end) pair.
+    Returns None when the header should be ignored (malformed or multiple ranges)
+    and raises ValueError when the range cannot be satisfied.
+
+    단일 `Range: bytes=...` 헤더를 (start, end) 쌍(양 끝 포함)으로 해석합니다.
+    무시해야 하는 헤더(형식 오류 또는 다중 범위)는 None을 반환하고,
+    충족할 수 없는 범위는 ValueError를 발생시킵니다.
+    """
+    match = RANGE_HEADER_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+    elif last:
+        # Suffix range: the last N bytes
+        # 접미사 범위: 마지막 N 바이트
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        start, end = max(size - length, 0), size - 1
+    else:
+        return None
+
+    if start >= size:
+        raise ValueError(header)
+    return start, min(end, size - 1)
+
+
+class RangeReader:
+    """
+    File wrapper that stops after `length` bytes, used for 206 responses.
+    It has no `tell`/`seek`, so FileResponse leaves Content-Length to the caller.
+
+    `length` 바이트 이후 읽기를 멈추는 파일 래퍼로, 206 응답에 사용됩니다.
+    `tell`/`seek`가 없으므로 FileResponse는 Content-Length를 호출자에게 맡깁니다.
+    """
+
+    def __init__(self, fh, length):
+        self.fh = fh
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fh.close()
+
+
+def _stream_file(request, storage, name, content_type):
+    """
+    Development fallback: stream the file from Python with single-range support.
+
+    개발 환경용 대체 경로: 단일 범위 요청을 지원하며 Python에서 파일을 스트리밍합니다.
+    """
+    try:
+        fh = storage.open(name, "rb")
+    except FileNotFoundError:
+        raise Http404
+    size = storage.size(name)
+
+    try:
+        byte_range = parse_range(request.headers.get("Range", ""), size)
+    except ValueError:
+        fh.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(fh, content_type=content_type)
+    else:
+        start, end = byte_range
+        fh.seek(start)
+        response = FileResponse(
+            RangeReader(fh, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def media_response(request, storage, name, filename=None):
+    """
+    Build the response for an authorized media file.
+    With MEDIA_ACCEL_MODE set, the transfer is handed to the front proxy
+    (nginx `X-Accel-Redirect` or Apache/lighttpd `X-Sendfile`) and no bytes pass
+    through the Python worker; otherwise the file is streamed with FileResponse.
+
+    권한이 확인된 미디어 파일에 대한 응답을 생성합니다.
+    MEDIA_ACCEL_MODE가 설정되면 전송을 프런트 프록시(nginx `X-Accel-Redirect`
+    또는 Apache/lighttpd `X-Sendfile`)에 위임하여 Python 워커가 바이트를 전송하지 않고,
+    그렇지 않으면 FileResponse로 파일을 스트리밍합니다.
+    """
+    content_type = mimetypes.guess_type(filename or name)[0] or "application/octet-stream"
+    mode = settings.MEDIA_ACCEL_MODE
+
+    if mode == "x-accel":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_PREFIX.rstrip('/')}/{quote(name)}"
+    elif mode == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = storage.path(name)
+    else:
+        response = _stream_file(request, storage, name, content_type)
+
+    if filename:
+        response["Content-Disposition"] = content_disposition_header(False, filename)
+
+    # Blob names change with their content, so the browser may keep them for good
+    # 블롭 이름은 내용이 바뀌면 함께 바뀌므로 브라우저가 계속 캐시해도 됨
+    if name.startswith(f"{BLOB_PREFIX}/"):
+        response["Cache-Control"] = "private, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = "private, no-cache"
+    return response
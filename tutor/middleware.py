@@ -0,0 +1,205 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("tutor.performance")
+
+# Collapse literal lists such as "IN (%s, %s, %s)" so batched lookups share one fingerprint
+# "IN (%s, %s, %s)" 같은 리터럴 목록을 축약하여 배치 조회가 하나의 지문을 공유하도록 함
+_IN_LIST_RE = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql):
+    """
+    Normalize a SQL statement into a fingerprint for duplicate detection.
+    Parameters are already separated by the DB-API, so only whitespace and
+    placeholder lists need to be collapsed.
+
+    중복 쿼리 감지를 위해 SQL 문을 지문(fingerprint) 형태로 정규화합니다.
+    파라미터는 DB-API에서 이미 분리되어 있으므로 공백과 플레이스홀더 목록만 축약합니다.
+    """
+    normalized = _WHITESPACE_RE.sub(" ", sql).strip()
+    return _IN_LIST_RE.sub("(...)", normalized)
+
+
+class QueryCollector:
+    """
+    Database execute wrapper that records query count, SQL time and fingerprints.
+    Installed per request on every configured connection.
+
+    쿼리 수, SQL 실행 시간, 쿼리 지문을 기록하는 DB execute wrapper입니다.
+    요청마다 설정된 모든 DB 연결에 설치됩니다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def duplicates(self):
+        """
+        Return fingerprints executed more than once, most frequent first.
+
+        두 번 이상 실행된 쿼리 지문을 빈도순으로 반환합니다.
+        """
+        return [
+            (fingerprint, count)
+            for fingerprint, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records query count, total SQL time and duplicate query fingerprints per request.
+    In DEBUG the metrics are exposed as a Server-Timing header (visible in browser
+    devtools). Requests exceeding the configured time or query thresholds are logged
+    as structured JSON warnings; all other requests only at DEBUG level.
+    For streaming responses the collection continues while the content is consumed
+    (e.g. queries of a CSV export iterator) and the entry is logged once it is exhausted;
+    the Server-Timing header can only cover the view itself. Async streaming content
+    is not instrumented past the view.
+
+    요청별 쿼리 수, 총 SQL 시간, 중복 쿼리 지문을 기록하는 미들웨어입니다.
+    DEBUG 모드에서는 Server-Timing 헤더(브라우저 개발자 도구에서 확인 가능)로 노출합니다.
+    설정된 시간 또는 쿼리 수 임계값을 넘는 요청은 구조화된 JSON 경고로 기록되며,
+    그 외의 요청은 DEBUG 레벨로만 기록됩니다.
+    스트리밍 응답은 콘텐츠가 소비되는 동안에도 수집을 계속하며(예: CSV 내보내기 반복자의
+    쿼리), 모두 소비된 후 기록합니다. Server-Timing 헤더는 뷰 자체만 포함할 수 있습니다.
+    비동기 스트리밍 콘텐츠는 뷰 이후로는 계측되지 않습니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "QUERY_INSTRUMENTATION_ENABLED", True):
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+
+        with self._collect(collector):
+            response = self.get_response(request)
+
+        if settings.DEBUG:
+            response["Server-Timing"] = self._build_server_timing(
+                collector,
+                (time.perf_counter() - start) * 1000,
+                collector.duration * 1000,
+                collector.duplicates(),
+            )
+
+        if response.streaming and not getattr(response, "is_async", False):
+            response.streaming_content = self._instrument_stream(
+                response.streaming_content, request, response, collector, start
+            )
+        else:
+            self._finish(request, response, collector, start)
+        return response
+
+    @staticmethod
+    def _collect(collector):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(collector))
+        return stack
+
+    def _instrument_stream(self, content, request, response, collector, start):
+        """
+        Yield the streaming content with the collector installed while each chunk is
+        produced, and log the request once the content is exhausted or closed.
+
+        각 청크가 생성되는 동안 수집기를 설치한 상태로 스트리밍 콘텐츠를 전달하고,
+        콘텐츠가 모두 소비되거나 닫히면 요청을 기록합니다.
+        """
+        iterator = iter(content)
+        try:
+            while True:
+                with self._collect(collector):
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        return
+                yield chunk
+        finally:
+            self._finish(request, response, collector, start)
+
+    def _finish(self, request, response, collector, start):
+        self._log(
+            request,
+            response,
+            collector,
+            (time.perf_counter() - start) * 1000,
+            collector.duration * 1000,
+            collector.duplicates(),
+        )
+
+    def _build_server_timing(self, collector, total_ms, sql_ms, duplicates):
+        """
+        Build a Server-Timing header value with app, SQL and duplicate metrics.
+
+        앱 처리 시간, SQL 시간, 중복 쿼리 지표를 포함한 Server-Timing 헤더 값을 생성합니다.
+        """
+        duplicate_total = sum(count for _, count in duplicates)
+        return ", ".join(
+            [
+                f'app;desc="Total";dur={total_ms:.1f}',
+                f'db;desc="{collector.count} queries";dur={sql_ms:.1f}',
+                f'dup;desc="{len(duplicates)} duplicated fingerprints ({duplicate_total} queries)"',
+            ]
+        )
+
+    def _log(self, request, response, collector, total_ms, sql_ms, duplicates):
+        """
+        Emit a structured log entry for the request.
+        Slow requests are logged as warnings including the top duplicate fingerprints,
+        other requests at DEBUG level so they do not flood the default log output.
+
+        요청에 대한 구조화된 로그를 남깁니다.
+        느린 요청은 상위 중복 쿼리 지문과 함께 경고 레벨로 기록하며, 그 외의 요청은
+        기본 로그 출력을 채우지 않도록 DEBUG 레벨로 기록합니다.
+        """
+        slow_ms = getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 1000)
+        slow_queries = getattr(settings, "SLOW_REQUEST_QUERY_THRESHOLD", 50)
+        is_slow = total_ms >= slow_ms or collector.count >= slow_queries
+
+        if not is_slow and not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        payload = {
+            "event": "slow_request" if is_slow else "request",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 1),
+            "sql_ms": round(sql_ms, 1),
+            "queries": collector.count,
+            "duplicate_queries": [
+                {"sql": fingerprint[:300], "count": count}
+                for fingerprint, count in duplicates[:5]
+            ],
+        }
+        message = json.dumps(payload, ensure_ascii=False)
+
+        if is_slow:
+            logger.warning(message, extra={"performance": payload})
+        else:
+            logger.debug(message, extra={"performance": payload})
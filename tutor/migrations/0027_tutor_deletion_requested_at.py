@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-19 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0026_alter_invoice_recipient_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutor',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.1.2 on 2026-10-19 04:39
+
+import tutor.models
+import tutor.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0029_attachmentupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='businessprofile',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=tutor.storage.get_content_addressed_storage, upload_to='business_logos/'),
+        ),
+        migrations.AlterField(
+            model_name='examattachment',
+            name='file',
+            field=models.FileField(storage=tutor.storage.get_content_addressed_storage, upload_to=tutor.models.exam_file_path),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-19 04:43
+
+import tutor.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0030_storedblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examattachment',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, storage=tutor.storage.get_content_addressed_storage, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='examattachment',
+            name='thumbnail_status',
+            field=models.CharField(choices=[('PENDING', 'Ausstehend'), ('READY', 'Bereit'), ('UNSUPPORTED', 'Nicht unterstützt'), ('FAILED', 'Fehlgeschlagen')], db_index=True, default='PENDING', editable=False, max_length=12),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.1.2 on 2026-10-19 04:58
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_invoice_updated_at(apps, schema_editor):
+    # Start existing invoices from their creation time instead of the migration time
+    Invoice = apps.get_model("tutor", "Invoice")
+    Invoice.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0031_examattachment_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='invoiceadjustment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='invoiceitem',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_invoice_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+
+# Frozen copy of the search documents at the time of this migration (tutor.search may
+# change later): model, GIN index name and weighted fields of the German tsvector
+# 이 마이그레이션 시점의 검색 문서 정의 사본 (tutor.search는 이후 변경될 수 있음):
+# 모델, GIN 인덱스 이름, 독일어 tsvector의 가중치 필드
+SEARCH_CONFIG = "german"
+SEARCH_INDEXES = (
+    (
+        "Student",
+        "tutor_student_search_gin",
+        (("name", "A"), ("customer_number", "A"), ("billing_name", "B"), ("memo", "C")),
+    ),
+    ("Lesson", "tutor_lesson_search_gin", (("topic", "A"), ("memo", "B"))),
+    ("Todo", "tutor_todo_search_gin", (("content", "A"),)),
+    (
+        "Invoice",
+        "tutor_invoice_search_gin",
+        (("subject", "A"), ("full_invoice_code", "A"), ("recipient_name", "B")),
+    ),
+)
+
+
+def add_search_indexes(apps, schema_editor):
+    # GIN indexes over the weighted German tsvector (SQLite uses FTS5 tables, see tutor.signals)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    for model_name, index_name, fields in SEARCH_INDEXES:
+        vector = None
+        for field, weight in fields:
+            part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+            vector = part if vector is None else vector + part
+        schema_editor.add_index(
+            apps.get_model("tutor", model_name), GinIndex(vector, name=index_name)
+        )
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for _model_name, index_name, _fields in SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index_name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutor", "0032_invoice_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0034_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Letzte Erinnerung'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='reminder_count',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Anzahl Erinnerungen'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['tutor', 'is_paid', 'due_date'], name='invoice_overdue_idx'),
+        ),
+    ]
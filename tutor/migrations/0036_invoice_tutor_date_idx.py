@@ -0,0 +1,17 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0035_invoice_reminders'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['tutor', 'invoice_date'], name='invoice_tutor_date_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:34
+
+import tutor.storage
+from django.db import migrations, models
+
+
+def queue_finalized_invoices(apps, schema_editor):
+    # Invoices finalized before archiving existed are archived by the next worker run
+    Invoice = apps.get_model("tutor", "Invoice")
+    Invoice.objects.filter(is_finalized=True).update(archived_pdf_status="PENDING")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutor', '0036_invoice_tutor_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='archived_pdf',
+            field=models.FileField(blank=True, editable=False, max_length=255, storage=tutor.storage.get_content_addressed_storage, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='archived_pdf_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='PDF-Prüfsumme (SHA-256)'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='archived_pdf_status',
+            field=models.CharField(choices=[('NONE', 'Nicht archiviert'), ('PENDING', 'Ausstehend'), ('READY', 'Archiviert'), ('FAILED', 'Fehlgeschlagen')], db_index=True, default='NONE', editable=False, max_length=12),
+        ),
+        migrations.RunPython(queue_finalized_invoices, migrations.RunPython.noop),
+    ]
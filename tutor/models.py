@@ -1,10 +1,47 @@
+import uuid
 from datetime import datetime
 from decimal import Decimal
+from pathlib import Path
 
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .storage import get_content_addressed_storage
+
+
+class TouchParentMixin:
+    """
+    Model mixin that bumps the parent's `updated_at` whenever a child row is saved
+    or deleted, so the parent's ETag (see tutor.conditional) changes with its nested data.
+    `touch_parent` names the ForeignKey to the parent.
+    The parent is updated with a queryset update (no save() or signals).
+
+    자식 행이 저장되거나 삭제될 때마다 부모의 `updated_at`을 갱신하는 모델 믹스인으로,
+    부모의 ETag(tutor.conditional 참고)가 중첩 데이터와 함께 바뀌도록 합니다.
+    `touch_parent`는 부모를 가리키는 ForeignKey 이름입니다.
+    부모는 QuerySet update로 갱신됩니다 (save()나 시그널 미실행).
+    """
+
+    touch_parent = None
+
+    def touch_parent_row(self):
+        field = self._meta.get_field(self.touch_parent)
+        parent_id = getattr(self, field.attname)
+        if parent_id is not None:
+            field.related_model.objects.filter(pk=parent_id).update(updated_at=timezone.now())
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.touch_parent_row()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.touch_parent_row()
+        return result
+
 
 # ==========================================
 # 1. User & Student Management (회원 및 학생)
@@ -34,9 +71,45 @@ class Tutor(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Set when the account is deleted; data is purged later by `purge_deleted_accounts`
+    # 계정 삭제 요청 시각. 실제 데이터는 이후 `purge_deleted_accounts` 명령으로 삭제됨
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
     def __str__(self):
         return f"{self.email} ({self.name})"
 
+    def mark_for_deletion(self):
+        """
+        Deactivate the account immediately and schedule its data for purging.
+        Login identifiers are released so the e-mail can be registered again,
+        and linked e-mail/social accounts are removed.
+
+        계정을 즉시 비활성화하고 데이터 삭제를 예약합니다.
+        이메일로 다시 가입할 수 있도록 로그인 식별자를 해제하고,
+        연결된 이메일/소셜 계정을 삭제합니다.
+        """
+        from allauth.account.models import EmailAddress
+        from allauth.socialaccount.models import SocialAccount
+
+        EmailAddress.objects.filter(user=self).delete()
+        SocialAccount.objects.filter(user=self).delete()
+
+        self.is_active = False
+        self.deletion_requested_at = timezone.now()
+        self.username = f"deleted-{self.pk}"
+        self.email = f"deleted-{self.pk}@deleted.invalid"
+        self.set_unusable_password()
+        self.save(
+            update_fields=[
+                "is_active",
+                "deletion_requested_at",
+                "username",
+                "email",
+                "password",
+                "updated_at",
+            ]
+        )
+
 
 class BusinessProfile(models.Model):
     """
@@ -113,7 +186,12 @@ class BusinessProfile(models.Model):
 
     # Logo
     # 로고 이미지
-    logo = models.ImageField(upload_to="business_logos/", blank=True, null=True)
+    logo = models.ImageField(
+        upload_to="business_logos/",
+        storage=get_content_addressed_storage,
+        blank=True,
+        null=True,
+    )
 
     # Invoice Template Settings
     # 영수증 기본 문구 템플릿 (Kopftext)
@@ -319,7 +397,7 @@ class ExamStandard(models.Model):
         return self.name
 
 
-class ExamModule(models.Model):
+class ExamModule(TouchParentMixin, models.Model):
     """
     Exam Module Definition.
     Separates Written and Oral exams for partial attempts.
@@ -338,6 +416,8 @@ class ExamModule(models.Model):
     module_type = models.CharField(max_length=20, choices=ModuleTypeChoices.choices)
     max_score = models.PositiveIntegerField()
 
+    touch_parent = "exam_standard"
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -455,7 +535,7 @@ def exam_file_path(instance, filename):
     return f"exam_papers/{student_name}/{date_path}/{filename}"
 
 
-class ExamAttachment(models.Model):
+class ExamAttachment(TouchParentMixin, models.Model):
     """
     Exam File Attachment.
     Stores scanned papers (PDF/Images) linked to an exam record.
@@ -468,10 +548,33 @@ class ExamAttachment(models.Model):
         ExamRecord, on_delete=models.CASCADE, related_name="attachments"
     )
 
-    file = models.FileField(upload_to=exam_file_path)
+    # Stored once per content hash (identical scans for several students share a blob)
+    # 내용 해시 기준으로 한 번만 저장됨 (여러 학생의 동일한 스캔본은 하나의 블롭을 공유)
+    file = models.FileField(upload_to=exam_file_path, storage=get_content_addressed_storage)
 
     original_name = models.CharField(max_length=255, blank=True, null=True)
 
+    # Downscaled first-page preview, generated in the background (`generate_thumbnails`)
+    # 백그라운드에서 생성되는 첫 페이지 축소 미리보기 (`generate_thumbnails`)
+    class ThumbnailStatusChoices(models.TextChoices):
+        PENDING = "PENDING", _("Ausstehend")
+        READY = "READY", _("Bereit")
+        UNSUPPORTED = "UNSUPPORTED", _("Nicht unterstützt")
+        FAILED = "FAILED", _("Fehlgeschlagen")
+
+    thumbnail = models.ImageField(
+        blank=True, editable=False, max_length=255, storage=get_content_addressed_storage
+    )
+    thumbnail_status = models.CharField(
+        max_length=12,
+        choices=ThumbnailStatusChoices.choices,
+        default=ThumbnailStatusChoices.PENDING,
+        editable=False,
+        db_index=True,
+    )
+
+    touch_parent = "exam_record"
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -481,7 +584,43 @@ class ExamAttachment(models.Model):
         )
 
 
-class ExamDetailResult(models.Model):
+class AttachmentUpload(models.Model):
+    """
+    Resumable chunked upload session for an exam attachment.
+    Chunks are appended to a staging file on disk; on completion the file is
+    moved into storage and an ExamAttachment is created.
+
+    시험 첨부파일의 이어받기 가능한 청크 업로드 세션.
+    청크는 디스크의 임시 파일에 이어 붙여지며, 완료 시 파일을 스토리지로 옮기고
+    ExamAttachment를 생성함.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tutor = models.ForeignKey(
+        Tutor, on_delete=models.CASCADE, related_name="attachment_uploads"
+    )
+    exam_record = models.ForeignKey(
+        ExamRecord, on_delete=models.CASCADE, related_name="uploads"
+    )
+    original_name = models.CharField(max_length=255)
+
+    # Expected total size and bytes received so far (resume offset)
+    # 전체 예상 크기와 현재까지 수신한 바이트 수 (이어받기 오프셋)
+    total_size = models.PositiveBigIntegerField()
+    received_size = models.PositiveBigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.original_name} ({self.received_size}/{self.total_size})"
+
+    @property
+    def staging_path(self):
+        return Path(settings.CHUNKED_UPLOAD_TEMP_DIR) / f"{self.pk}.part"
+
+
+class ExamDetailResult(TouchParentMixin, models.Model):
     """
     Question-based Results (O/X).
     Used for sections where is_question_based=True. Enables statistical analysis.
@@ -508,6 +647,8 @@ class ExamDetailResult(models.Model):
         help_text=_("Erreichte Punktzahl (inkl. Teilpunkte)"),
     )
 
+    touch_parent = "exam_record"
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -517,7 +658,7 @@ class ExamDetailResult(models.Model):
         unique_together = ("exam_record", "exam_section", "question_number")
 
 
-class ExamScoreInput(models.Model):
+class ExamScoreInput(TouchParentMixin, models.Model):
     """
     Score-based Results.
     Used for subjective sections (Writing/Speaking) where is_question_based=False.
@@ -533,6 +674,8 @@ class ExamScoreInput(models.Model):
 
     score = models.DecimalField(max_digits=5, decimal_places=2)
 
+    touch_parent = "exam_record"
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -817,9 +960,16 @@ class Invoice(models.Model):
         BRUTTO = "BRUTTO", _("Brutto")
         NETTO = "NETTO", _("Netto")
 
+    class ArchiveStatusChoices(models.TextChoices):
+        NONE = "NONE", _("Nicht archiviert")
+        PENDING = "PENDING", _("Ausstehend")
+        READY = "READY", _("Archiviert")
+        FAILED = "FAILED", _("Fehlgeschlagen")
+
     # Dates, Snapshot Data, Content, Financials, etc.
     # 날짜 정보, 스냅샷 데이터, 내용, 재무 정보 등
     created_at = models.DateTimeField(auto_now_add=True, help_text=_("Rechnungsdatum"))
+    updated_at = models.DateTimeField(auto_now=True)
     invoice_date = models.DateField(_("Rechnungsdatum Eingabe"), null=True, blank=True)
     delivery_date_start = models.DateField(
         _("Leistungszeitraum Start"), null=True, blank=True
@@ -900,10 +1050,48 @@ class Invoice(models.Model):
         default=False, help_text=_("Anwendung der Kleinunternehmerregelung (§19 UStG)")
     )
 
+    # Payment reminders created by `remind_overdue_invoices`
+    # `remind_overdue_invoices`가 생성한 결제 알림 기록
+    reminder_count = models.PositiveSmallIntegerField(_("Anzahl Erinnerungen"), default=0)
+    reminded_at = models.DateTimeField(_("Letzte Erinnerung"), null=True, blank=True)
+
+    # Archival PDF/A rendered once after finalization by `archive_invoice_pdfs`
+    # 확정 후 `archive_invoice_pdfs`가 한 번 렌더링하여 보관하는 PDF/A 문서
+    archived_pdf = models.FileField(
+        blank=True, editable=False, max_length=255, storage=get_content_addressed_storage
+    )
+    archived_pdf_sha256 = models.CharField(
+        _("PDF-Prüfsumme (SHA-256)"), max_length=64, blank=True, editable=False
+    )
+    archived_pdf_status = models.CharField(
+        max_length=12,
+        choices=ArchiveStatusChoices.choices,
+        default=ArchiveStatusChoices.NONE,
+        editable=False,
+        db_index=True,
+    )
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = _("Rechnung")
         verbose_name_plural = _("Rechnungen")
+        indexes = [
+            # Overdue scan per tutor: unpaid invoices by due date
+            # 튜터별 연체 검색: 미결제 영수증을 만기일 순으로 조회
+            models.Index(fields=["tutor", "is_paid", "due_date"], name="invoice_overdue_idx"),
+            # Period queries (analytics, accounting export) per tutor
+            # 튜터별 기간 조회 (매출 분석, 회계 내보내기)
+            models.Index(fields=["tutor", "invoice_date"], name="invoice_tutor_date_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Queue the one-time archival render when the invoice is finalized
+        # 영수증이 확정되면 일회성 보관용 렌더링을 대기열에 등록
+        if self.is_finalized and self.archived_pdf_status == self.ArchiveStatusChoices.NONE:
+            self.archived_pdf_status = self.ArchiveStatusChoices.PENDING
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "archived_pdf_status"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.full_invoice_code} - {self.recipient_name}"
@@ -921,6 +1109,56 @@ class Invoice(models.Model):
             return source.get(field, default)
         return getattr(source, field, default)
 
+    @classmethod
+    def calculate_adjustments(
+        cls, adjustments, current_subtotal, current_vat_total, is_small_business=False
+    ):
+        """
+        Apply adjustments in order to an item subtotal and its VAT.
+        Returns (calculated adjustments, total adjustment impact, adjusted VAT).
+
+        조정 항목을 순서대로 항목 소계와 부가세에 적용합니다.
+        (계산된 조정 항목, 총 조정 금액, 조정된 부가세)를 반환합니다.
+        """
+        calculated_adjustments = []
+        total_adj_impact = Decimal("0.00")
+
+        for adjustment in adjustments:
+            value = cls._to_decimal(cls._read_calc_value(adjustment, "value", 0))
+            unit = cls._read_calc_value(adjustment, "unit", "PERCENT")
+            adj_type = cls._read_calc_value(adjustment, "type", "DISCOUNT")
+
+            if unit == "PERCENT":
+                adj_amount = current_subtotal * (value / 100)
+            else:
+                adj_amount = value
+
+            if adj_type == "DISCOUNT":
+                total_adj_impact -= adj_amount
+
+                if current_subtotal > 0:
+                    effective_vat_rate = current_vat_total / current_subtotal
+                    current_vat_total -= adj_amount * effective_vat_rate
+            else:
+                total_adj_impact += adj_amount
+                surcharge_tax_rate = (
+                    Decimal("0.00") if is_small_business else Decimal("0.19")
+                )
+                current_vat_total += adj_amount * surcharge_tax_rate
+
+            calculated_adjustments.append(
+                {
+                    "source": adjustment,
+                    "label": cls._read_calc_value(adjustment, "label", ""),
+                    "type": adj_type,
+                    "value": value,
+                    "unit": unit,
+                    "amount": adj_amount,
+                }
+            )
+
+        return calculated_adjustments, total_adj_impact, current_vat_total
+
     @classmethod
     def calculate_financials(cls, items, adjustments, is_small_business=False):
         """
@@ -933,7 +1171,6 @@ class Invoice(models.Model):
         current_subtotal = Decimal("0.00")
         current_vat_total = Decimal("0.00")
         calculated_items = []
-        calculated_adjustments = []
 
         for item in items:
             quantity = cls._to_decimal(cls._read_calc_value(item, "quantity", 0))
@@ -970,41 +1207,11 @@ class Invoice(models.Model):
                 }
             )
 
-        total_adj_impact = Decimal("0.00")
-
-        for adjustment in adjustments:
-            value = cls._to_decimal(cls._read_calc_value(adjustment, "value", 0))
-            unit = cls._read_calc_value(adjustment, "unit", "PERCENT")
-            adj_type = cls._read_calc_value(adjustment, "type", "DISCOUNT")
-
-            if unit == "PERCENT":
-                adj_amount = current_subtotal * (value / 100)
-            else:
-                adj_amount = value
-
-            if adj_type == "DISCOUNT":
-                total_adj_impact -= adj_amount
-
-                if current_subtotal > 0:
-                    effective_vat_rate = current_vat_total / current_subtotal
-                    current_vat_total -= adj_amount * effective_vat_rate
-            else:
-                total_adj_impact += adj_amount
-                surcharge_tax_rate = (
-                    Decimal("0.00") if is_small_business else Decimal("0.19")
-                )
-                current_vat_total += adj_amount * surcharge_tax_rate
-
-            calculated_adjustments.append(
-                {
-                    "source": adjustment,
-                    "label": cls._read_calc_value(adjustment, "label", ""),
-                    "type": adj_type,
-                    "value": value,
-                    "unit": unit,
-                    "amount": adj_amount,
-                }
+        calculated_adjustments, total_adj_impact, current_vat_total = (
+            cls.calculate_adjustments(
+                adjustments, current_subtotal, current_vat_total, is_small_business
             )
+        )
 
         final_netto = max(Decimal("0.00"), current_subtotal + total_adj_impact)
         final_vat = max(Decimal("0.00"), current_vat_total)
@@ -1037,12 +1244,12 @@ class Invoice(models.Model):
         for item_result in calculated["items"]:
             item = item_result["source"]
             item.total_price = item_result["total_price"]
-            item.save(update_fields=["total_price"])
+            item.save(update_fields=["total_price", "updated_at"])
 
         for adjustment_result in calculated["adjustments"]:
             adjustment = adjustment_result["source"]
             adjustment.amount = adjustment_result["amount"]
-            adjustment.save(update_fields=["amount"])
+            adjustment.save(update_fields=["amount", "updated_at"])
 
         self.subtotal = calculated["subtotal"]
         self.vat_amount = calculated["vat_amount"]
@@ -1094,6 +1301,8 @@ class InvoiceAdjustment(models.Model):
         max_digits=10, decimal_places=2, default=0, help_text=_("Berechneter Betrag in Euro")
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return f"{self.label}: {self.value} {self.unit}"
 
@@ -1165,5 +1374,131 @@ class InvoiceItem(models.Model):
 
     total_price = models.DecimalField(_("Gesamtpreis"), max_digits=10, decimal_places=2)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         ordering = ["position_number"]
+
+
+# ==========================================
+# 9. Data Export (데이터 내보내기)
+# ==========================================
+class DataExport(models.Model):
+    """
+    Full data export (GDPR) of a tutor account.
+    Created via the API and built in the background by `run_data_exports`.
+
+    튜터 계정의 전체 데이터 내보내기(GDPR).
+    API로 요청이 생성되고 `run_data_exports` 명령이 백그라운드에서 ZIP 파일을 생성함.
+    """
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", _("Ausstehend")
+        RUNNING = "RUNNING", _("In Bearbeitung")
+        COMPLETED = "COMPLETED", _("Fertig")
+        FAILED = "FAILED", _("Fehlgeschlagen")
+
+    tutor = models.ForeignKey(
+        Tutor, on_delete=models.CASCADE, related_name="data_exports"
+    )
+    status = models.CharField(
+        max_length=20, choices=StatusChoices.choices, default=StatusChoices.PENDING
+    )
+
+    # Progress in percent (0-100)
+    # 진행률 (0-100%)
+    progress = models.PositiveSmallIntegerField(default=0)
+
+    file = models.FileField(upload_to="exports/", blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Export {self.pk} ({self.tutor}) - {self.status}"
+
+
+# ==========================================
+# 10. File Storage (파일 저장소)
+# ==========================================
+class StoredBlob(models.Model):
+    """
+    Content-addressed file blob with a reference count.
+    Managed by tutor.storage.ContentAddressedStorage; one row per distinct file content.
+
+    참조 수를 가진 내용 주소 기반(content-addressed) 파일 블롭.
+    tutor.storage.ContentAddressedStorage가 관리하며, 서로 다른 파일 내용마다 한 행이 존재함.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+# ==========================================
+# 11. Email Outbox (메일 발송 대기열)
+# ==========================================
+class OutboundEmail(models.Model):
+    """
+    Queued outgoing email (outbox).
+    Written by tutor.mail.OutboxEmailBackend inside the request transaction and
+    delivered by `send_queued_email` with retries and exponential backoff.
+
+    발송 대기 중인 메일 (아웃박스).
+    요청 트랜잭션 안에서 tutor.mail.OutboxEmailBackend가 기록하고,
+    `send_queued_email` 명령이 재시도 및 지수 백오프와 함께 발송함.
+    """
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", _("Ausstehend")
+        SENDING = "SENDING", _("Wird gesendet")
+        SENT = "SENT", _("Gesendet")
+        # Dead letter: gave up after EMAIL_OUTBOX_MAX_ATTEMPTS
+        # 데드 레터: EMAIL_OUTBOX_MAX_ATTEMPTS회 시도 후 포기함
+        DEAD = "DEAD", _("Fehlgeschlagen")
+
+    subject = models.TextField()
+    body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list)
+    bcc = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list)
+    headers = models.JSONField(default=dict)
+
+    # [content, mimetype] pairs (e.g. the HTML part) and base64 encoded attachments
+    # [내용, mimetype] 쌍 (예: HTML 파트) 및 base64로 인코딩된 첨부파일
+    alternatives = models.JSONField(default=list)
+    attachments = models.JSONField(default=list)
+
+    status = models.CharField(
+        max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    # Due time of the next attempt; while SENDING, the end of the worker's lease
+    # 다음 시도 예정 시각이며, SENDING 상태에서는 워커 점유 만료 시각
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,32 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    Drop-in replacement for DRF's JSONParser backed by orjson.
+    Numbers are parsed like the stdlib parser (floats); DecimalFields convert them.
+
+    orjson 기반으로 DRF JSONParser를 그대로 대체하는 파서입니다.
+    숫자는 표준 라이브러리와 동일하게(float) 해석되며 DecimalField에서 변환됩니다.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            body = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (orjson.JSONDecodeError, LookupError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
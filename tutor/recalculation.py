@@ -0,0 +1,225 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Invoice, InvoiceAdjustment, InvoiceItem
+
+
+CENT = Decimal("0.01")
+
+# Fixed-point scales: item totals are exact in 1e-8 units, their VAT in 1e-12 units
+# (2 decimals each for price, quantity, discount % / 100 and VAT % / 100)
+# 고정소수점 단위: 항목 합계는 1e-8, 부가세는 1e-12 단위에서 정확함
+# (가격, 수량, 할인율/100, 부가세율/100 각각 소수점 2자리)
+TOTAL_SCALE = 10**8
+VAT_SCALE = 10**12
+
+INVOICE_FIELDS = ["subtotal", "vat_amount", "total_adjustment_amount", "total_amount"]
+
+
+def to_cents(value):
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_units(value, places):
+    return int(Decimal(value or 0).scaleb(places))
+
+
+def round_units(units, scale):
+    """
+    Round a fixed-point integer to cents (half away from zero, like a numeric(_, 2) column).
+
+    고정소수점 정수를 센트 단위로 반올림합니다 (numeric(_, 2) 컬럼과 같이 0에서 먼 쪽으로).
+    """
+    step = scale // 100
+    cents = (abs(units) + step // 2) // step
+    return Decimal(cents if units >= 0 else -cents).scaleb(-2)
+
+
+def item_units(quantity, unit_price, discount_value, discount_unit, vat_rate):
+    """
+    (total, vat) of one item as integers in TOTAL_SCALE / VAT_SCALE units,
+    following the item rules of Invoice.calculate_financials.
+
+    Invoice.calculate_financials의 항목 규칙에 따라 항목 하나의 (합계, 부가세)를
+    TOTAL_SCALE / VAT_SCALE 단위의 정수로 계산합니다.
+    """
+    base = to_units(unit_price, 2) * to_units(quantity, 2)
+    if discount_unit == "PERCENT":
+        total = base * (10**4 - to_units(discount_value, 2))
+    else:
+        total = base * 10**4 - to_units(discount_value, 2) * 10**6
+    total = max(0, total)
+    return total, total * to_units(vat_rate, 2)
+
+
+def calculate_invoice(items, adjustments, is_small_business=False):
+    """
+    Stored values of one invoice from (quantity, unit_price, discount_value,
+    discount_unit, vat_rate) item rows and (type, value, unit) adjustment rows.
+    Items are summed as exact fixed-point integers. Adjustments go through
+    Invoice.calculate_adjustments itself, since the proportional VAT of a discount
+    divides and therefore rounds at the Decimal context precision.
+    Every value is rounded to cents exactly as the numeric columns round it,
+    so the result equals `calculate_totals` as stored.
+
+    (quantity, unit_price, discount_value, discount_unit, vat_rate) 항목 행과
+    (type, value, unit) 조정 행으로 영수증 하나의 저장값을 계산합니다.
+    항목은 정확한 고정소수점 정수로 합산합니다. 할인의 비례 부가세는 나눗셈으로 인해
+    Decimal 컨텍스트 정밀도에서 반올림되므로, 조정 항목은 Invoice.calculate_adjustments의
+    동일한 Decimal 연산을 거칩니다. 모든 값은 numeric 컬럼과 동일하게 센트 단위로
+    반올림되므로 결과는 저장된 `calculate_totals` 결과와 같습니다.
+    """
+    subtotal = vat = 0
+    item_totals = []
+    for row in items:
+        total, item_vat = item_units(*row)
+        subtotal += total
+        vat += item_vat
+        item_totals.append(round_units(total, TOTAL_SCALE))
+
+    if not adjustments:
+        return {
+            "items": item_totals,
+            "adjustments": [],
+            "subtotal": round_units(subtotal, TOTAL_SCALE),
+            "vat_amount": round_units(vat, VAT_SCALE),
+            "total_adjustment_amount": Decimal("0.00"),
+            "total_amount": round_units(subtotal * (VAT_SCALE // TOTAL_SCALE) + vat, VAT_SCALE),
+        }
+
+    items_total = Decimal(subtotal).scaleb(-8)
+    adjusted, impact, adjusted_vat = Invoice.calculate_adjustments(
+        [{"type": adj_type, "value": value, "unit": unit} for adj_type, value, unit in adjustments],
+        items_total,
+        Decimal(vat).scaleb(-12),
+        is_small_business,
+    )
+    netto = max(Decimal("0.00"), items_total + impact)
+    adjusted_vat = max(Decimal("0.00"), adjusted_vat)
+    return {
+        "items": item_totals,
+        "adjustments": [to_cents(row["amount"]) for row in adjusted],
+        "subtotal": to_cents(netto),
+        "vat_amount": to_cents(adjusted_vat),
+        "total_adjustment_amount": to_cents(impact),
+        "total_amount": to_cents(netto + adjusted_vat),
+    }
+
+
+def recalculate_chunk(invoice_ids, now, dry_run=False):
+    """
+    Recalculate one chunk of invoices in a single transaction: the invoices are locked,
+    their items and adjustments loaded with one query each, and only changed rows
+    are written back with `bulk_update`.
+
+    영수증 한 묶음을 단일 트랜잭션으로 재계산합니다: 영수증을 잠그고, 항목과 조정 항목을
+    각각 한 번의 쿼리로 불러오며, 변경된 행만 `bulk_update`로 저장합니다.
+    """
+    with transaction.atomic():
+        # Re-checked under the lock: an invoice archived since it was selected stays as issued
+        # 잠금 상태에서 재확인: 선택 이후 보관된 영수증은 발행된 그대로 유지됨
+        invoices = list(
+            Invoice.objects.filter(Q(is_finalized=False) | Q(archived_pdf=""), pk__in=invoice_ids)
+            .select_for_update()
+            .order_by("pk")
+            .values_list("pk", "is_small_business", *INVOICE_FIELDS)
+        )
+        items = {}
+        for row in (
+            InvoiceItem.objects.filter(invoice_id__in=invoice_ids)
+            .order_by("invoice_id", "position_number", "pk")
+            .values_list(
+                "invoice_id",
+                "pk",
+                "total_price",
+                "quantity",
+                "unit_price",
+                "discount_value",
+                "discount_unit",
+                "vat_rate",
+            )
+        ):
+            items.setdefault(row[0], []).append(row[1:])
+        adjustments = {}
+        for row in (
+            InvoiceAdjustment.objects.filter(invoice_id__in=invoice_ids)
+            .order_by("invoice_id", "pk")
+            .values_list("invoice_id", "pk", "amount", "type", "value", "unit")
+        ):
+            adjustments.setdefault(row[0], []).append(row[1:])
+
+        changed_invoices, changed_items, changed_adjustments = [], [], []
+        for pk, is_small_business, *stored in invoices:
+            invoice_items = items.get(pk, [])
+            invoice_adjustments = adjustments.get(pk, [])
+            result = calculate_invoice(
+                [row[2:] for row in invoice_items],
+                [row[2:] for row in invoice_adjustments],
+                is_small_business,
+            )
+            item_rows = [
+                InvoiceItem(pk=row[0], total_price=total, updated_at=now)
+                for row, total in zip(invoice_items, result["items"])
+                if row[1] != total
+            ]
+            adjustment_rows = [
+                InvoiceAdjustment(pk=row[0], amount=amount, updated_at=now)
+                for row, amount in zip(invoice_adjustments, result["adjustments"])
+                if row[1] != amount
+            ]
+            values = {field: result[field] for field in INVOICE_FIELDS}
+            if list(values.values()) == stored and not item_rows and not adjustment_rows:
+                continue
+
+            changed_items += item_rows
+            changed_adjustments += adjustment_rows
+            changed_invoices.append(Invoice(pk=pk, updated_at=now, **values))
+
+        if not dry_run:
+            InvoiceItem.objects.bulk_update(changed_items, ["total_price", "updated_at"])
+            InvoiceAdjustment.objects.bulk_update(changed_adjustments, ["amount", "updated_at"])
+            Invoice.objects.bulk_update(changed_invoices, [*INVOICE_FIELDS, "updated_at"])
+    return len(invoices), len(changed_invoices), len(changed_items), len(changed_adjustments)
+
+
+def recalculate_invoices(invoices=None, batch_size=500, dry_run=False, include_finalized=False):
+    """
+    Recalculate the stored totals of many invoices (all drafts by default), `batch_size`
+    invoices per transaction, with the same results as `Invoice.calculate_totals`.
+    Finalized invoices are only included with `include_finalized`, and only while their
+    archival PDF has not been rendered yet: an archived invoice is the issued document
+    and is never changed (corrections need a cancellation invoice).
+    Returns a dict with the number of checked invoices and of changed invoices,
+    items and adjustments.
+
+    여러 영수증(기본값: 모든 임시 저장본)의 저장된 총액을 트랜잭션마다 `batch_size`개씩
+    재계산하며, 결과는 `Invoice.calculate_totals`와 같습니다. 확정 영수증은
+    `include_finalized`를 지정한 경우에만, 그리고 보관용 PDF가 아직 렌더링되지 않은 경우에만
+    포함됩니다. 보관된 영수증은 발행된 문서이므로 변경하지 않습니다(정정에는 취소 영수증이
+    필요함). 확인한 영수증 수와 변경된 영수증, 항목, 조정 항목 수를
+    담은 dict를 반환합니다.
+    """
+    invoices = Invoice.objects.all() if invoices is None else invoices
+    if include_finalized:
+        invoices = invoices.filter(Q(is_finalized=False) | Q(archived_pdf=""))
+    else:
+        invoices = invoices.filter(is_finalized=False)
+    now = timezone.now()
+    totals = {"invoices": 0, "changed": 0, "items": 0, "adjustments": 0}
+    last_pk = 0
+    while True:
+        invoice_ids = list(
+            invoices.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[
+                :batch_size
+            ]
+        )
+        if not invoice_ids:
+            break
+        counts = recalculate_chunk(invoice_ids, now, dry_run=dry_run)
+        for key, count in zip(totals, counts):
+            totals[key] += count
+        last_pk = invoice_ids[-1]
+    return totals
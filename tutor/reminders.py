@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from .models import Invoice, Todo, Tutor
+
+
+def overdue_invoices(tutor_ids, today, now):
+    """
+    Finalized, unpaid invoices of the given tutors that are past due and due for a reminder.
+    The filter follows `invoice_overdue_idx` (tutor, is_paid, due_date), so only the
+    unpaid, overdue range of each tutor is read instead of all invoices.
+
+    지정된 튜터의 확정·미결제 영수증 중 만기가 지나 알림 대상인 영수증을 반환합니다.
+    필터가 `invoice_overdue_idx`(tutor, is_paid, due_date)를 따르므로 전체 영수증이 아닌
+    튜터별 미결제·연체 구간만 조회합니다.
+    """
+    interval = timedelta(days=settings.INVOICE_REMINDER_INTERVAL_DAYS)
+    return Invoice.objects.filter(
+        Q(reminded_at__isnull=True) | Q(reminded_at__lte=now - interval),
+        tutor_id__in=tutor_ids,
+        is_paid=False,
+        due_date__lt=today,
+        is_finalized=True,
+        reminder_count__lt=settings.INVOICE_REMINDER_MAX_COUNT,
+    )
+
+
+def reminder_todo(invoice, today):
+    content = _("%(count)s. Zahlungserinnerung: %(code)s (%(name)s), fällig seit %(date)s") % {
+        "count": invoice.reminder_count + 1,
+        "code": invoice.full_invoice_code,
+        "name": invoice.recipient_name,
+        "date": invoice.due_date.strftime("%d.%m.%Y"),
+    }
+    return Todo(
+        tutor_id=invoice.tutor_id,
+        content=content[:255],
+        due_date=today,
+        priority=Todo.PriorityChoices.HIGH,
+        category=Todo.CategoryChoices.ADMIN,
+    )
+
+
+def reminder_email(tutor, invoices, with_todos):
+    context = {"tutor": tutor, "invoices": invoices, "with_todos": with_todos}
+    subject = render_to_string("invoices/payment_reminder_subject.txt", context)
+    body = render_to_string("invoices/payment_reminder_message.txt", context)
+    return EmailMessage(" ".join(subject.split()), body, to=[tutor.email])
+
+
+def remind_tutor_batch(tutor_ids, today, now, create_todos=True, send_emails=False):
+    """
+    Remind one batch of tutors in a single transaction.
+    The invoices are locked (SKIP LOCKED where supported) and stamped with `reminded_at`
+    together with the created todos and queued emails, so reruns and parallel runs
+    never remind the same invoice twice within the interval.
+
+    튜터 한 묶음에 대한 알림을 단일 트랜잭션으로 처리합니다.
+    영수증을 (지원되는 경우 SKIP LOCKED로) 잠그고 생성된 할 일 및 대기열 메일과 함께
+    `reminded_at`을 기록하므로, 재실행이나 병렬 실행 시에도 같은 간격 안에서
+    동일 영수증에 중복 알림이 생기지 않습니다.
+    """
+    with transaction.atomic():
+        invoices = list(
+            overdue_invoices(tutor_ids, today, now)
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("tutor")
+            .order_by("tutor_id", "due_date", "pk")
+        )
+        if not invoices:
+            return 0, 0, 0
+
+        todos = []
+        if create_todos:
+            todos = Todo.objects.bulk_create(
+                [reminder_todo(invoice, today) for invoice in invoices]
+            )
+
+        emails = 0
+        if send_emails:
+            by_tutor = {}
+            for invoice in invoices:
+                by_tutor.setdefault(invoice.tutor_id, []).append(invoice)
+            # Queued through the outbox backend, i.e. committed with this transaction
+            # 아웃박스 백엔드를 통해 대기열에 저장되므로 이 트랜잭션과 함께 커밋됨
+            messages = [
+                reminder_email(items[0].tutor, items, create_todos) for items in by_tutor.values()
+            ]
+            get_connection().send_messages(messages)
+            emails = len(messages)
+
+        Invoice.objects.filter(pk__in=[invoice.pk for invoice in invoices]).update(
+            reminder_count=F("reminder_count") + 1, reminded_at=now, updated_at=now
+        )
+    return len(invoices), len(todos), emails
+
+
+def remind_overdue_invoices(batch_size=200, create_todos=True, send_emails=False, today=None):
+    """
+    Create payment reminders for overdue invoices of all active tutors, `batch_size`
+    tutors per query and transaction. Returns a dict with the number of reminded
+    invoices, created todos and queued emails.
+
+    모든 활성 튜터의 연체 영수증에 대한 결제 알림을 생성하며, 쿼리 및 트랜잭션마다
+    `batch_size`명의 튜터를 처리합니다. 알림 처리된 영수증, 생성된 할 일,
+    대기열에 저장된 메일 수를 담은 dict를 반환합니다.
+    """
+    now = timezone.now()
+    today = today or timezone.localdate(now)
+    totals = {"invoices": 0, "todos": 0, "emails": 0}
+    last_pk = 0
+    while True:
+        tutor_ids = list(
+            Tutor.objects.filter(is_active=True, pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not tutor_ids:
+            break
+        invoices, todos, emails = remind_tutor_batch(
+            tutor_ids, today, now, create_todos=create_todos, send_emails=send_emails
+        )
+        totals["invoices"] += invoices
+        totals["todos"] += todos
+        totals["emails"] += emails
+        last_pk = tutor_ids[-1]
+    return totals
@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from .models import Lesson
+
+
+BULK_FIELDS = ["date", "start_time", "end_time", "status", "updated_at"]
+
+
+def shifted(lesson, delta):
+    """
+    (date, start_time, end_time) of a lesson moved by `delta`, or None if it would
+    cross midnight.
+
+    `delta`만큼 이동한 수업의 (date, start_time, end_time)을 반환하며,
+    자정을 넘기게 되면 None을 반환합니다.
+    """
+    start = datetime.combine(lesson.date, lesson.start_time) + delta
+    end = datetime.combine(lesson.date, lesson.end_time) + delta
+    if end.date() != start.date():
+        return None
+    return start.date(), start.time(), end.time()
+
+
+def find_overlaps(checked, occupied):
+    """
+    Map each checked lesson to the first occupied slot it overlaps on the same date.
+    Slots are (pk, date, start_time, end_time); lessons only touching at the edges
+    do not overlap.
+
+    검사 대상 수업마다 같은 날짜에서 겹치는 첫 번째 점유 시간대를 반환합니다.
+    시간대는 (pk, date, start_time, end_time)이며, 경계만 맞닿은 수업은 겹치지 않습니다.
+    """
+    by_date = {}
+    for slot in occupied:
+        by_date.setdefault(slot[1], []).append(slot)
+    for slots in by_date.values():
+        slots.sort(key=lambda slot: slot[2])
+
+    overlaps = {}
+    for lesson in checked:
+        for pk, _date, start, end in by_date.get(lesson.date, []):
+            if start >= lesson.end_time:
+                break
+            if pk != lesson.pk and lesson.start_time < end:
+                overlaps[lesson.pk] = (start, end)
+                break
+    return overlaps
+
+
+def bulk_change_lessons(tutor, ids, status=None, delta=timedelta(0)):
+    """
+    Set the status and/or shift the date and time of many lessons in one transaction.
+    Every lesson is validated in memory against the whole batch (end after start,
+    no shift across midnight, no overlap with the tutor's other active lessons).
+    Changes are only applied with one `bulk_update` if no lesson has an error.
+    Returns (applied, per-ID results).
+
+    여러 수업의 상태를 설정하거나 날짜와 시간을 하나의 트랜잭션으로 이동합니다.
+    모든 수업은 배치 전체를 기준으로 메모리에서 검증되며(종료 시간이 시작 시간 이후,
+    자정을 넘는 이동 금지, 튜터의 다른 활성 수업과 겹침 금지), 오류가 있는 수업이
+    하나도 없을 때만 한 번의 `bulk_update`로 변경 사항을 적용합니다.
+    (적용 여부, ID별 결과)를 반환합니다.
+    """
+    cancelled = Lesson.StatusChoices.CANCELLED
+    with transaction.atomic():
+        lessons = {
+            lesson.pk: lesson
+            for lesson in Lesson.objects.filter(student__tutor=tutor, pk__in=ids)
+            .select_for_update(of=("self",))
+            .only("pk", "date", "start_time", "end_time", "status")
+        }
+
+        errors = {}
+        changed = []
+        checked = []
+        for pk in ids:
+            lesson = lessons.get(pk)
+            if lesson is None:
+                errors[pk] = _("Unterrichtsstunde nicht gefunden.")
+                continue
+
+            slot = (lesson.date, lesson.start_time, lesson.end_time)
+            if delta:
+                new_slot = shifted(lesson, delta)
+                if new_slot is None:
+                    errors[pk] = _(
+                        "Die Unterrichtsstunde kann nicht über Mitternacht verschoben werden."
+                    )
+                    continue
+            else:
+                new_slot = slot
+            new_status = status or lesson.status
+            if new_slot == slot and new_status == lesson.status:
+                continue
+
+            if new_slot[1] >= new_slot[2]:
+                errors[pk] = _("Die Endzeit muss nach der Startzeit liegen.")
+                continue
+
+            # Moved lessons and cancelled lessons taking up a slot again need a free slot
+            # 이동한 수업과 다시 시간대를 차지하는 취소된 수업은 빈 시간대가 필요함
+            if new_status != cancelled and (new_slot != slot or lesson.status == cancelled):
+                checked.append(lesson)
+            lesson.date, lesson.start_time, lesson.end_time = new_slot
+            lesson.status = new_status
+            changed.append(lesson)
+
+        if checked:
+            occupied = [
+                (lesson.pk, lesson.date, lesson.start_time, lesson.end_time)
+                for lesson in lessons.values()
+                if lesson.status != cancelled
+            ]
+            occupied += Lesson.objects.filter(
+                student__tutor=tutor, date__in={lesson.date for lesson in checked}
+            ).exclude(pk__in=list(lessons)).exclude(status=cancelled).values_list(
+                "pk", "date", "start_time", "end_time"
+            )
+            for pk, (start, end) in find_overlaps(checked, occupied).items():
+                errors[pk] = _(
+                    "Überschneidung mit einer anderen Unterrichtsstunde (%(start)s–%(end)s)."
+                ) % {"start": start.strftime("%H:%M"), "end": end.strftime("%H:%M")}
+
+        changed_ids = {lesson.pk for lesson in changed}
+        results = []
+        for pk in ids:
+            if pk in errors:
+                results.append({"id": pk, "status": "error", "detail": errors[pk]})
+            else:
+                result = "updated" if pk in changed_ids else "unchanged"
+                results.append({"id": pk, "status": result})
+
+        if errors:
+            return False, results
+
+        now = timezone.now()
+        for lesson in changed:
+            lesson.updated_at = now
+        Lesson.objects.bulk_update(changed, BULK_FIELDS)
+    return True, results
+
+
+def bulk_delete_lessons(tutor, ids):
+    """
+    Delete many lessons of a tutor with one SELECT and one `DELETE ... WHERE id IN`
+    scoped to the tutor. Returns the per-ID results (deleted, or an error for IDs
+    that do not exist or belong to another tutor).
+
+    튜터 범위로 제한된 한 번의 SELECT와 한 번의 `DELETE ... WHERE id IN`으로 여러 수업을
+    삭제합니다. ID별 결과(삭제됨, 또는 존재하지 않거나 다른 튜터의 ID에 대한 오류)를
+    반환합니다.
+    """
+    with transaction.atomic():
+        owned = set(
+            Lesson.objects.filter(student__tutor=tutor, pk__in=ids)
+            .select_for_update(of=("self",))
+            .values_list("pk", flat=True)
+        )
+        if owned:
+            Lesson.objects.filter(student__tutor=tutor, pk__in=owned).delete()
+
+    return [
+        {"id": pk, "status": "deleted"}
+        if pk in owned
+        else {"id": pk, "status": "error", "detail": _("Unterrichtsstunde nicht gefunden.")}
+        for pk in ids
+    ]
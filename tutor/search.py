@@ -0,0 +1,187 @@
+import re
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.expressions import RawSQL
+
+
+# Searchable text per result type: model, tutor lookup, weighted fields and returned values
+# (`related` values are read through a join, e.g. the student name of a lesson)
+# Weights follow PostgreSQL's A (most important) to D
+# The PostgreSQL GIN indexes are created from a frozen copy of the fields by a migration
+# (0033_search_indexes), so changing them needs a new migration
+# 결과 유형별 검색 대상 텍스트: 모델, 튜터 조회 경로, 가중치 필드, 반환 값
+# (`related` 값은 JOIN으로 읽음, 예: 수업의 학생 이름)
+# 가중치는 PostgreSQL의 A(가장 중요)부터 D까지를 따름
+# PostgreSQL GIN 인덱스는 마이그레이션(0033_search_indexes)이 필드 사본으로 생성하므로
+# 필드를 변경하려면 새 마이그레이션이 필요함
+SEARCH_DOCUMENTS = {
+    "students": {
+        "model": "Student",
+        "tutor": "tutor",
+        "fields": (("name", "A"), ("customer_number", "A"), ("billing_name", "B"), ("memo", "C")),
+        "values": ("name", "customer_number", "status"),
+    },
+    "lessons": {
+        "model": "Lesson",
+        "tutor": "student__tutor",
+        "fields": (("topic", "A"), ("memo", "B")),
+        "values": ("date", "start_time", "topic", "student_id"),
+        "related": {"student_name": "student__name"},
+    },
+    "todos": {
+        "model": "Todo",
+        "tutor": "tutor",
+        "fields": (("content", "A"),),
+        "values": ("content", "is_completed", "due_date"),
+    },
+    "invoices": {
+        "model": "Invoice",
+        "tutor": "tutor",
+        "fields": (("subject", "A"), ("full_invoice_code", "A"), ("recipient_name", "B")),
+        "values": (
+            "full_invoice_code", "subject", "recipient_name", "invoice_date", "is_finalized"
+        ),
+    },
+}
+
+SEARCH_CONFIG = "german"
+
+# PostgreSQL's default ts_rank weights, reused as FTS5 bm25() column weights
+# PostgreSQL의 기본 ts_rank 가중치로, FTS5 bm25() 컬럼 가중치로도 사용됨
+WEIGHT_VALUES = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def fts_table_name(model):
+    return f"{model._meta.db_table}_fts"
+
+
+def search_vector(document):
+    """
+    Weighted tsvector expression of a document (PostgreSQL only).
+    The GIN index is built from the same expression so the planner can use it.
+
+    문서의 가중치 tsvector 표현식을 반환합니다 (PostgreSQL 전용).
+    플래너가 GIN 인덱스를 사용할 수 있도록 인덱스도 동일한 표현식으로 생성됩니다.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in document["fields"]:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def search_tokens(text):
+    return TOKEN_RE.findall(text or "")[:10]
+
+
+def _postgres_search(queryset, document, tokens):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    # Prefix match on the stemmed terms, e.g. "Grammatik:* & Dativ:*"
+    # 어간 추출된 용어에 대한 접두어 검색, 예: "Grammatik:* & Dativ:*"
+    query = SearchQuery(
+        " & ".join(f"{token}:*" for token in tokens), search_type="raw", config=SEARCH_CONFIG
+    )
+    vector = search_vector(document)
+    return queryset.annotate(search=vector, rank=SearchRank(vector, query)).filter(search=query)
+
+
+def _sqlite_search(queryset, document, tokens):
+    # FTS5 has no German stemmer; diacritics are folded and every term is a prefix query
+    # FTS5에는 독일어 어간 추출기가 없으므로 발음 구별 기호를 제거하고 모든 용어를 접두어 검색함
+    match = " ".join(f'"{token}"*' for token in tokens)
+    table = queryset.model._meta.db_table
+    fts = fts_table_name(queryset.model)
+    weights = ", ".join(str(WEIGHT_VALUES[weight]) for _field, weight in document["fields"])
+    return queryset.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+    ).annotate(
+        # bm25() is lower for better matches, so it is negated to sort like ts_rank
+        # bm25()는 일치도가 높을수록 작으므로 ts_rank처럼 정렬되도록 부호를 바꿈
+        rank=RawSQL(
+            f'SELECT -bm25({fts}, {weights}) FROM {fts} WHERE {fts} MATCH %s AND rowid = "{table}"."id"',
+            [match],
+            output_field=FloatField(),
+        )
+    )
+
+
+def search(user, text, types=None, limit=10):
+    """
+    Ranked full-text search over the tutor's data, one query per result type.
+    PostgreSQL uses the German text search configuration with GIN indexes,
+    other databases (SQLite in development/tests) the FTS5 tables kept in sync by triggers.
+
+    튜터 데이터에 대한 순위 기반 전문 검색으로, 결과 유형별로 쿼리 하나를 실행합니다.
+    PostgreSQL은 GIN 인덱스와 독일어 텍스트 검색 설정을 사용하고,
+    그 외 데이터베이스(개발/테스트용 SQLite)는 트리거로 동기화되는 FTS5 테이블을 사용합니다.
+    """
+    tokens = search_tokens(text)
+    results = {}
+    for name in types or SEARCH_DOCUMENTS:
+        document = SEARCH_DOCUMENTS[name]
+        if not tokens:
+            results[name] = []
+            continue
+
+        model = apps.get_model("tutor", document["model"])
+        queryset = model.objects.filter(**{document["tutor"]: user})
+        if connection.vendor == "postgresql":
+            queryset = _postgres_search(queryset, document, tokens)
+        else:
+            queryset = _sqlite_search(queryset, document, tokens)
+
+        related = {key: F(path) for key, path in document.get("related", {}).items()}
+        rows = queryset.order_by("-rank", "-pk").values(
+            "id", "rank", *document["values"], **related
+        )[:limit]
+        results[name] = [{**row, "rank": round(row["rank"], 4)} for row in rows]
+    return results
+
+
+def install_sqlite_fts(connection):
+    """
+    (Re)create the FTS5 tables and their sync triggers on SQLite.
+    Runs after every migrate: SQLite migrations rebuild altered tables,
+    which drops their triggers, so they are recreated and the index rebuilt.
+
+    SQLite에 FTS5 테이블과 동기화 트리거를 (재)생성합니다.
+    모든 migrate 이후 실행됩니다: SQLite 마이그레이션은 변경된 테이블을 재생성하면서
+    트리거를 삭제하므로, 트리거를 다시 만들고 인덱스를 재구축합니다.
+    """
+    with connection.cursor() as cursor:
+        for document in SEARCH_DOCUMENTS.values():
+            model = apps.get_model("tutor", document["model"])
+            table = model._meta.db_table
+            fts = fts_table_name(model)
+            columns = [model._meta.get_field(field).column for field, _weight in document["fields"]]
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            old_values = ", ".join(f"old.{column}" for column in columns)
+            delete_old = (
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values});"
+            )
+            insert_new = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+
+            cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, content='{table}', "
+                f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+            for suffix, event, body in (
+                ("ai", "AFTER INSERT", insert_new),
+                ("ad", "AFTER DELETE", delete_old),
+                ("au", "AFTER UPDATE", delete_old + " " + insert_new),
+            ):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+                cursor.execute(
+                    f"CREATE TRIGGER {fts}_{suffix} {event} ON {table} BEGIN {body} END"
+                )
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -1,5 +1,7 @@
 import json
 import os
+from calendar import monthrange
+from datetime import date
 
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
@@ -9,6 +11,7 @@ from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.utils import timezone
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
@@ -20,6 +23,7 @@ from dj_rest_auth.serializers import (
     PasswordResetConfirmSerializer,
 )
 
+from .fieldsets import SparseFieldsetSerializerMixin
 from .models import (
     Tutor,
     Student,
@@ -29,6 +33,7 @@ from .models import (
     ExamSection,
     ExamRecord,
     ExamAttachment,
+    AttachmentUpload,
     ExamScoreInput,
     ExamDetailResult,
     OfficialExamResult,
@@ -38,6 +43,7 @@ from .models import (
     Invoice,
     InvoiceItem,
     InvoiceAdjustment,
+    DataExport,
 )
 
 
@@ -115,7 +121,7 @@ class CourseRegistrationSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Student information.
     The tutor is assigned in the ViewSet, not here.
@@ -197,12 +203,55 @@ class ExamStandardSerializer(serializers.ModelSerializer):
 class ExamAttachmentSerializer(serializers.ModelSerializer):
     """
     Serializer for Exam file attachments.
+    `thumbnail` is a small preview URL (empty until `thumbnail_status` is READY).
     시험 첨부 파일(PDF, 이미지 등)을 위한 시리얼라이저입니다.
+    `thumbnail`은 작은 미리보기 URL입니다 (`thumbnail_status`가 READY가 될 때까지 비어 있음).
     """
 
     class Meta:
         model = ExamAttachment
         fields = "__all__"
+        read_only_fields = ("thumbnail", "thumbnail_status")
+
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    """
+    Serializer for resumable chunked upload sessions.
+    `received_size` is the offset from which the next chunk must be sent.
+
+    이어받기 가능한 청크 업로드 세션을 위한 시리얼라이저입니다.
+    `received_size`는 다음 청크를 전송해야 하는 오프셋입니다.
+    """
+
+    class Meta:
+        model = AttachmentUpload
+        fields = (
+            "id",
+            "exam_record",
+            "original_name",
+            "total_size",
+            "received_size",
+            "created_at",
+        )
+        read_only_fields = ("id", "received_size", "created_at")
+
+    def validate_exam_record(self, value):
+        if value.student.tutor_id != self.context["request"].user.pk:
+            raise ValidationError(_("Prüfungsergebnis nicht gefunden."))
+        return value
+
+    def validate_original_name(self, value):
+        name = os.path.basename(value.replace("\\", "/")).strip()
+        if not name:
+            raise ValidationError(_("Ungültiger Dateiname."))
+        return name
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise ValidationError(_("Die Datei ist leer."))
+        if value > settings.CHUNKED_UPLOAD_MAX_FILE_SIZE:
+            raise ValidationError(_("Die Datei ist zu groß."))
+        return value
 
 
 class ExamScoreInputSerializer(serializers.ModelSerializer):
@@ -252,7 +301,7 @@ class ExamDetailResultSerializer(serializers.ModelSerializer):
         read_only_fields = ("exam_record",)
 
 
-class ExamRecordSerializer(serializers.ModelSerializer):
+class ExamRecordSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the main Exam Record.
     Includes nested data for attachments, score inputs, and detailed results.
@@ -282,6 +331,12 @@ class ExamRecordSerializer(serializers.ModelSerializer):
     score_inputs = ExamScoreInputSerializer(many=True)
     detail_results = ExamDetailResultSerializer(many=True)
 
+    # Data read by get_max_score (used to trim the queryset for `?fields=`)
+    # get_max_score가 읽는 데이터 (`?fields=` 요청 시 QuerySet 축소에 사용)
+    sparse_sources = {
+        "max_score": ("exam_mode", "exam_standard__total_score", "exam_standard__modules"),
+    }
+
     class Meta:
         model = ExamRecord
         fields = "__all__"
@@ -519,6 +574,40 @@ class LessonSerializer(serializers.ModelSerializer):
         return data
 
 
+class LessonBulkSerializer(serializers.Serializer):
+    """
+    Status change and/or date/time shift, or deletion, for a list of lesson IDs
+    (`/api/lessons/bulk/`).
+
+    수업 ID 목록에 대한 상태 변경 및/또는 날짜/시간 이동, 또는 삭제 (`/api/lessons/bulk/`).
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=settings.BULK_UPDATE_MAX_ITEMS,
+    )
+    status = serializers.ChoiceField(choices=Lesson.StatusChoices.choices, required=False)
+    shift_days = serializers.IntegerField(min_value=-366, max_value=366, default=0)
+    shift_minutes = serializers.IntegerField(min_value=-1439, max_value=1439, default=0)
+    delete = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        changes = "status" in attrs or attrs["shift_days"] or attrs["shift_minutes"]
+        if attrs["delete"] and changes:
+            raise ValidationError(
+                _("Löschen kann nicht mit Status oder Verschiebung kombiniert werden.")
+            )
+        if not attrs["delete"] and not changes:
+            raise ValidationError(
+                _("Bitte geben Sie einen Status, eine Verschiebung oder das Löschen an.")
+            )
+        # Keep the first occurrence of each ID, in request order
+        # 요청 순서대로 각 ID의 첫 번째 항목만 유지
+        attrs["ids"] = list(dict.fromkeys(attrs["ids"]))
+        return attrs
+
+
 # ==========================================
 # 7. Todo Serializers
 # ==========================================
@@ -602,6 +691,10 @@ class CustomPasswordResetSerializer(PasswordResetSerializer):
         }
 
     def save(self):
+        """
+        Queue the reset mail(s) in the outbox (tutor.mail), delivered by `send_queued_email`.
+        비밀번호 재설정 메일을 아웃박스(tutor.mail)에 저장하며, `send_queued_email`이 발송합니다.
+        """
         request = self.context.get("request")
 
         # Get Frontend domain from env (e.g., localhost:5173 or myapp.com)
@@ -732,7 +825,7 @@ class InvoiceAdjustmentSerializer(serializers.ModelSerializer):
         read_only_fields = ("invoice", "amount")
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Invoices.
     Handles nested creation of invoice items and performs precise financial calculations.
@@ -759,6 +852,11 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "full_invoice_code",
             "sender_data",
             "created_at",
+            "reminder_count",
+            "reminded_at",
+            "archived_pdf",
+            "archived_pdf_sha256",
+            "archived_pdf_status",
         )
 
     def validate_recipient_address(self, value):
@@ -873,3 +971,130 @@ class InvoiceTemplateCandidateSerializer(serializers.ModelSerializer):
             "subject",
             "total_amount",
         )
+
+
+class BillingRunSerializer(serializers.Serializer):
+    """
+    Input of the monthly billing run (month as YYYY-MM).
+
+    월간 일괄 정산 입력값 (월은 YYYY-MM 형식).
+    """
+
+    month = serializers.DateField(input_formats=["%Y-%m"])
+    source = serializers.ChoiceField(
+        choices=[
+            ("registrations", _("Kursregistrierungen")),
+            ("lessons", _("Abgeschlossene Unterrichtsstunden")),
+        ],
+        default="registrations",
+    )
+    preview = serializers.BooleanField(default=False)
+
+
+class InvoiceBulkStatusSerializer(serializers.Serializer):
+    """
+    Finalization and payment/sent status change for a list of invoice IDs
+    (`/api/invoices/bulk/`).
+
+    영수증 ID 목록에 대한 확정 및 결제/발송 상태 변경 (`/api/invoices/bulk/`).
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=settings.BULK_UPDATE_MAX_ITEMS,
+    )
+    is_finalized = serializers.BooleanField(required=False)
+    is_paid = serializers.BooleanField(required=False)
+    is_sent = serializers.BooleanField(required=False)
+
+    def validate_is_finalized(self, value):
+        if not value:
+            raise ValidationError(
+                _("Finalisierte Rechnungen können nicht wieder zu Entwürfen werden.")
+            )
+        return value
+
+    def validate(self, attrs):
+        if not {"is_finalized", "is_paid", "is_sent"} & attrs.keys():
+            raise ValidationError(_("Bitte geben Sie mindestens einen Status an."))
+        # Keep the first occurrence of each ID, in request order
+        # 요청 순서대로 각 ID의 첫 번째 항목만 유지
+        attrs["ids"] = list(dict.fromkeys(attrs["ids"]))
+        return attrs
+
+
+class RevenueAnalyticsSerializer(serializers.Serializer):
+    """
+    Range of the revenue analytics (default: the last twelve months) and ranking size.
+
+    매출 분석 기간 (기본값: 최근 12개월) 및 순위 목록 크기.
+    """
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs):
+        today = timezone.localdate()
+        attrs.setdefault("end", today)
+        if "start" not in attrs:
+            month = attrs["end"].year * 12 + attrs["end"].month - 12
+            attrs["start"] = date(month // 12, month % 12 + 1, 1)
+        if attrs["start"] > attrs["end"]:
+            raise ValidationError(_("Das Startdatum muss vor dem Enddatum liegen."))
+        return attrs
+
+
+class AccountingExportSerializer(serializers.Serializer):
+    """
+    Period of the accounting export: a quarter (year + quarter) or a date range.
+    Validated data contains the resolved `start` and `end` dates.
+
+    회계 내보내기 기간: 분기(year + quarter) 또는 날짜 범위.
+    검증된 데이터에는 계산된 `start`와 `end` 날짜가 포함됩니다.
+    """
+
+    year = serializers.IntegerField(min_value=2000, max_value=2100, required=False)
+    quarter = serializers.IntegerField(min_value=1, max_value=4, required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if "year" in attrs and "quarter" in attrs:
+            year, last_month = attrs["year"], 3 * attrs["quarter"]
+            attrs["start"] = date(year, last_month - 2, 1)
+            attrs["end"] = date(year, last_month, monthrange(year, last_month)[1])
+        elif not ("start" in attrs and "end" in attrs):
+            raise ValidationError(
+                _("Bitte geben Sie ein Quartal (year, quarter) oder einen Zeitraum (start, end) an.")
+            )
+        if attrs["start"] > attrs["end"]:
+            raise ValidationError(_("Das Startdatum muss vor dem Enddatum liegen."))
+        return attrs
+
+
+# ==========================================
+# 9. Data Export Serializers
+# ==========================================
+class DataExportSerializer(serializers.ModelSerializer):
+    """
+    Serializer for data export jobs.
+    Exposes status and progress; the archive is downloaded via the download action.
+
+    데이터 내보내기 작업을 위한 시리얼라이저.
+    상태와 진행률을 제공하며, 아카이브는 download 액션으로 다운로드함.
+    """
+
+    class Meta:
+        model = DataExport
+        fields = (
+            "id",
+            "status",
+            "progress",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+        read_only_fields = fields
@@ -0,0 +1,107 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_tutor
+from .models import BusinessProfile, ExamAttachment, Invoice, Tutor
+from .search import install_sqlite_fts
+
+
+@receiver(post_save, sender=Tutor)
+@receiver(post_delete, sender=Tutor)
+def invalidate_tutor_auth_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached authentication user whenever the Tutor row changes.
+
+    Tutor 정보가 변경되거나 삭제될 때마다 인증 사용자 캐시를 무효화합니다.
+    """
+    invalidate_cached_tutor(instance.pk)
+
+
+@receiver(post_delete, sender=ExamAttachment)
+def release_attachment_file(sender, instance, **kwargs):
+    """
+    Release the attachment's blob reference when the row is deleted.
+
+    첨부파일 행이 삭제되면 블롭 참조를 해제합니다.
+    """
+    if instance.file:
+        instance.file.storage.delete(instance.file.name)
+
+
+@receiver(pre_save, sender=ExamAttachment)
+def remember_previous_attachment_file(sender, instance, **kwargs):
+    """
+    Queue a new thumbnail when the attachment file is replaced and remember the
+    stored file name so the replaced blob can be released after saving.
+
+    첨부파일이 교체되면 새 썸네일 생성을 대기열에 넣고, 저장 후 교체된 블롭을
+    해제할 수 있도록 기존 파일 이름을 기억합니다.
+    """
+    instance._previous_file = None
+    if not instance.pk:
+        return
+    previous = ExamAttachment.objects.filter(pk=instance.pk).values_list("file", flat=True).first()
+    if previous != instance.file.name:
+        instance._previous_file = previous
+        instance.thumbnail = ""
+        instance.thumbnail_status = ExamAttachment.ThumbnailStatusChoices.PENDING
+
+
+@receiver(post_save, sender=ExamAttachment)
+def release_replaced_attachment_file(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_file", None)
+    if previous and previous != (instance.file.name or None):
+        instance.file.storage.delete(previous)
+
+
+@receiver(pre_save, sender=BusinessProfile)
+def remember_previous_logo(sender, instance, **kwargs):
+    """
+    Remember the stored logo name so a replaced logo can be released after saving.
+
+    로고가 교체된 경우 저장 후 해제할 수 있도록 기존 로고 이름을 기억합니다.
+    """
+    instance._previous_logo = None
+    if instance.pk:
+        instance._previous_logo = (
+            BusinessProfile.objects.filter(pk=instance.pk).values_list("logo", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=BusinessProfile)
+def release_replaced_logo(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_logo", None)
+    if previous and previous != (instance.logo.name or None):
+        instance.logo.storage.delete(previous)
+
+
+@receiver(post_delete, sender=BusinessProfile)
+def release_profile_logo(sender, instance, **kwargs):
+    if instance.logo:
+        instance.logo.storage.delete(instance.logo.name)
+
+
+@receiver(post_delete, sender=Invoice)
+def release_archived_pdf(sender, instance, **kwargs):
+    """
+    Release the archived PDF's blob reference when the invoice is deleted.
+
+    영수증이 삭제되면 보관용 PDF의 블롭 참조를 해제합니다.
+    """
+    if instance.archived_pdf:
+        instance.archived_pdf.storage.delete(instance.archived_pdf.name)
+
+
+@receiver(post_migrate)
+def install_search_tables(sender, using, **kwargs):
+    """
+    Recreate the SQLite FTS5 search tables after migrating the tutor app.
+    PostgreSQL uses GIN indexes created by a regular migration instead.
+
+    tutor 앱 마이그레이션 후 SQLite FTS5 검색 테이블을 재생성합니다.
+    PostgreSQL은 대신 일반 마이그레이션으로 생성되는 GIN 인덱스를 사용합니다.
+    """
+    connection = connections[using]
+    if sender.label == "tutor" and connection.vendor == "sqlite":
+        install_sqlite_fts(connection)
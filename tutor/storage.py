@@ -0,0 +1,151 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+
+BLOB_PREFIX = "blobs"
+
+# Derived files (previews) are cached next to the file they were generated from
+# 파생 파일(미리보기)은 원본 파일 옆에 캐시됨
+THUMBNAIL_SUFFIX = ".thumb.jpg"
+
+
+def hash_content(content):
+    """
+    Compute the SHA-256 digest of an uploaded file in chunks.
+
+    업로드된 파일의 SHA-256 해시를 청크 단위로 계산합니다.
+    """
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_name(digest, original_name=""):
+    """
+    Storage path of a blob: blobs/ab/cd/<sha256><ext>.
+    The extension is kept so servers can infer the content type.
+
+    블롭의 저장 경로: blobs/ab/cd/<sha256><확장자>.
+    서버가 콘텐츠 타입을 추론할 수 있도록 확장자를 유지합니다.
+    """
+    ext = os.path.splitext(original_name)[1].lower()[:10]
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def thumbnail_name(name):
+    """
+    Storage path of the cached thumbnail for a stored file.
+
+    저장된 파일에 대한 캐시 썸네일의 저장 경로를 반환합니다.
+    """
+    stem, _ext = os.path.splitext(name)
+    return f"{stem}{THUMBNAIL_SUFFIX}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that stores each distinct content once under its SHA-256 hash.
+    Every save adds a reference to the StoredBlob row and every delete removes one;
+    the file is only removed from disk when the last reference is gone.
+    Names that are not blobs (files uploaded before deduplication) are deleted directly.
+
+    동일한 내용을 SHA-256 해시 기반 경로에 한 번만 저장하는 파일 스토리지입니다.
+    저장할 때마다 StoredBlob의 참조 수가 증가하고 삭제할 때마다 감소하며,
+    마지막 참조가 사라졌을 때만 디스크에서 파일을 삭제합니다.
+    블롭이 아닌 이름(중복 제거 이전에 업로드된 파일)은 바로 삭제됩니다.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content, so an existing name holds identical bytes
+        # 이름이 내용에서 파생되므로 같은 이름은 동일한 파일을 의미함
+        return name
+
+    def _save(self, name, content):
+        StoredBlob = apps.get_model("tutor", "StoredBlob")
+        digest = hash_content(content)
+
+        with transaction.atomic():
+            blob, _created = StoredBlob.objects.select_for_update().get_or_create(
+                sha256=digest,
+                defaults={"name": blob_name(digest, name), "size": content.size},
+            )
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+            if not super().exists(blob.name):
+                content.seek(0)
+                super()._save(blob.name, content)
+
+        return blob.name
+
+    def retain(self, name):
+        """
+        Add a reference to an existing blob (e.g. when attaching a known file by hash).
+
+        기존 블롭에 참조를 추가합니다 (예: 해시로 기존 파일을 첨부할 때).
+        """
+        StoredBlob = apps.get_model("tutor", "StoredBlob")
+        return StoredBlob.objects.filter(name=name).update(ref_count=F("ref_count") + 1)
+
+    def save_derived(self, name, content):
+        """
+        Store a file derived from a blob (e.g. a thumbnail) under a fixed name.
+        Derived files are not reference counted; they are removed together with their blob.
+
+        블롭에서 파생된 파일(예: 썸네일)을 고정된 이름으로 저장합니다.
+        파생 파일은 참조 수를 관리하지 않으며, 원본 블롭과 함께 삭제됩니다.
+        """
+        super().delete(name)
+        return super()._save(name, content)
+
+    def _delete_with_derived(self, name):
+        super().delete(name)
+        super().delete(thumbnail_name(name))
+
+    def _delete_unreferenced(self, name):
+        # A save after the commit may have created a new blob row for the same content
+        # 커밋 이후의 저장이 같은 내용으로 새 블롭 행을 만들었을 수 있음
+        StoredBlob = apps.get_model("tutor", "StoredBlob")
+        if not StoredBlob.objects.filter(name=name).exists():
+            self._delete_with_derived(name)
+
+    def delete(self, name):
+        """
+        Remove one reference. Only the StoredBlob row is changed inside the caller's
+        transaction; the file itself is removed from disk once that transaction commits,
+        so a rollback never leaves a row pointing at a missing file.
+
+        참조 하나를 제거합니다. 호출자의 트랜잭션 안에서는 StoredBlob 행만 변경하고,
+        파일은 해당 트랜잭션이 커밋된 후에 디스크에서 삭제하므로 롤백되어도
+        존재하지 않는 파일을 가리키는 행이 남지 않습니다.
+        """
+        if not name:
+            return
+
+        StoredBlob = apps.get_model("tutor", "StoredBlob")
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.ref_count > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return
+
+            if blob is not None:
+                blob.delete()
+            transaction.on_commit(lambda: self._delete_unreferenced(name))
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def get_content_addressed_storage():
+    """
+    Callable used as `storage=` on file fields, so migrations reference it by path.
+
+    파일 필드의 `storage=`에 사용되는 callable로, 마이그레이션에서 경로로 참조됩니다.
+    """
+    return content_addressed_storage
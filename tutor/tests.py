@@ -1,10 +1,72 @@
+import csv
+import hashlib
+import importlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import uuid
+import zipfile
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection, transaction
+from django.http import HttpResponse, StreamingHttpResponse, UnreadablePostError
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from PIL import Image
 from rest_framework import status
-from rest_framework.test import APITestCase
-
-from .models import BusinessProfile, Invoice, Student
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import CachedJWTCookieAuthentication
+from .deletion import purge_tutor
+from .exports import run_export
+from .thumbnails import generate_pending_thumbnails
+from .uploads import UploadError, append_chunk, complete_upload
+from .middleware import QueryInstrumentationMiddleware, fingerprint_sql
+from .parsers import ORJSONParser
+from .recalculation import INVOICE_FIELDS, calculate_invoice, recalculate_invoices, to_cents
+from .renderers import ORJSONRenderer
+from .search import SEARCH_DOCUMENTS
+from .models import (
+    AttachmentUpload,
+    BusinessProfile,
+    CourseRegistration,
+    DataExport,
+    ExamAttachment,
+    ExamDetailResult,
+    ExamModule,
+    ExamRecord,
+    ExamScoreInput,
+    ExamSection,
+    ExamStandard,
+    Invoice,
+    InvoiceAdjustment,
+    InvoiceItem,
+    Lesson,
+    OfficialExamResult,
+    OutboundEmail,
+    Student,
+    StoredBlob,
+    Todo,
+)
 
 
 class InvoiceApiTests(APITestCase):
@@ -294,6 +356,23 @@ class InvoiceApiTests(APITestCase):
         self.assertEqual(next_number_response.status_code, status.HTTP_200_OK)
         self.assertEqual(next_number_response.data["sequence"], 1007)
 
+    def test_resequenced_draft_gets_a_new_etag(self):
+        """
+        Ensure a cached draft is not answered with 304 after it was renumbered.
+
+        번호가 다시 매겨진 드래프트는 캐시된 ETag로 304를 받지 않는지 검증합니다.
+        """
+        first_draft = self.create_draft(reference_number="REF-100")
+        second_draft = self.create_draft(reference_number="REF-200")
+        url = f"/api/invoices/{second_draft.data['id']}/"
+        etag = self.client.get(url)["ETag"]
+
+        self.client.delete(f"/api/invoices/{first_draft.data['id']}/")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["invoice_number"], 1005)
+
     def test_deleted_draft_number_is_reused_for_the_next_new_draft(self):
         """
         Ensure a deleted draft number becomes available again for the next new draft.
@@ -412,3 +491,3107 @@ class InvoiceApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response["Content-Type"], "application/pdf")
         self.assertEqual(response.content, b"%PDF-1.4 test")
+
+    @patch("tutor.views.HTML")
+    def test_preview_html_renders_without_pdf(self, html_class_mock):
+        """
+        Ensure the HTML preview returns the rendered invoice without running WeasyPrint.
+
+        HTML 미리보기가 WeasyPrint 없이 렌더링된 영수증을 반환하는지 검증합니다.
+        """
+        cache.clear()
+        response = self.client.post(
+            "/api/invoices/preview_html/", self.build_payload(), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertIn("Erika Mustermann", response.content.decode())
+        self.assertIn("10.03.2026", response.content.decode())
+        html_class_mock.assert_not_called()
+
+    def test_preview_html_sanitizes_the_intro_text(self):
+        """
+        Ensure user-entered intro HTML cannot run scripts in the preview.
+
+        사용자가 입력한 소개 문구 HTML이 미리보기에서 스크립트를 실행할 수 없는지 검증합니다.
+        """
+        cache.clear()
+        payload = self.build_payload()
+        payload["header_text"] = (
+            '<p onclick="steal()">Sehr geehrte <strong>Frau</strong> Muster,</p>'
+            "<script>steal()</script><img src=x onerror=steal()>"
+            '<table><tr><td colspan="2">Kurs</td></tr></table>'
+        )
+
+        response = self.client.post("/api/invoices/preview_html/", payload, format="json")
+
+        content = response.content.decode()
+        self.assertEqual(response["Content-Security-Policy"], "sandbox")
+        self.assertIn("<p>Sehr geehrte <strong>Frau</strong> Muster,</p>", content)
+        self.assertIn('<td colspan="2">Kurs</td>', content)
+        self.assertNotIn("steal()", content)
+        self.assertNotIn("<img", content)
+
+    @patch("tutor.views.HTML")
+    def test_identical_previews_are_rendered_once(self, html_class_mock):
+        """
+        Ensure identical preview payloads are served from the cache instead of re-rendered.
+
+        동일한 미리보기 요청은 다시 렌더링하지 않고 캐시에서 제공되는지 검증합니다.
+        """
+        cache.clear()
+        html_class_mock.return_value.write_pdf.return_value = b"%PDF-1.4 preview"
+
+        for _attempt in range(2):
+            response = self.client.post(
+                "/api/invoices/preview_pdf/", self.build_payload(), format="json"
+            )
+            self.assertEqual(response.content, b"%PDF-1.4 preview")
+        self.assertEqual(html_class_mock.return_value.write_pdf.call_count, 1)
+
+        self.client.post(
+            "/api/invoices/preview_pdf/", self.build_payload(subject="Andere"), format="json"
+        )
+        self.assertEqual(html_class_mock.return_value.write_pdf.call_count, 2)
+
+        with patch("tutor.views.render_invoice_html", return_value="<html></html>") as render:
+            for _attempt in range(2):
+                self.client.post(
+                    "/api/invoices/preview_html/", self.build_payload(), format="json"
+                )
+        self.assertEqual(render.call_count, 1)
+
+
+class QueryInstrumentationMiddlewareTests(TestCase):
+    """
+    Tests for the per-request query instrumentation middleware.
+
+    요청별 쿼리 계측 미들웨어에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.tutor = get_user_model().objects.create_user(
+            username="perf-tutor",
+            email="perf@example.com",
+            password="password123",
+            name="Perf Tutor",
+        )
+
+    def build_view(self, repeat):
+        """
+        Build a view that issues the same lookup query several times.
+
+        같은 조회 쿼리를 여러 번 실행하는 뷰를 생성합니다.
+        """
+
+        def view(request):
+            for _ in range(repeat):
+                list(Student.objects.filter(tutor=self.tutor))
+            return HttpResponse("ok")
+
+        return view
+
+    def test_fingerprint_collapses_placeholder_lists(self):
+        self.assertEqual(
+            fingerprint_sql('SELECT 1 FROM "a" WHERE "id" IN (%s, %s,  %s)'),
+            fingerprint_sql('SELECT 1 FROM "a"\n WHERE "id" IN (%s, %s)'),
+        )
+
+    @override_settings(DEBUG=True)
+    def test_debug_exposes_server_timing_header(self):
+        middleware = QueryInstrumentationMiddleware(self.build_view(repeat=3))
+
+        response = middleware(self.factory.get("/api/students/"))
+
+        self.assertIn('db;desc="3 queries"', response["Server-Timing"])
+        self.assertIn('dup;desc="1 duplicated fingerprints (3 queries)"', response["Server-Timing"])
+
+    @override_settings(DEBUG=False, SLOW_REQUEST_QUERY_THRESHOLD=2)
+    def test_production_logs_slow_requests_without_header(self):
+        middleware = QueryInstrumentationMiddleware(self.build_view(repeat=2))
+
+        with self.assertLogs("tutor.performance", level="WARNING") as logs:
+            response = middleware(self.factory.get("/api/students/"))
+
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertIn('"event": "slow_request"', logs.output[0])
+        self.assertIn('"queries": 2', logs.output[0])
+
+    @override_settings(DEBUG=False, SLOW_REQUEST_QUERY_THRESHOLD=3)
+    def test_queries_of_streamed_content_are_counted(self):
+        def rows():
+            for _ in range(3):
+                yield str(Student.objects.filter(tutor=self.tutor).count()).encode()
+
+        middleware = QueryInstrumentationMiddleware(lambda request: StreamingHttpResponse(rows()))
+
+        with self.assertNoLogs("tutor.performance", level="WARNING"):
+            response = middleware(self.factory.get("/api/invoices/datev_export/"))
+        with self.assertLogs("tutor.performance", level="WARNING") as logs:
+            self.assertEqual(b"".join(response.streaming_content), b"000")
+
+        self.assertIn('"queries": 3', logs.output[0])
+
+    @override_settings(DEBUG=False)
+    def test_fast_requests_are_not_logged_at_info(self):
+        middleware = QueryInstrumentationMiddleware(self.build_view(repeat=1))
+
+        with self.assertNoLogs("tutor.performance", level="INFO"):
+            middleware(self.factory.get("/api/students/"))
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    N+1 regression tests with a fixed query budget per endpoint.
+    Seeds one tutor with realistic volume so any serializer field that triggers
+    per-row queries blows the budget and fails CI.
+
+    엔드포인트별 고정 쿼리 예산을 검증하는 N+1 회귀 테스트입니다.
+    현실적인 데이터 양으로 튜터 한 명을 시딩하여, 행 단위 쿼리를 유발하는
+    시리얼라이저 필드가 추가되면 예산을 초과하여 CI가 실패하도록 합니다.
+    """
+
+    STUDENT_COUNT = 200
+    LESSONS_PER_STUDENT = 10
+    EXAMS_PER_STUDENT = 2
+    INVOICE_COUNT = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Seed the tutor data set with bulk inserts.
+
+        대량 삽입(bulk_create)으로 튜터 데이터 세트를 시딩합니다.
+        """
+        today = date.today()
+
+        cls.tutor = get_user_model().objects.create_user(
+            username="budget-tutor",
+            email="budget@example.com",
+            password="password123",
+            name="Budget Tutor",
+        )
+        BusinessProfile.objects.create(tutor=cls.tutor, manager_name="Budget Tutor")
+
+        standard = ExamStandard.objects.create(name="Budget B1", level="B1", total_score=300)
+        written = ExamModule.objects.create(
+            exam_standard=standard, module_type="WRITTEN", max_score=225
+        )
+        oral = ExamModule.objects.create(exam_standard=standard, module_type="ORAL", max_score=75)
+        reading = ExamSection.objects.create(
+            exam_module=written,
+            category="Leseverstehen",
+            name="Lesen Teil 1",
+            question_start_num=1,
+            question_end_num=10,
+            points_per_question=Decimal("5.00"),
+            section_max_score=50,
+        )
+        speaking = ExamSection.objects.create(
+            exam_module=oral,
+            category="Sprechen",
+            name="Sprechen Teil 1",
+            is_question_based=False,
+            section_max_score=75,
+        )
+
+        students = Student.objects.bulk_create(
+            [
+                Student(
+                    tutor=cls.tutor,
+                    name=f"Budget Student {index:03d}",
+                    customer_number=f"KD-B{index:04d}",
+                    current_level="A2",
+                    target_level="B1" if index % 2 else "B2",
+                )
+                for index in range(cls.STUDENT_COUNT)
+            ]
+        )
+        registrations = CourseRegistration.objects.bulk_create(
+            [
+                CourseRegistration(
+                    student=student,
+                    start_date=today.replace(day=1),
+                    end_date=today.replace(day=1) + timedelta(days=27),
+                    hourly_rate=Decimal("40.00"),
+                    total_hours=Decimal("10.0"),
+                    total_fee=Decimal("400.00"),
+                    is_paid=bool(index % 3),
+                )
+                for index, student in enumerate(students)
+            ]
+        )
+        Lesson.objects.bulk_create(
+            [
+                Lesson(
+                    student=student,
+                    course_registration=registrations[index],
+                    date=today + timedelta(days=offset - 5),
+                    start_time=time(9 + offset % 8),
+                    end_time=time(10 + offset % 8),
+                    topic=f"Kapitel {offset}",
+                )
+                for index, student in enumerate(students)
+                for offset in range(cls.LESSONS_PER_STUDENT)
+            ]
+        )
+        records = ExamRecord.objects.bulk_create(
+            [
+                ExamRecord(
+                    student=student,
+                    exam_standard=standard,
+                    exam_date=today - timedelta(days=attempt),
+                    exam_mode="WRITTEN" if attempt % 2 else "FULL",
+                    total_score=Decimal("180.00"),
+                )
+                for student in students
+                for attempt in range(cls.EXAMS_PER_STUDENT)
+            ]
+        )
+        ExamDetailResult.objects.bulk_create(
+            [
+                ExamDetailResult(
+                    exam_record=record,
+                    exam_section=reading,
+                    question_number=question,
+                    is_correct=bool(question % 2),
+                    score=Decimal("5.00") if question % 2 else Decimal("0.00"),
+                )
+                for record in records
+                for question in range(1, 11)
+            ]
+        )
+        ExamScoreInput.objects.bulk_create(
+            [
+                ExamScoreInput(exam_record=record, exam_section=speaking, score=Decimal("60.00"))
+                for record in records
+            ]
+        )
+        ExamAttachment.objects.bulk_create(
+            [
+                ExamAttachment(
+                    exam_record=record,
+                    file=f"exam_papers/budget/{record.pk}.pdf",
+                    original_name=f"{record.pk}.pdf",
+                )
+                for record in records[::4]
+            ]
+        )
+        OfficialExamResult.objects.bulk_create(
+            [
+                OfficialExamResult(
+                    student=student,
+                    exam_standard=standard,
+                    exam_date=today + timedelta(days=index % 30 - 15),
+                    exam_mode="WRITTEN" if index % 3 else "FULL",
+                    status=("PASSED", "FAILED", "WAITING")[index % 3],
+                )
+                for index, student in enumerate(students)
+            ]
+        )
+        Todo.objects.bulk_create(
+            [Todo(tutor=cls.tutor, content=f"Aufgabe {index}") for index in range(50)]
+        )
+
+        invoices = Invoice.objects.bulk_create(
+            [
+                Invoice(
+                    tutor=cls.tutor,
+                    student=students[index % cls.STUDENT_COUNT],
+                    invoice_number=2000 + index,
+                    full_invoice_code=f"RE-{2000 + index}2601",
+                    due_date=today + timedelta(days=14),
+                    recipient_name=f"Budget Student {index:03d}",
+                    is_finalized=bool(index % 2),
+                    total_amount=Decimal("119.00"),
+                )
+                for index in range(cls.INVOICE_COUNT)
+            ]
+        )
+        InvoiceItem.objects.bulk_create(
+            [
+                InvoiceItem(
+                    invoice=invoice,
+                    position_number=position,
+                    description=f"Unterricht {position}",
+                    quantity=Decimal("1.00"),
+                    unit_price=Decimal("50.00"),
+                    total_price=Decimal("50.00"),
+                )
+                for invoice in invoices
+                for position in range(1, 4)
+            ]
+        )
+        InvoiceAdjustment.objects.bulk_create(
+            [InvoiceAdjustment(invoice=invoice, value=Decimal("5.00")) for invoice in invoices]
+        )
+
+        cls.student = students[0]
+        cls.registration = registrations[0]
+        cls.record = records[0]
+        cls.invoice = invoices[1]
+
+    def setUp(self):
+        self.client.force_authenticate(self.tutor)
+
+    def assertQueryBudget(self, url, budget, params=None):
+        """
+        Request the URL and assert it stays within the given query budget.
+        The captured SQL is included in the failure message to spot the N+1 quickly.
+
+        URL을 요청하고 주어진 쿼리 예산 이내인지 검증합니다.
+        N+1 원인을 빠르게 찾을 수 있도록 실패 메시지에 실행된 SQL을 포함합니다.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params or {})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+        executed = [query["sql"] for query in context.captured_queries]
+        self.assertLessEqual(
+            len(executed),
+            budget,
+            f"{url} used {len(executed)} queries (budget {budget}):\n" + "\n".join(executed),
+        )
+        return response
+
+    def test_list_endpoints_stay_within_query_budget(self):
+        budgets = [
+            ("/api/students/", 1),
+            ("/api/courses/", 1),
+            ("/api/exam-standards/", 3),
+            ("/api/exam-records/", 5),
+            ("/api/exam-detail-results/", 1),
+            ("/api/attachments/", 1),
+            ("/api/exam-score-inputs/", 1),
+            ("/api/official-results/", 2),
+            ("/api/lessons/", 1),
+            ("/api/lessons/today/", 1),
+            ("/api/todos/", 1),
+            ("/api/invoices/", 3),
+        ]
+
+        for url, budget in budgets:
+            with self.subTest(url=url):
+                self.assertQueryBudget(url, budget)
+
+    def test_detail_endpoints_stay_within_query_budget(self):
+        detail_result = ExamDetailResult.objects.filter(exam_record=self.record).first()
+        score_input = ExamScoreInput.objects.filter(exam_record=self.record).first()
+        attachment = ExamAttachment.objects.filter(exam_record=self.record).first()
+        official = OfficialExamResult.objects.filter(student=self.student).first()
+        lesson = Lesson.objects.filter(student=self.student).first()
+        todo = Todo.objects.filter(tutor=self.tutor).first()
+
+        budgets = [
+            (f"/api/students/{self.student.pk}/", 1),
+            (f"/api/courses/{self.registration.pk}/", 1),
+            (f"/api/exam-standards/{self.record.exam_standard_id}/", 3),
+            (f"/api/exam-records/{self.record.pk}/", 5),
+            (f"/api/exam-detail-results/{detail_result.pk}/", 1),
+            (f"/api/attachments/{attachment.pk}/", 1),
+            (f"/api/exam-score-inputs/{score_input.pk}/", 1),
+            (f"/api/official-results/{official.pk}/", 2),
+            (f"/api/lessons/{lesson.pk}/", 1),
+            (f"/api/todos/{todo.pk}/", 1),
+            (f"/api/invoices/{self.invoice.pk}/", 3),
+        ]
+
+        for url, budget in budgets:
+            with self.subTest(url=url):
+                self.assertQueryBudget(url, budget)
+
+    def test_filtered_and_aggregate_endpoints_stay_within_query_budget(self):
+        today = date.today()
+
+        self.assertQueryBudget(
+            "/api/lessons/",
+            1,
+            {
+                "start_date": today.replace(day=1).isoformat(),
+                "end_date": (today + timedelta(days=31)).isoformat(),
+            },
+        )
+        self.assertQueryBudget("/api/exam-records/", 6, {"student": self.student.pk})
+        self.assertQueryBudget(
+            "/api/invoices/template_candidates/", 3, {"student": self.student.pk}
+        )
+        self.assertQueryBudget("/api/business-profile/", 1)
+        self.assertQueryBudget("/api/dashboard/stats/", 8)
+        self.assertQueryBudget("/api/exams/stats/", 6, {"year": today.year})
+
+
+class LoadCommandTests(TestCase):
+    """
+    Smoke tests for the seed_load and benchmark management commands.
+
+    seed_load 및 benchmark 관리 명령에 대한 스모크 테스트입니다.
+    """
+
+    def setUp(self):
+        standard = ExamStandard.objects.create(name="Load B1", level="B1", total_score=100)
+        module = ExamModule.objects.create(
+            exam_standard=standard, module_type="WRITTEN", max_score=100
+        )
+        ExamSection.objects.create(
+            exam_module=module,
+            category="Leseverstehen",
+            name="Lesen Teil 1",
+            question_start_num=1,
+            question_end_num=5,
+            points_per_question=Decimal("4.00"),
+            section_max_score=20,
+        )
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        self.output = os.path.join(output_dir, "run.json")
+
+    def seed(self):
+        call_command(
+            "seed_load",
+            students=2,
+            lessons=3,
+            exams=1,
+            invoices=2,
+            todos=2,
+            stdout=StringIO(),
+        )
+
+    def test_benchmark_runs_every_endpoint_against_seeded_data(self):
+        self.seed()
+        self.assertEqual(Student.objects.count(), 2)
+
+        with patch("weasyprint.HTML") as html_mock:
+            html_mock.return_value.write_pdf.return_value = b"%PDF-1.4 benchmark"
+            call_command(
+                "benchmark", iterations=2, warmup=0, output=self.output, stdout=StringIO()
+            )
+
+        with open(self.output, encoding="utf-8") as fh:
+            results = json.load(fh)
+        self.assertEqual(
+            {name: stats["ok"] for name, stats in results["endpoints"].items()},
+            {
+                name: True
+                for name in (
+                    "dashboard_stats",
+                    "exam_stats",
+                    "lessons_range",
+                    "exam_records",
+                    "invoice_save_draft",
+                    "invoice_create_full",
+                    "invoice_download_pdf",
+                )
+            },
+        )
+        # Write endpoints are rolled back
+        # 쓰기 엔드포인트는 롤백됨
+        self.assertEqual(Invoice.objects.count(), 4)
+
+    def test_benchmark_fails_on_error_responses(self):
+        self.seed()
+
+        with patch(
+            "tutor.management.commands.benchmark.Command._invoice_payload", return_value={}
+        ):
+            with self.assertRaisesMessage(CommandError, "invoice_save_draft (400)"):
+                call_command(
+                    "benchmark",
+                    iterations=1,
+                    warmup=0,
+                    endpoints=["invoice_save_draft"],
+                    output=self.output,
+                    stdout=StringIO(),
+                )
+
+
+@override_settings(AUTH_USER_CACHE_TTL=60)
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Tests for the cached Tutor lookup in JWT cookie authentication.
+
+    JWT 쿠키 인증의 Tutor 캐시 조회에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.auth = CachedJWTCookieAuthentication()
+        self.tutor = get_user_model().objects.create_user(
+            username="cache-tutor",
+            email="cache@example.com",
+            password="password123",
+            name="Cache Tutor",
+        )
+        self.token = str(RefreshToken.for_user(self.tutor).access_token)
+
+    def authenticate(self):
+        request = self.factory.get(
+            "/api/students/", HTTP_AUTHORIZATION=f"Bearer {self.token}"
+        )
+        return self.auth.authenticate(request)[0]
+
+    def test_second_request_is_served_from_cache(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+
+        self.assertEqual(user.pk, self.tutor.pk)
+
+    def test_user_update_invalidates_cache(self):
+        self.authenticate()
+
+        self.tutor.name = "Renamed Tutor"
+        self.tutor.save()
+
+        self.assertEqual(self.authenticate().name, "Renamed Tutor")
+
+    def test_user_delete_invalidates_cache(self):
+        self.authenticate()
+
+        self.tutor.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_session_user_is_served_from_cache(self):
+        client = APIClient()
+        client.force_login(self.tutor)
+        tutor_table = get_user_model()._meta.db_table
+
+        def tutor_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = client.get("/api/todos/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [query for query in context.captured_queries if tutor_table in query["sql"]]
+
+        self.assertTrue(tutor_queries())
+        self.assertEqual(tutor_queries(), [])
+
+        # A password change invalidates both the cache and the session
+        # 비밀번호 변경은 캐시와 세션을 모두 무효화함
+        self.tutor.set_password("new-password123")
+        self.tutor.save()
+        self.assertEqual(client.get("/api/todos/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_caching_is_disabled_without_a_ttl(self):
+        self.authenticate()
+        # Deactivated in another worker: no signal reaches this process's cache
+        # 다른 워커에서 비활성화됨: 이 프로세스의 캐시에는 시그널이 전달되지 않음
+        get_user_model().objects.filter(pk=self.tutor.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+class AccountDeletionTests(TestCase):
+    """
+    Tests for deferred account deletion and the chunked leaf-first purge.
+
+    지연 계정 삭제와 말단 우선 청크 삭제에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="delete-tutor",
+            email="delete@example.com",
+            password="password123",
+            name="Delete Tutor",
+        )
+        self.other_tutor = get_user_model().objects.create_user(
+            username="keep-tutor",
+            email="keep@example.com",
+            password="password123",
+            name="Keep Tutor",
+        )
+        standard = ExamStandard.objects.create(name="Delete B1", level="B1", total_score=100)
+        module = ExamModule.objects.create(
+            exam_standard=standard, module_type="WRITTEN", max_score=100
+        )
+        self.section = ExamSection.objects.create(
+            exam_module=module,
+            category="Leseverstehen",
+            name="Lesen Teil 1",
+            question_start_num=1,
+            question_end_num=5,
+            points_per_question=Decimal("20.00"),
+            section_max_score=100,
+        )
+        for tutor in (self.tutor, self.other_tutor):
+            self.create_data(tutor, standard)
+
+    def create_data(self, tutor, standard):
+        for index in range(3):
+            student = Student.objects.create(
+                tutor=tutor, name=f"Student {index}", current_level="A2", target_level="B1"
+            )
+            registration = CourseRegistration.objects.create(
+                student=student,
+                start_date=date(2026, 1, 1),
+                end_date=date(2026, 1, 31),
+                hourly_rate=Decimal("40.00"),
+                total_hours=Decimal("10.0"),
+            )
+            Lesson.objects.create(
+                student=student,
+                course_registration=registration,
+                date=date(2026, 1, 5),
+                start_time=time(10, 0),
+                end_time=time(11, 0),
+            )
+            record = ExamRecord.objects.create(
+                student=student,
+                exam_standard=standard,
+                exam_date=date(2026, 1, 20),
+                exam_mode="WRITTEN",
+            )
+            ExamDetailResult.objects.create(
+                exam_record=record, exam_section=self.section, question_number=1, is_correct=True
+            )
+            ExamAttachment.objects.create(
+                exam_record=record,
+                file=SimpleUploadedFile(
+                    f"scan-{index}.pdf", f"%PDF-1.4 {tutor.username} {index}".encode()
+                ),
+            )
+            invoice = Invoice.objects.create(
+                tutor=tutor,
+                student=student,
+                course_registration=registration,
+                invoice_number=1000 + index,
+                full_invoice_code=f"RE-{tutor.pk}-{index}",
+                due_date=date(2026, 2, 15),
+                recipient_name=student.name,
+            )
+            InvoiceItem.objects.create(
+                invoice=invoice, description="Unterricht", unit_price=1, total_price=1
+            )
+        Todo.objects.create(tutor=tutor, content="Aufräumen")
+
+    def test_mark_for_deletion_deactivates_and_releases_email(self):
+        self.tutor.mark_for_deletion()
+        self.tutor.refresh_from_db()
+
+        self.assertFalse(self.tutor.is_active)
+        self.assertIsNotNone(self.tutor.deletion_requested_at)
+        self.assertFalse(self.tutor.has_usable_password())
+        self.assertFalse(get_user_model().objects.filter(email="delete@example.com").exists())
+        # Data is kept until the purge job runs
+        # purge 작업 전까지 데이터는 유지됨
+        self.assertEqual(Student.objects.filter(tutor=self.tutor).count(), 3)
+
+    def test_purge_deletes_only_marked_accounts_and_their_files(self):
+        paths = [
+            attachment.file.path
+            for attachment in ExamAttachment.objects.filter(exam_record__student__tutor=self.tutor)
+        ]
+        self.tutor.mark_for_deletion()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("purge_deleted_accounts", chunk_size=2, stdout=StringIO())
+
+        self.assertFalse(get_user_model().objects.filter(pk=self.tutor.pk).exists())
+        self.assertFalse(ExamDetailResult.objects.filter(exam_record__student__tutor=self.tutor).exists())
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+        self.assertEqual(Student.objects.filter(tutor=self.other_tutor).count(), 3)
+        self.assertEqual(Lesson.objects.filter(student__tutor=self.other_tutor).count(), 3)
+        self.assertEqual(ExamAttachment.objects.filter(exam_record__student__tutor=self.other_tutor).count(), 3)
+        self.assertEqual(Invoice.objects.filter(tutor=self.other_tutor).count(), 3)
+
+    def test_purge_deletes_leaf_rows_in_bounded_chunks(self):
+        progress = []
+
+        deleted = purge_tutor(
+            self.tutor, chunk_size=2, progress=lambda step, count: progress.append((step, count))
+        )
+
+        self.assertEqual(deleted["exam_detail_results"], 3)
+        self.assertEqual(deleted["students"], 3)
+        self.assertEqual([count for step, count in progress if step == "lessons"], [2, 3])
+        steps = [step for step, _count in progress]
+        self.assertLess(steps.index("lessons"), steps.index("course_registrations"))
+        self.assertLess(steps.index("invoices"), steps.index("students"))
+
+
+class DataExportTests(TestCase):
+    """
+    Tests for the streamed ZIP data export.
+
+    스트리밍 ZIP 데이터 내보내기에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="export-tutor",
+            email="export@example.com",
+            password="password123",
+            name="Export Tutor",
+        )
+        standard = ExamStandard.objects.create(name="Export B1", level="B1", total_score=100)
+        self.students = [
+            Student.objects.create(
+                tutor=self.tutor, name=f"Schüler {index}", current_level="A2", target_level="B1"
+            )
+            for index in range(5)
+        ]
+        for student in self.students:
+            Lesson.objects.create(
+                student=student,
+                date=date(2026, 3, 2),
+                start_time=time(9, 0),
+                end_time=time(10, 0),
+                topic="Grammatik",
+            )
+        record = ExamRecord.objects.create(
+            student=self.students[0],
+            exam_standard=standard,
+            exam_date=date(2026, 3, 10),
+            exam_mode="FULL",
+        )
+        self.attachment = ExamAttachment.objects.create(
+            exam_record=record, file=SimpleUploadedFile("scan.pdf", b"%PDF-1.4 scan")
+        )
+
+    def test_export_writes_tables_and_files_with_bounded_chunks(self):
+        export = DataExport.objects.create(tutor=self.tutor)
+
+        run_export(export, chunk_size=2, include_invoice_pdfs=False)
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, DataExport.StatusChoices.COMPLETED)
+        self.assertEqual(export.progress, 100)
+
+        with export.file.open("rb") as fh, zipfile.ZipFile(fh) as archive:
+            names = archive.namelist()
+            students = [
+                json.loads(line)
+                for line in archive.read("students.ndjson").decode("utf-8").splitlines()
+            ]
+            lessons_csv = archive.read("lessons.csv").decode("utf-8").splitlines()
+            account = json.loads(archive.read("account.ndjson").decode("utf-8"))
+            attachment_name = (
+                f"files/exam_attachments/{self.attachment.exam_record_id}/"
+                f"{self.attachment.pk}_{os.path.basename(self.attachment.file.name)}"
+            )
+            attachment_bytes = archive.read(attachment_name)
+
+        self.assertIn("invoice_items.csv", names)
+        self.assertEqual([row["name"] for row in students], [s.name for s in self.students])
+        self.assertEqual(len(lessons_csv), 6)
+        self.assertNotIn("password", account)
+        self.assertEqual(attachment_bytes, b"%PDF-1.4 scan")
+
+    def test_export_failure_is_recorded(self):
+        export = DataExport.objects.create(tutor=self.tutor)
+
+        with patch(
+            "tutor.exports.ExportWriter.write_files", side_effect=OSError("disk full")
+        ), self.assertLogs("tutor.exports", level="ERROR"):
+            run_export(export, include_invoice_pdfs=False)
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, DataExport.StatusChoices.FAILED)
+        self.assertNotIn("disk full", export.error)
+        self.assertTrue(export.error)
+
+    def test_export_claimed_by_another_worker_is_skipped(self):
+        export = DataExport.objects.create(tutor=self.tutor)
+        # Another worker claimed the row after this one loaded it as PENDING
+        # 이 작업자가 PENDING 상태로 불러온 뒤 다른 작업자가 행을 선점함
+        DataExport.objects.filter(pk=export.pk).update(
+            status=DataExport.StatusChoices.RUNNING, started_at=timezone.now()
+        )
+
+        with patch("tutor.exports.build_export") as build_mock:
+            self.assertIsNone(run_export(export, include_invoice_pdfs=False))
+
+        build_mock.assert_not_called()
+
+    def test_export_expired_while_building_stays_failed(self):
+        export = DataExport.objects.create(tutor=self.tutor)
+
+        def expire_during_build(export, **kwargs):
+            DataExport.objects.filter(pk=export.pk).update(
+                status=DataExport.StatusChoices.FAILED, finished_at=timezone.now()
+            )
+            export.file.save("late.zip", SimpleUploadedFile("late.zip", b"zip"), save=False)
+
+        with patch("tutor.exports.build_export", side_effect=expire_during_build), self.assertLogs(
+            "tutor.exports", level="WARNING"
+        ):
+            run_export(export, include_invoice_pdfs=False)
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, DataExport.StatusChoices.FAILED)
+        self.assertFalse(export.file)
+        self.assertFalse(os.listdir(os.path.join(self.media_root, "exports")))
+
+    def test_abandoned_running_export_does_not_block_new_requests(self):
+        client = APIClient()
+        client.force_authenticate(self.tutor)
+        stale = DataExport.objects.create(
+            tutor=self.tutor,
+            status=DataExport.StatusChoices.RUNNING,
+            started_at=timezone.now() - timedelta(hours=2),
+        )
+        running = DataExport.objects.create(
+            tutor=get_user_model().objects.create_user(
+                username="export-other", email="export-other@example.com", password="password123"
+            ),
+            status=DataExport.StatusChoices.RUNNING,
+            started_at=timezone.now(),
+        )
+
+        response = client.post("/api/exports/")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(response.data["id"], stale.pk)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, DataExport.StatusChoices.FAILED)
+        self.assertEqual(client.post("/api/exports/").data["id"], response.data["id"])
+
+        call_command("run_data_exports", "--skip-invoice-pdfs", stdout=StringIO())
+        running.refresh_from_db()
+        self.assertEqual(running.status, DataExport.StatusChoices.RUNNING)
+
+
+class InterruptedStream:
+    """
+    Request stream that delivers part of a chunk and then drops the connection.
+
+    청크의 일부만 전달한 뒤 연결이 끊기는 요청 스트림입니다.
+    """
+
+    def __init__(self, data, fail_after):
+        self.data = data
+        self.position = 0
+        self.fail_after = fail_after
+
+    def read(self, size):
+        if self.position >= self.fail_after:
+            raise UnreadablePostError("connection reset")
+        end = min(self.position + size, self.fail_after)
+        block = self.data[self.position:end]
+        self.position = end
+        return block
+
+
+class ChunkedAttachmentUploadTests(APITestCase):
+    """
+    Tests for the resumable chunked exam attachment upload.
+
+    이어받기 가능한 시험 첨부파일 청크 업로드에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root,
+            CHUNKED_UPLOAD_TEMP_DIR=os.path.join(media_root, "staging"),
+            CHUNKED_UPLOAD_MAX_CHUNK_SIZE=4096,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="upload-tutor",
+            email="upload@example.com",
+            password="password123",
+            name="Upload Tutor",
+        )
+        self.client.force_authenticate(user=self.tutor)
+        student = Student.objects.create(
+            tutor=self.tutor, name="Upload Student", current_level="B1", target_level="B2"
+        )
+        standard = ExamStandard.objects.create(name="Upload B2", level="B2", total_score=100)
+        self.record = ExamRecord.objects.create(
+            student=student, exam_standard=standard, exam_date=date(2026, 4, 1), exam_mode="FULL"
+        )
+        self.content = bytes(range(256)) * 40
+
+    def init_upload(self):
+        response = self.client.post(
+            "/api/attachments/uploads/",
+            {
+                "exam_record": self.record.pk,
+                "original_name": "scan.pdf",
+                "total_size": len(self.content),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def put_chunk(self, upload_id, offset, data):
+        return self.client.generic(
+            "PUT",
+            f"/api/attachments/uploads/{upload_id}/",
+            data,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunked_upload_creates_attachment(self):
+        upload_id = self.init_upload()
+
+        for offset in range(0, len(self.content), 4096):
+            response = self.put_chunk(upload_id, offset, self.content[offset:offset + 4096])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(
+            f"/api/attachments/uploads/{upload_id}/complete/",
+            {"sha256": hashlib.sha256(self.content).hexdigest()},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        attachment = ExamAttachment.objects.get(pk=response.data["id"])
+        self.assertEqual(attachment.original_name, "scan.pdf")
+        with attachment.file.open("rb") as fh:
+            self.assertEqual(fh.read(), self.content)
+        self.assertFalse(AttachmentUpload.objects.filter(pk=upload_id).exists())
+
+    def test_interrupted_chunk_can_be_resumed_from_reported_offset(self):
+        upload_id = self.init_upload()
+        self.put_chunk(upload_id, 0, self.content[:4096])
+
+        # Connection drops after 1000 bytes of the second chunk
+        # 두 번째 청크의 1000바이트 전송 후 연결이 끊김
+        upload = AttachmentUpload.objects.get(pk=upload_id)
+        with self.assertRaises(UploadError):
+            append_chunk(upload, 4096, InterruptedStream(self.content[4096:8192], 1000), 4096)
+
+        response = self.client.get(f"/api/attachments/uploads/{upload_id}/")
+        self.assertEqual(response["Upload-Offset"], "5096")
+
+        # A blind retry of the whole chunk is rejected with the current offset
+        # 청크 전체를 그대로 재전송하면 현재 오프셋과 함께 거절됨
+        response = self.put_chunk(upload_id, 4096, self.content[4096:8192])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 5096)
+
+        offset = 5096
+        while offset < len(self.content):
+            response = self.put_chunk(upload_id, offset, self.content[offset:offset + 4096])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            offset = response.data["offset"]
+
+        response = self.client.post(f"/api/attachments/uploads/{upload_id}/complete/")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with ExamAttachment.objects.get(pk=response.data["id"]).file.open("rb") as fh:
+            self.assertEqual(fh.read(), self.content)
+
+    def test_losing_concurrent_chunk_does_not_touch_the_file(self):
+        upload_id = self.init_upload()
+        # Both requests loaded the session at offset 0; the first one wins
+        # 두 요청 모두 오프셋 0에서 세션을 불러왔고, 첫 번째 요청이 먼저 처리됨
+        stale = AttachmentUpload.objects.get(pk=upload_id)
+        self.put_chunk(upload_id, 0, self.content[:4096])
+
+        with self.assertRaises(UploadError) as ctx:
+            append_chunk(stale, 0, io.BytesIO(b"\xff" * 4096), 4096)
+
+        self.assertEqual(ctx.exception.offset, 4096)
+        with open(stale.staging_path, "rb") as fh:
+            self.assertEqual(fh.read(), self.content[:4096])
+
+    def test_chunk_overtaken_while_streaming_is_discarded(self):
+        upload_id = self.init_upload()
+        upload = AttachmentUpload.objects.get(pk=upload_id)
+        test = self
+
+        class OvertakenStream:
+            # Another request stores the same chunk while this body is still arriving
+            # 이 요청의 본문이 수신되는 동안 다른 요청이 같은 청크를 저장함
+            overtaken = False
+
+            def read(self, size):
+                if not self.overtaken:
+                    self.overtaken = True
+                    test.put_chunk(upload_id, 0, test.content[:4096])
+                return b"\xff" * size
+
+        with self.assertRaises(UploadError) as ctx:
+            append_chunk(upload, 0, OvertakenStream(), 4096)
+
+        self.assertEqual(ctx.exception.code, "offset_mismatch")
+        with open(upload.staging_path, "rb") as fh:
+            self.assertEqual(fh.read(), self.content[:4096])
+        self.assertEqual(os.listdir(upload.staging_path.parent), [upload.staging_path.name])
+
+    def test_completed_upload_cannot_be_completed_again(self):
+        upload_id = self.init_upload()
+        for offset in range(0, len(self.content), 4096):
+            self.put_chunk(upload_id, offset, self.content[offset:offset + 4096])
+        # The second request loaded the session before the first one completed it
+        # 두 번째 요청은 첫 번째 요청이 완료하기 전에 세션을 불러옴
+        stale = AttachmentUpload.objects.get(pk=upload_id)
+
+        response = self.client.post(f"/api/attachments/uploads/{upload_id}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self.assertRaises(UploadError) as ctx:
+            complete_upload(stale)
+        self.assertEqual(ctx.exception.code, "concurrent_upload")
+        self.assertEqual(ExamAttachment.objects.count(), 1)
+
+    def test_incomplete_upload_cannot_be_completed(self):
+        upload_id = self.init_upload()
+        self.put_chunk(upload_id, 0, self.content[:4096])
+
+        response = self.client.post(f"/api/attachments/uploads/{upload_id}/complete/")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 4096)
+        self.assertFalse(ExamAttachment.objects.exists())
+
+    def test_oversized_chunk_is_rejected(self):
+        upload_id = self.init_upload()
+
+        response = self.put_chunk(upload_id, 0, self.content[:5000])
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_other_tutor_cannot_access_upload(self):
+        upload_id = self.init_upload()
+        other = get_user_model().objects.create_user(
+            username="other-upload", email="other-upload@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=other)
+
+        response = self.put_chunk(upload_id, 0, self.content[:4096])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ContentAddressedStorageTests(APITestCase):
+    """
+    Tests for deduplicated attachment/logo storage with reference counting.
+
+    참조 수 기반 중복 제거 첨부파일/로고 저장소에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="blob-tutor",
+            email="blob@example.com",
+            password="password123",
+            name="Blob Tutor",
+        )
+        self.client.force_authenticate(user=self.tutor)
+        standard = ExamStandard.objects.create(name="Blob B1", level="B1", total_score=100)
+        self.records = [
+            ExamRecord.objects.create(
+                student=Student.objects.create(
+                    tutor=self.tutor, name=f"Blob {index}", current_level="A2", target_level="B1"
+                ),
+                exam_standard=standard,
+                exam_date=date(2026, 5, 4),
+                exam_mode="WRITTEN",
+            )
+            for index in range(2)
+        ]
+        self.content = b"%PDF-1.4 Antwortbogen Modelltest 1"
+
+    def attach(self, record, name="antwortbogen.pdf"):
+        return ExamAttachment.objects.create(
+            exam_record=record,
+            original_name=name,
+            file=SimpleUploadedFile(name, self.content),
+        )
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.attach(self.records[0])
+        second = self.attach(self.records[1], name="kopie.pdf")
+
+        self.assertEqual(first.file.name, second.file.name)
+        blob = StoredBlob.objects.get()
+        self.assertEqual(blob.sha256, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(blob.ref_count, 2)
+
+    def test_blob_is_removed_with_last_reference(self):
+        first = self.attach(self.records[0])
+        second = self.attach(self.records[1])
+        path = first.file.path
+
+        first.delete()
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_blob_file_survives_a_rolled_back_delete(self):
+        attachment = self.attach(self.records[0])
+        path = attachment.file.path
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    attachment.delete()
+                    raise DatabaseError("rollback")
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(os.path.exists(path))
+        self.assertTrue(ExamAttachment.objects.filter(exam_record=self.records[0]).exists())
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+
+    def test_replaced_logo_releases_previous_blob(self):
+        profile = BusinessProfile.objects.create(
+            tutor=self.tutor, logo=SimpleUploadedFile("logo.png", b"old-logo")
+        )
+        old_path = profile.logo.path
+
+        profile.logo = SimpleUploadedFile("logo.png", b"new-logo")
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(StoredBlob.objects.get().name, profile.logo.name)
+
+    def test_replaced_attachment_releases_previous_blob(self):
+        attachment = self.attach(self.records[0])
+        old_path = attachment.file.path
+
+        attachment.file = SimpleUploadedFile("antwortbogen.pdf", b"%PDF-1.4 korrigiert")
+        with self.captureOnCommitCallbacks(execute=True):
+            attachment.save()
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(StoredBlob.objects.get().name, attachment.file.name)
+        self.assertEqual(
+            attachment.thumbnail_status, ExamAttachment.ThumbnailStatusChoices.PENDING
+        )
+
+    def test_known_file_can_be_attached_by_hash(self):
+        existing = self.attach(self.records[0])
+
+        response = self.client.post(
+            "/api/attachments/from_hash/",
+            {
+                "exam_record": self.records[1].pk,
+                "sha256": hashlib.sha256(self.content).hexdigest(),
+                "original_name": "antwortbogen.pdf",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        attachment = ExamAttachment.objects.get(pk=response.data["id"])
+        self.assertEqual(attachment.file.name, existing.file.name)
+        self.assertEqual(StoredBlob.objects.get().ref_count, 2)
+
+    def test_unknown_or_foreign_hash_requires_upload(self):
+        other = get_user_model().objects.create_user(
+            username="blob-other", email="blob-other@example.com", password="password123"
+        )
+        other_student = Student.objects.create(
+            tutor=other, name="Fremd", current_level="A2", target_level="B1"
+        )
+        ExamAttachment.objects.create(
+            exam_record=ExamRecord.objects.create(
+                student=other_student,
+                exam_standard=self.records[0].exam_standard,
+                exam_date=date(2026, 5, 4),
+                exam_mode="WRITTEN",
+            ),
+            file=SimpleUploadedFile("fremd.pdf", self.content),
+        )
+
+        response = self.client.post(
+            "/api/attachments/from_hash/",
+            {"exam_record": self.records[0].pk, "sha256": hashlib.sha256(self.content).hexdigest()},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AttachmentThumbnailTests(APITestCase):
+    """
+    Tests for background thumbnail generation of exam attachments.
+
+    시험 첨부파일의 백그라운드 썸네일 생성에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, ATTACHMENT_THUMBNAIL_SIZE=64)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="thumb-tutor",
+            email="thumb@example.com",
+            password="password123",
+            name="Thumb Tutor",
+        )
+        self.client.force_authenticate(user=self.tutor)
+        student = Student.objects.create(
+            tutor=self.tutor, name="Vorschau", current_level="A2", target_level="B1"
+        )
+        self.record = ExamRecord.objects.create(
+            student=student,
+            exam_standard=ExamStandard.objects.create(name="Thumb B1", level="B1", total_score=100),
+            exam_date=date(2026, 5, 4),
+            exam_mode="WRITTEN",
+        )
+
+    def scan(self, name="scan.png", size=(800, 1200)):
+        buffer = BytesIO()
+        Image.new("RGBA", size, (200, 30, 30, 255)).save(buffer, "PNG")
+        return ExamAttachment.objects.create(
+            exam_record=self.record,
+            original_name=name,
+            file=SimpleUploadedFile(name, buffer.getvalue()),
+        )
+
+    def test_image_thumbnail_is_cached_next_to_original(self):
+        attachment = self.scan()
+        self.assertEqual(attachment.thumbnail_status, ExamAttachment.ThumbnailStatusChoices.PENDING)
+
+        results = generate_pending_thumbnails()
+
+        attachment.refresh_from_db()
+        self.assertEqual(results, {ExamAttachment.ThumbnailStatusChoices.READY: 1})
+        self.assertEqual(
+            os.path.dirname(attachment.thumbnail.name), os.path.dirname(attachment.file.name)
+        )
+        with Image.open(attachment.thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.format, "JPEG")
+            self.assertEqual(max(thumbnail.size), 64)
+
+        response = self.client.get(f"/api/attachments/{attachment.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["thumbnail"].endswith(attachment.thumbnail.name))
+        self.assertEqual(response.data["thumbnail_status"], "READY")
+
+    def test_shared_blob_reuses_thumbnail_until_last_reference(self):
+        first = self.scan()
+        second = self.scan(name="kopie.png")
+        generate_pending_thumbnails()
+        first.refresh_from_db()
+        second.refresh_from_db()
+
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+        path = first.thumbnail.path
+
+        first.delete()
+        self.assertTrue(os.path.exists(path))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_unsupported_files_are_marked(self):
+        attachment = ExamAttachment.objects.create(
+            exam_record=self.record,
+            file=SimpleUploadedFile("notizen.docx", b"PK docx"),
+        )
+
+        generate_pending_thumbnails()
+
+        attachment.refresh_from_db()
+        self.assertEqual(
+            attachment.thumbnail_status, ExamAttachment.ThumbnailStatusChoices.UNSUPPORTED
+        )
+        self.assertFalse(attachment.thumbnail)
+
+
+class ProtectedMediaTests(APITestCase):
+    """
+    Tests for owner-only media delivery.
+
+    소유자 전용 미디어 전송에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MEDIA_ACCEL_MODE="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="media-tutor", email="media@example.com", password="password123"
+        )
+        self.other = get_user_model().objects.create_user(
+            username="media-other", email="media-other@example.com", password="password123"
+        )
+        student = Student.objects.create(
+            tutor=self.tutor, name="Medien", current_level="A2", target_level="B1"
+        )
+        record = ExamRecord.objects.create(
+            student=student,
+            exam_standard=ExamStandard.objects.create(name="Media B1", level="B1", total_score=100),
+            exam_date=date(2026, 5, 4),
+            exam_mode="WRITTEN",
+        )
+        self.content = b"%PDF-1.4 " + bytes(range(256)) * 4
+        self.attachment = ExamAttachment.objects.create(
+            exam_record=record,
+            original_name="Lesen Teil 1.pdf",
+            file=SimpleUploadedFile("lesen.pdf", self.content),
+        )
+        self.url = self.attachment.file.url
+
+    def test_owner_receives_file(self):
+        self.client.force_authenticate(user=self.tutor)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("Lesen Teil 1.pdf", response["Content-Disposition"])
+
+    def test_other_tutor_and_anonymous_are_rejected(self):
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_range_requests(self):
+        self.client.force_authenticate(user=self.tutor)
+        size = len(self.content)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=9-18")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.content[9:19])
+        self.assertEqual(response["Content-Range"], f"bytes 9-18/{size}")
+        self.assertEqual(response["Content-Length"], "10")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-4")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-4:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={size}-")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{size}")
+
+    @override_settings(MEDIA_ACCEL_MODE="x-accel", MEDIA_ACCEL_PREFIX="/protected-media/")
+    def test_accel_redirect_hands_transfer_to_proxy(self):
+        self.client.force_authenticate(user=self.tutor)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.attachment.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+
+
+class ORJSONRendererTests(TestCase):
+    """
+    Tests for the orjson renderer/parser used as API JSON backend.
+
+    API JSON 백엔드로 사용되는 orjson 렌더러/파서에 대한 테스트입니다.
+    """
+
+    def payload(self):
+        return {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "total": Decimal("1234.50"),
+            "rate": Decimal("19.00"),
+            "created_at": timezone.make_aware(datetime(2026, 5, 4, 9, 30, 15, 123456), dt_timezone.utc),
+            "exam_date": date(2026, 5, 4),
+            "start_time": time(14, 30),
+            "label": _("Bezahlt"),
+            "note": "Zeile 1\u2028Zeile 2 \u2013 Prüfung",
+            "detail_results": [{"score": Decimal("12.5"), "max": 15, "passed": True, "memo": None}],
+        }
+
+    def test_output_matches_default_renderer(self):
+        payload = self.payload()
+
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_non_string_keys_are_rendered(self):
+        by_id = {7: {"count": 2}, 12: [{"score": Decimal("1.5")}]}
+        self.assertEqual(ORJSONRenderer().render(by_id), JSONRenderer().render(by_id))
+
+        rendered = ORJSONRenderer().render(
+            {date(2026, 5, 4): 1, Decimal("19.00"): {uuid.UUID(int=1): True}}
+        )
+        self.assertEqual(
+            json.loads(rendered),
+            {"2026-05-04": 1, "19.00": {"00000000-0000-0000-0000-000000000001": True}},
+        )
+
+    def test_indent_is_supported(self):
+        rendered = ORJSONRenderer().render({"a": [1]}, "application/json; indent=2")
+
+        self.assertEqual(rendered, b'{\n  "a": [\n    1\n  ]\n}')
+
+    def test_parser_reads_json_and_rejects_invalid_input(self):
+        parsed = ORJSONParser().parse(BytesIO('{"betrag": 12.5, "name": "Müller"}'.encode()))
+        self.assertEqual(parsed, {"betrag": 12.5, "name": "Müller"})
+
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b"{invalid"))
+
+    def test_api_uses_orjson_backend(self):
+        tutor = get_user_model().objects.create_user(
+            username="json-tutor", email="json@example.com", password="password123"
+        )
+        client = APIClient()
+        client.force_authenticate(user=tutor)
+
+        response = client.post(
+            "/api/todos/",
+            {"content": "Prüfung korrigieren", "due_date": "2026-05-04"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        body = json.loads(response.content)
+        self.assertEqual(body["content"], "Prüfung korrigieren")
+        self.assertEqual(body["due_date"], "2026-05-04")
+
+
+class SparseFieldsetTests(APITestCase):
+    """
+    Tests for `?fields=`/`?expand=` on student, exam record and invoice endpoints.
+
+    학생, 시험 기록, 영수증 엔드포인트의 `?fields=`/`?expand=`에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="sparse-tutor", email="sparse@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.tutor)
+
+        standard = ExamStandard.objects.create(name="Sparse B1", level="B1", total_score=100)
+        module = ExamModule.objects.create(
+            exam_standard=standard, module_type="WRITTEN", max_score=60
+        )
+        section = ExamSection.objects.create(
+            exam_module=module,
+            category="READING",
+            name="Lesen 1",
+            question_start_num=1,
+            question_end_num=5,
+            section_max_score=25,
+        )
+        for index in range(3):
+            student = Student.objects.create(
+                tutor=self.tutor, name=f"Sparse {index}", current_level="A2", target_level="B1"
+            )
+            record = ExamRecord.objects.create(
+                student=student, exam_standard=standard, exam_date=date(2026, 5, 4), exam_mode="WRITTEN"
+            )
+            ExamDetailResult.objects.create(
+                exam_record=record, exam_section=section, question_number=1, is_correct=True
+            )
+            invoice = Invoice.objects.create(
+                tutor=self.tutor,
+                student=student,
+                invoice_number=2000 + index,
+                full_invoice_code=f"RE-SPARSE-{index}",
+                due_date=date(2026, 5, 18),
+                recipient_name=student.name,
+            )
+            InvoiceItem.objects.create(
+                invoice=invoice, description="Unterricht", unit_price=1, total_price=1
+            )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query["sql"] for query in context.captured_queries]
+
+    def test_fields_skip_nested_data_and_prefetches(self):
+        response, queries = self.get("/api/exam-records/?fields=id,exam_date,student_name")
+
+        self.assertEqual(set(response.data[0]), {"id", "exam_date", "student_name"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("tutor_examdetailresult", queries[0])
+        self.assertNotIn("tutor_examstandard", queries[0])
+        self.assertNotIn('"memo"', queries[0])
+
+    def test_expand_includes_only_requested_nested_data(self):
+        response, queries = self.get("/api/exam-records/?fields=id,max_score&expand=detail_results")
+
+        self.assertEqual(set(response.data[0]), {"id", "max_score", "detail_results"})
+        self.assertEqual(response.data[0]["max_score"], 60)
+        self.assertEqual(len(response.data[0]["detail_results"]), 1)
+        self.assertFalse(any("tutor_examattachment" in sql for sql in queries))
+        self.assertFalse(any("tutor_examscoreinput" in sql for sql in queries))
+
+    def test_empty_expand_returns_flat_records(self):
+        response, _queries = self.get("/api/exam-records/?expand=")
+
+        record = response.data[0]
+        self.assertIn("student_name", record)
+        self.assertIn("max_score", record)
+        for nested in ("attachments", "score_inputs", "detail_results"):
+            self.assertNotIn(nested, record)
+
+    def test_without_parameters_everything_is_returned(self):
+        response, _queries = self.get("/api/exam-records/")
+
+        for nested in ("attachments", "score_inputs", "detail_results", "max_score"):
+            self.assertIn(nested, response.data[0])
+
+    def test_invoice_and_student_lists(self):
+        response, queries = self.get("/api/invoices/?fields=full_invoice_code,total_amount")
+        self.assertEqual(set(response.data[0]), {"full_invoice_code", "total_amount"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"recipient_address"', queries[0])
+
+        response, queries = self.get("/api/students/?fields=id,name")
+        self.assertEqual([row["name"] for row in response.data], ["Sparse 0", "Sparse 1", "Sparse 2"])
+        self.assertEqual(set(response.data[0]), {"id", "name"})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get("/api/students/?fields=id,passwort")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("passwort", str(response.data["fields"]))
+
+
+class ConditionalGetTests(APITestCase):
+    """
+    Tests for ETag/Last-Modified validators on the tutor-scoped collections.
+
+    튜터 범위 컬렉션의 ETag/Last-Modified 검증값에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="etag-tutor", email="etag@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.tutor)
+
+        self.student = Student.objects.create(
+            tutor=self.tutor, name="Etag Schüler", current_level="A2", target_level="B1"
+        )
+        self.todos = [
+            Todo.objects.create(tutor=self.tutor, content=f"Aufgabe {index}")
+            for index in range(3)
+        ]
+        self.lesson = Lesson.objects.create(
+            student=self.student,
+            date=date(2026, 5, 4),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+        )
+
+    def assertNotModified(self, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        # Only the aggregate validator query runs, the rows are never loaded
+        # 집계 검증 쿼리만 실행되고 행은 조회되지 않음
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn("COUNT(", context.captured_queries[0]["sql"])
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        return response["ETag"]
+
+    def test_list_returns_304_until_a_todo_is_created_updated_or_deleted(self):
+        url = "/api/todos/"
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        # The validator comes from the rows being serialized, no extra query
+        # 검증값은 직렬화되는 행에서 계산되며 추가 쿼리가 없음
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+        self.assertNotModified(url, etag)
+
+        created = self.client.post(url, {"content": "Neue Aufgabe"}, format="json")
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        etag = self.assertModified(url, etag)
+        self.assertNotModified(url, etag)
+
+        self.client.patch(f"{url}{self.todos[0].pk}/", {"is_completed": True}, format="json")
+        etag = self.assertModified(url, etag)
+
+        self.client.delete(f"{url}{self.todos[1].pk}/")
+        etag = self.assertModified(url, etag)
+        self.assertNotModified(url, etag)
+
+    def test_etag_depends_on_the_query_string(self):
+        etag = self.client.get("/api/todos/")["ETag"]
+
+        response = self.client.get("/api/todos/?is_completed=true", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_related_rows_invalidate_the_list(self):
+        url = "/api/lessons/"
+        etag = self.client.get(url)["ETag"]
+        self.assertNotModified(url, etag)
+
+        # The serialized student name changes with the student row
+        # 직렬화된 학생 이름은 학생 행과 함께 바뀜
+        self.client.patch(f"/api/students/{self.student.pk}/", {"name": "Umbenannt"}, format="json")
+        self.assertModified(url, etag)
+
+    def test_nested_children_touch_the_exam_record(self):
+        standard = ExamStandard.objects.create(name="Etag B1", level="B1", total_score=100)
+        module = ExamModule.objects.create(
+            exam_standard=standard, module_type="WRITTEN", max_score=60
+        )
+        section = ExamSection.objects.create(
+            exam_module=module,
+            category="READING",
+            name="Lesen 1",
+            question_start_num=1,
+            question_end_num=5,
+            section_max_score=25,
+        )
+        record = ExamRecord.objects.create(
+            student=self.student, exam_standard=standard, exam_date=date(2026, 5, 4), exam_mode="WRITTEN"
+        )
+        url = "/api/exam-records/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.post(
+            "/api/exam-detail-results/",
+            {"exam_record": record.pk, "exam_section": section.pk, "question_number": 1, "is_correct": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        etag = self.assertModified(url, etag)
+
+        self.client.delete(f"/api/exam-detail-results/{response.data['id']}/")
+        self.assertModified(url, etag)
+
+    def test_retrieve_supports_if_modified_since(self):
+        url = f"/api/todos/{self.todos[0].pk}/"
+        response = self.client.get(url)
+        last_modified = response["Last-Modified"]
+
+        self.assertNotModified(url, response["ETag"])
+        cached = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        missing = self.client.get("/api/todos/999999/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SearchTests(APITestCase):
+    """
+    Tests for the unified `/api/search/` endpoint (SQLite FTS5 fallback).
+
+    통합 `/api/search/` 엔드포인트 테스트입니다 (SQLite FTS5 대체 경로).
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="search-tutor", email="search@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.tutor)
+
+        self.student = Student.objects.create(
+            tutor=self.tutor, name="Jürgen Grammatikus", current_level="A2", target_level="B1"
+        )
+        self.lesson = Lesson.objects.create(
+            student=self.student,
+            date=date(2026, 5, 4),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            topic="Grammatik: Dativ und Akkusativ",
+        )
+        Lesson.objects.create(
+            student=self.student,
+            date=date(2026, 5, 5),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            topic="Hörverstehen",
+            memo="Hausaufgabe: Grammatik wiederholen",
+        )
+        Todo.objects.create(tutor=self.tutor, content="Grammatiktest korrigieren")
+        self.invoice = Invoice.objects.create(
+            tutor=self.tutor,
+            student=self.student,
+            invoice_number=3001,
+            full_invoice_code="RE-SEARCH-1",
+            due_date=date(2026, 5, 18),
+            recipient_name=self.student.name,
+            subject="Nachhilfe Grammatik Mai",
+        )
+
+        other = get_user_model().objects.create_user(
+            username="search-other", email="search-other@example.com", password="password123"
+        )
+        Todo.objects.create(tutor=other, content="Grammatik fremd")
+
+    def search(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/search/", params)
+        return response, context.captured_queries
+
+    def test_results_are_grouped_ranked_and_scoped_to_the_tutor(self):
+        response, queries = self.search(q="grammatik")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(queries), 4)
+        self.assertEqual([row["name"] for row in results["students"]], [self.student.name])
+        self.assertEqual([row["content"] for row in results["todos"]], ["Grammatiktest korrigieren"])
+        self.assertEqual(results["invoices"][0]["full_invoice_code"], "RE-SEARCH-1")
+
+        # The topic match outranks the memo match
+        # 주제 일치가 메모 일치보다 높은 순위
+        lessons = results["lessons"]
+        self.assertEqual(len(lessons), 2)
+        self.assertEqual(lessons[0]["id"], self.lesson.pk)
+        self.assertGreaterEqual(lessons[0]["rank"], lessons[1]["rank"])
+        self.assertEqual(lessons[0]["student_name"], self.student.name)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.lesson.topic = "Konjunktiv II"
+        self.lesson.save()
+        self.invoice.delete()
+
+        results = self.search(q="konjunktiv")[0].data["results"]
+        self.assertEqual([row["id"] for row in results["lessons"]], [self.lesson.pk])
+
+        results = self.search(q="Nachhilfe")[0].data["results"]
+        self.assertEqual(results["invoices"], [])
+
+    def test_diacritics_and_type_filter(self):
+        response, queries = self.search(q="horverst", types="lessons")
+
+        self.assertEqual(list(response.data["results"]), ["lessons"])
+        self.assertEqual(response.data["results"]["lessons"][0]["topic"], "Hörverstehen")
+        self.assertEqual(len(queries), 1)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.search(q="x", types="rechnungen")[0].status_code, 400)
+        self.assertEqual(self.search(q="x", limit="viele")[0].status_code, 400)
+
+        response, queries = self.search(q="  ")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_gin_index_migration_matches_the_search_documents(self):
+        # The migration keeps its own copy; a changed document needs a new migration
+        # 마이그레이션은 자체 사본을 유지하므로, 문서가 변경되면 새 마이그레이션이 필요함
+        migration = importlib.import_module("tutor.migrations.0033_search_indexes")
+
+        self.assertEqual(
+            {model: fields for model, _name, fields in migration.SEARCH_INDEXES},
+            {document["model"]: document["fields"] for document in SEARCH_DOCUMENTS.values()},
+        )
+
+
+@override_settings(
+    EMAIL_BACKEND="tutor.mail.OutboxEmailBackend",
+    EMAIL_OUTBOX_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_RETRY_DELAY=60,
+)
+class EmailOutboxTests(APITestCase):
+    """
+    Tests for the database email outbox and the `send_queued_email` worker.
+
+    DB 메일 아웃박스와 `send_queued_email` 워커에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="outbox-tutor", email="outbox@example.com", password="password123"
+        )
+
+    def deliver(self, **options):
+        call_command("send_queued_email", stdout=StringIO(), **options)
+
+    def test_password_reset_is_queued_and_delivered_by_the_worker(self):
+        response = self.client.post("/api/auth/password/reset/", {"email": "outbox@example.com"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mail.outbox, [])
+        queued = OutboundEmail.objects.get()
+        self.assertEqual(queued.to, ["outbox@example.com"])
+        self.assertEqual(queued.status, OutboundEmail.StatusChoices.PENDING)
+
+        self.deliver()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["outbox@example.com"])
+        self.assertEqual(mail.outbox[0].alternatives[0].mimetype, "text/html")
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboundEmail.StatusChoices.SENT)
+        self.assertIsNotNone(queued.sent_at)
+
+    def test_signup_confirmation_is_queued(self):
+        response = self.client.post(
+            "/api/auth/registration/",
+            {"email": "neu@example.com", "password1": "Sehr-Geheim-123!", "password2": "Sehr-Geheim-123!"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboundEmail.objects.get().to, ["neu@example.com"])
+
+    def test_rolled_back_transaction_sends_nothing(self):
+        try:
+            with transaction.atomic():
+                mail.send_mail("Betreff", "Text", None, ["x@example.com"])
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_failures_back_off_and_end_as_dead_letter(self):
+        mail.send_mail("Betreff", "Text", None, ["x@example.com"])
+        queued = OutboundEmail.objects.get()
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("Brevo down"),
+        ):
+            before = timezone.now()
+            self.deliver()
+            queued.refresh_from_db()
+            self.assertEqual(queued.status, OutboundEmail.StatusChoices.PENDING)
+            self.assertEqual(queued.attempts, 1)
+            self.assertIn("Brevo down", queued.last_error)
+            self.assertGreaterEqual(queued.next_attempt_at, before + timedelta(seconds=60))
+
+            # Not due yet, so the next run leaves it alone
+            # 아직 재시도 시각이 아니므로 다음 실행에서 건너뜀
+            self.deliver()
+            queued.refresh_from_db()
+            self.assertEqual(queued.attempts, 1)
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            self.deliver()
+            queued.refresh_from_db()
+            self.assertEqual(queued.attempts, 2)
+            self.assertGreaterEqual(queued.next_attempt_at, timezone.now() + timedelta(seconds=110))
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            self.deliver()
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboundEmail.StatusChoices.DEAD)
+        self.assertEqual(queued.attempts, 3)
+
+        self.deliver()
+        self.assertEqual(mail.outbox, [])
+
+    def test_batches_share_one_connection_and_respect_the_limit(self):
+        for index in range(5):
+            mail.send_mail(f"Betreff {index}", "Text", None, [f"x{index}@example.com"])
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.open", autospec=True
+        ) as opened:
+            self.deliver(batch_size=2, limit=4)
+
+        self.assertEqual(opened.call_count, 2)
+        self.assertEqual([message.subject for message in mail.outbox], [f"Betreff {i}" for i in range(4)])
+        self.assertEqual(
+            OutboundEmail.objects.filter(status=OutboundEmail.StatusChoices.PENDING).count(), 1
+        )
+
+        # An expired lease (crashed worker) makes the email due again
+        # 만료된 점유(비정상 종료된 워커)는 메일을 다시 발송 대상으로 만듦
+        OutboundEmail.objects.filter(status=OutboundEmail.StatusChoices.PENDING).update(
+            status=OutboundEmail.StatusChoices.SENDING, next_attempt_at=timezone.now()
+        )
+        self.deliver()
+        self.assertEqual(len(mail.outbox), 5)
+
+
+@override_settings(
+    EMAIL_BACKEND="tutor.mail.OutboxEmailBackend",
+    INVOICE_REMINDER_INTERVAL_DAYS=7,
+    INVOICE_REMINDER_MAX_COUNT=2,
+)
+class PaymentReminderTests(TestCase):
+    """
+    Tests for the overdue invoice scanner (`remind_overdue_invoices`).
+
+    연체 영수증 스캐너(`remind_overdue_invoices`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="reminder-tutor", email="reminder@example.com", password="password123"
+        )
+        self.student = Student.objects.create(tutor=self.tutor, name="Mahn Schüler")
+        self.today = timezone.localdate()
+        self.overdue = self.create_invoice(1, self.today - timedelta(days=3))
+        # Not reminded: paid, draft, not yet due
+        # 알림 대상 아님: 결제 완료, 임시 저장, 아직 만기 전
+        self.create_invoice(2, self.today - timedelta(days=3), is_paid=True)
+        self.create_invoice(3, self.today - timedelta(days=3), is_finalized=False)
+        self.create_invoice(4, self.today)
+
+    def create_invoice(self, number, due_date, tutor=None, is_finalized=True, is_paid=False):
+        return Invoice.objects.create(
+            tutor=tutor or self.tutor,
+            student=self.student,
+            invoice_number=number,
+            full_invoice_code=f"RE-MAHN-{number}",
+            due_date=due_date,
+            recipient_name="Mahn Schüler",
+            subject="Nachhilfe",
+            is_finalized=is_finalized,
+            is_paid=is_paid,
+        )
+
+    def remind(self, *args):
+        out = StringIO()
+        call_command("remind_overdue_invoices", *args, stdout=out)
+        return out.getvalue()
+
+    def test_overdue_finalized_invoice_gets_a_reminder_todo(self):
+        output = self.remind()
+
+        self.assertIn("Reminded 1 invoice(s)", output)
+        todo = Todo.objects.get()
+        self.assertEqual(todo.tutor, self.tutor)
+        self.assertIn("RE-MAHN-1", todo.content)
+        self.assertEqual(todo.priority, Todo.PriorityChoices.HIGH)
+        self.assertEqual(todo.category, Todo.CategoryChoices.ADMIN)
+        self.overdue.refresh_from_db()
+        self.assertEqual(self.overdue.reminder_count, 1)
+        self.assertIsNotNone(self.overdue.reminded_at)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_rerun_is_idempotent_until_the_interval_has_passed(self):
+        self.remind()
+        self.remind()
+        self.assertEqual(Todo.objects.count(), 1)
+
+        Invoice.objects.filter(pk=self.overdue.pk).update(
+            reminded_at=timezone.now() - timedelta(days=8)
+        )
+        self.remind()
+        self.assertEqual(Todo.objects.count(), 2)
+        self.assertTrue(Todo.objects.filter(content__startswith="2.").exists())
+
+        # INVOICE_REMINDER_MAX_COUNT reached
+        # INVOICE_REMINDER_MAX_COUNT 도달
+        Invoice.objects.filter(pk=self.overdue.pk).update(
+            reminded_at=timezone.now() - timedelta(days=8)
+        )
+        self.remind()
+        self.assertEqual(Todo.objects.count(), 2)
+
+    def test_email_mode_queues_one_summary_per_tutor(self):
+        self.create_invoice(5, self.today - timedelta(days=10))
+        other = get_user_model().objects.create_user(
+            username="reminder-other", email="reminder-other@example.com", password="password123"
+        )
+        self.create_invoice(6, self.today - timedelta(days=1), tutor=other)
+
+        self.remind("--email", "--no-todos", "--batch-size", "1")
+
+        self.assertFalse(Todo.objects.exists())
+        emails = {email.to[0]: email for email in OutboundEmail.objects.all()}
+        self.assertEqual(set(emails), {"reminder@example.com", "reminder-other@example.com"})
+        self.assertIn("2 überfällige Rechnungen", emails["reminder@example.com"].subject)
+        self.assertIn("RE-MAHN-1", emails["reminder@example.com"].body)
+        self.assertIn("RE-MAHN-5", emails["reminder@example.com"].body)
+        self.assertEqual(Invoice.objects.filter(reminder_count=1).count(), 3)
+
+    def test_inactive_tutors_are_skipped(self):
+        get_user_model().objects.filter(pk=self.tutor.pk).update(is_active=False)
+
+        self.remind()
+
+        self.assertFalse(Todo.objects.exists())
+
+
+class BillingRunTests(APITestCase):
+    """
+    Tests for the monthly billing run (`/api/invoices/billing_run/`, `run_monthly_billing`).
+
+    월간 일괄 정산(`/api/invoices/billing_run/`, `run_monthly_billing`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="billing-tutor", email="billing@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.tutor)
+        self.profile = BusinessProfile.objects.create(
+            tutor=self.tutor,
+            manager_name="Billing Tutor",
+            price_input_type=BusinessProfile.PriceInputChoices.NETTO,
+            next_invoice_number=1005,
+        )
+        self.student = self.create_student("Anna Abrechnung", billing_name="Eva Abrechnung")
+        self.registration = self.create_registration(self.student, date(2026, 9, 1))
+        # Number 1006 is taken by a finalized invoice, which is also the text template
+        # 1006번은 확정 영수증이 사용 중이며, 이 영수증이 문구 템플릿으로도 쓰임
+        Invoice.objects.create(
+            tutor=self.tutor,
+            student=self.student,
+            invoice_number=1006,
+            full_invoice_code="RE-10062608",
+            due_date=date(2026, 8, 31),
+            invoice_date=date(2026, 8, 17),
+            recipient_name="Eva Abrechnung",
+            header_text="<p>Sehr geehrte Frau Abrechnung,</p>",
+            footer_text="Vielen Dank!",
+            is_finalized=True,
+        )
+
+    def create_student(self, name, **fields):
+        return Student.objects.create(
+            tutor=self.tutor,
+            name=name,
+            current_level="B1",
+            target_level="B2",
+            street="Hauptstr. 1",
+            postcode="10115",
+            city="Berlin",
+            **fields,
+        )
+
+    def create_registration(self, student, start_date, hourly_rate="50.00", total_hours="10.0"):
+        return CourseRegistration.objects.create(
+            student=student,
+            start_date=start_date,
+            end_date=start_date + timedelta(days=27),
+            hourly_rate=Decimal(hourly_rate),
+            total_hours=Decimal(total_hours),
+        )
+
+    def run_billing(self, **data):
+        return self.client.post(
+            "/api/invoices/billing_run/", {"month": "2026-09", **data}, format="json"
+        )
+
+    def test_preview_lists_drafts_without_saving(self):
+        response = self.run_billing(preview=True)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["preview"])
+        [invoice] = response.data["invoices"]
+        self.assertIsNone(invoice["id"])
+        self.assertEqual(invoice["invoice_number"], 1005)
+        self.assertEqual(invoice["total_amount"], "595.00")
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.next_invoice_number, 1005)
+
+    def test_run_creates_drafts_with_a_number_block_and_bulk_inserts(self):
+        second = self.create_student("Bernd Billing")
+        self.create_registration(second, date(2026, 9, 14), hourly_rate="40.00", total_hours="5.0")
+        # Already invoiced, starts after the month, marked as paid: not billed
+        # 이미 청구됨, 해당 월 이후 시작, 결제 완료: 청구 대상 아님
+        invoiced = self.create_registration(self.create_student("Clara Contract"), date(2026, 9, 1))
+        Invoice.objects.create(
+            tutor=self.tutor,
+            course_registration=invoiced,
+            invoice_number=900,
+            full_invoice_code="RE-9002609",
+            due_date=date(2026, 9, 30),
+            recipient_name="Clara Contract",
+        )
+        self.create_registration(second, date(2026, 10, 1))
+        paid = self.create_registration(self.create_student("Dora Direkt"), date(2026, 9, 1))
+        CourseRegistration.objects.filter(pk=paid.pk).update(is_paid=True)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.run_billing()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        # One bulk INSERT for the invoices and one for their items
+        # 영수증과 항목 각각 한 번의 bulk INSERT
+        inserts = [
+            query["sql"] for query in context.captured_queries
+            if query["sql"].startswith('INSERT INTO "tutor_invoice')
+        ]
+        self.assertEqual(len(inserts), 2)
+
+        codes = {row["student_name"]: row for row in response.data["invoices"]}
+        self.assertEqual(set(codes), {"Anna Abrechnung", "Bernd Billing"})
+        self.assertEqual(
+            sorted(row["invoice_number"] for row in response.data["invoices"]), [1005, 1007]
+        )
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.next_invoice_number, 1008)
+
+        invoice = Invoice.objects.get(course_registration=self.registration)
+        self.assertFalse(invoice.is_finalized)
+        self.assertEqual(invoice.recipient_name, "Eva Abrechnung")
+        self.assertEqual(invoice.header_text, "<p>Sehr geehrte Frau Abrechnung,</p>")
+        self.assertEqual(invoice.delivery_date_start, date(2026, 9, 1))
+        self.assertEqual(invoice.total_amount, Decimal("595.00"))
+        item = invoice.items.get()
+        self.assertEqual(item.quantity, Decimal("10.00"))
+        self.assertEqual(item.unit, InvoiceItem.UnitChoices.HOUR)
+
+        # Stored totals match the regular recalculation
+        # 저장된 총액은 일반 재계산 결과와 일치함
+        invoice.calculate_totals()
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.total_amount, Decimal("595.00"))
+        self.assertEqual(invoice.vat_amount, Decimal("95.00"))
+
+        rerun = self.run_billing()
+        self.assertEqual(rerun.status_code, status.HTTP_200_OK)
+        self.assertEqual(rerun.data["invoices"], [])
+
+    def test_lesson_source_bills_completed_hours_once(self):
+        CourseRegistration.objects.filter(pk=self.registration.pk).update(is_paid=True)
+        student = self.create_student("Emil Einzel")
+        self.create_registration(student, date(2026, 6, 1), hourly_rate="40.00")
+        for day, lesson_status in ((3, "COMPLETED"), (10, "COMPLETED"), (17, "SCHEDULED")):
+            Lesson.objects.create(
+                student=student,
+                date=date(2026, 9, day),
+                start_time=time(10, 0),
+                end_time=time(11, 30),
+                status=lesson_status,
+            )
+        without_rate = self.create_student("Frida Frei")
+        Lesson.objects.create(
+            student=without_rate,
+            date=date(2026, 9, 4),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            status="COMPLETED",
+        )
+
+        response = self.run_billing(source="lessons")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        [row] = response.data["invoices"]
+        self.assertEqual(row["student_name"], "Emil Einzel")
+        self.assertEqual(row["hours"], "3.00")
+        self.assertEqual(row["subtotal"], "120.00")
+        self.assertEqual([skip["student_name"] for skip in response.data["skipped"]], ["Frida Frei"])
+
+        invoice = Invoice.objects.get(pk=row["id"])
+        self.assertEqual(invoice.delivery_date_start, date(2026, 9, 1))
+        self.assertEqual(invoice.delivery_date_end, date(2026, 9, 30))
+        self.assertIsNone(invoice.course_registration)
+
+        self.assertEqual(self.run_billing(source="lessons").data["invoices"], [])
+
+    def test_registration_billed_by_lessons_is_not_billed_again(self):
+        Lesson.objects.create(
+            student=self.student,
+            course_registration=self.registration,
+            date=date(2026, 9, 3),
+            start_time=time(10, 0),
+            end_time=time(11, 30),
+            status="COMPLETED",
+        )
+        response = self.run_billing(source="lessons")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(len(response.data["invoices"]), 1)
+
+        response = self.run_billing()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["invoices"], [])
+        [skip] = response.data["skipped"]
+        self.assertEqual(skip["course_registration"], self.registration.pk)
+        self.assertFalse(Invoice.objects.filter(course_registration=self.registration).exists())
+
+    def test_invalid_month_and_missing_profile(self):
+        response = self.run_billing(month="09/2026")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("month", response.data)
+
+        BusinessProfile.objects.filter(tutor=self.tutor).delete()
+        response = self.run_billing()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command_preview_writes_nothing(self):
+        out = StringIO()
+        call_command("run_monthly_billing", "--month", "2026-09", "--preview", stdout=out)
+
+        self.assertIn("Would create 1 draft invoice(s) for 2026-09.", out.getvalue())
+        self.assertIn("Anna Abrechnung", out.getvalue())
+        self.assertEqual(Invoice.objects.count(), 1)
+
+        call_command("run_monthly_billing", "--month", "2026-09", stdout=StringIO())
+        self.assertEqual(Invoice.objects.count(), 2)
+
+
+class DatevExportTests(APITestCase):
+    """
+    Tests for the streaming DATEV CSV export (`/api/invoices/datev_export/`).
+
+    스트리밍 DATEV CSV 내보내기(`/api/invoices/datev_export/`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="datev-tutor", email="datev@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.tutor)
+        self.student = Student.objects.create(
+            tutor=self.tutor, name="Dieter Datev", current_level="B1", target_level="B2"
+        )
+        self.mixed = self.create_invoice(
+            1,
+            date(2026, 7, 15),
+            items=[("45.50", "3", "19.00"), ("12.99", "1", "7.00"), ("80.00", "1.5", "0.00")],
+            adjustments=[("DISCOUNT", "5.00", "PERCENT"), ("SURCHARGE", "10.00", "CURRENCY")],
+        )
+        self.small_business = self.create_invoice(
+            2,
+            date(2026, 9, 30),
+            items=[("33.33", "3", "0.00")],
+            adjustments=[("DISCOUNT", "9.99", "CURRENCY")],
+            is_small_business=True,
+        )
+        # Excluded: draft, next quarter
+        # 제외 대상: 임시저장, 다음 분기
+        self.create_invoice(3, date(2026, 8, 1), items=[("10.00", "1", "19.00")], is_finalized=False)
+        self.create_invoice(4, date(2026, 10, 1), items=[("10.00", "1", "19.00")])
+
+    def create_invoice(self, number, invoice_date, items, adjustments=(), **fields):
+        invoice = Invoice.objects.create(
+            tutor=self.tutor,
+            student=self.student,
+            invoice_number=number,
+            full_invoice_code=f"RE-DATEV-{number}",
+            invoice_date=invoice_date,
+            due_date=invoice_date + timedelta(days=14),
+            recipient_name="Dieter Datev",
+            is_finalized=fields.pop("is_finalized", True),
+            **fields,
+        )
+        for position, (unit_price, quantity, vat_rate) in enumerate(items, 1):
+            InvoiceItem.objects.create(
+                invoice=invoice,
+                position_number=position,
+                description=f"Position {position}",
+                unit_price=Decimal(unit_price),
+                quantity=Decimal(quantity),
+                vat_rate=Decimal(vat_rate),
+                total_price=0,
+            )
+        for adjustment_type, value, unit in adjustments:
+            InvoiceAdjustment.objects.create(
+                invoice=invoice, type=adjustment_type, value=Decimal(value), unit=unit
+            )
+        return invoice
+
+    def export(self, **params):
+        response = self.client.get("/api/invoices/datev_export/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode("cp1252")
+        rows = list(csv.DictReader(StringIO(content), delimiter=";"))
+        return response, rows
+
+    @staticmethod
+    def amount(value):
+        return Decimal(value.replace(",", "."))
+
+    def test_rows_add_up_to_calculate_financials(self):
+        response, rows = self.export(year=2026, quarter=3)
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=windows-1252")
+        self.assertIn("DATEV_Buchungsstapel_20260701_20260930.csv", response["Content-Disposition"])
+        self.assertEqual({row["Belegfeld 1"] for row in rows}, {"RE-DATEV-1", "RE-DATEV-2"})
+
+        for invoice in (self.mixed, self.small_business):
+            calculated = Invoice.calculate_financials(
+                list(invoice.items.all()),
+                list(invoice.adjustments.all()),
+                is_small_business=invoice.is_small_business,
+            )
+            invoice_rows = [row for row in rows if row["Belegfeld 1"] == invoice.full_invoice_code]
+            net = sum(self.amount(row["Nettobetrag"]) for row in invoice_rows)
+            vat = sum(self.amount(row["USt-Betrag"]) for row in invoice_rows)
+            gross = sum(self.amount(row["Umsatz (ohne Soll/Haben-Kz)"]) for row in invoice_rows)
+
+            self.assertEqual(net, calculated["subtotal"].quantize(Decimal("0.01")))
+            self.assertEqual(vat, calculated["vat_amount"].quantize(Decimal("0.01")))
+            self.assertEqual(gross, net + vat)
+            self.assertAlmostEqual(gross, calculated["total_amount"], delta=Decimal("0.01"))
+
+        mixed_rows = {row["USt-Satz"]: row for row in rows if row["Belegfeld 1"] == "RE-DATEV-1"}
+        self.assertEqual(set(mixed_rows), {"19", "7", "0"})
+        self.assertEqual(mixed_rows["19"]["Gegenkonto (ohne BU-Schlüssel)"], "8400")
+        self.assertEqual(mixed_rows["7"]["Gegenkonto (ohne BU-Schlüssel)"], "8300")
+        self.assertEqual(mixed_rows["0"]["USt-Betrag"], "0,00")
+        self.assertEqual(mixed_rows["19"]["Soll/Haben-Kennzeichen"], "S")
+        self.assertEqual(mixed_rows["19"]["Belegdatum"], "15.07.2026")
+
+        [small_row] = [row for row in rows if row["Belegfeld 1"] == "RE-DATEV-2"]
+        self.assertEqual(small_row["Gegenkonto (ohne BU-Schlüssel)"], "8195")
+        self.assertEqual(small_row["Umsatz (ohne Soll/Haben-Kz)"], "90,00")
+
+    def test_query_count_does_not_grow_with_the_number_of_invoices(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                self.export(start="2026-07-01", end="2026-09-30")
+            return len(context.captured_queries)
+
+        baseline = count_queries()
+        for number in range(10, 30):
+            self.create_invoice(number, date(2026, 8, 3), items=[("20.00", "1", "19.00")])
+
+        self.assertEqual(count_queries(), baseline)
+
+    def test_names_outside_windows_1252_are_transliterated_or_reported(self):
+        Invoice.objects.filter(pk=self.mixed.pk).update(recipient_name="Antonín Dvořák-Łukasz")
+        Invoice.objects.filter(pk=self.small_business.pk).update(recipient_name="박 Datev")
+
+        with self.assertLogs("tutor.accounting", level="WARNING") as logs:
+            _response, rows = self.export(year=2026, quarter=3)
+
+        texts = {row["Belegfeld 1"]: row["Buchungstext"] for row in rows}
+        self.assertEqual(texts["RE-DATEV-1"], "Antonín Dvorák-Lukasz")
+        self.assertEqual(texts["RE-DATEV-2"], "? Datev")
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("RE-DATEV-2", logs.output[0])
+
+    def test_period_is_required(self):
+        response = self.client.get("/api/invoices/datev_export/", {"year": 2026})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            "/api/invoices/datev_export/", {"start": "2026-09-30", "end": "2026-07-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RevenueAnalyticsTests(APITestCase):
+    """
+    Tests for the revenue analytics endpoint (`/api/analytics/revenue/`).
+
+    매출 분석 엔드포인트(`/api/analytics/revenue/`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.tutor = get_user_model().objects.create_user(
+            username="analytics-tutor", email="analytics@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.tutor)
+        self.anna = Student.objects.create(tutor=self.tutor, name="Anna")
+        self.bernd = Student.objects.create(tutor=self.tutor, name="Bernd")
+        self.create_invoice(1, self.anna, date(2026, 1, 10), "119.00", is_paid=True)
+        self.create_invoice(2, self.bernd, date(2026, 1, 20), "238.00")
+        self.create_invoice(3, self.anna, date(2026, 3, 5), "595.00", is_paid=True)
+        self.create_invoice(4, self.bernd, date(2026, 3, 6), "59.50")
+        # Excluded: draft, outside the range, other tutor
+        # 제외 대상: 임시저장, 기간 외, 다른 튜터
+        self.create_invoice(5, self.anna, date(2026, 2, 1), "1000.00", is_finalized=False)
+        self.create_invoice(6, self.anna, date(2025, 12, 31), "1000.00")
+        other = get_user_model().objects.create_user(
+            username="analytics-other", email="analytics-other@example.com", password="password123"
+        )
+        self.create_invoice(7, None, date(2026, 1, 15), "1000.00", tutor=other)
+
+    def create_invoice(self, number, student, invoice_date, total, tutor=None, **fields):
+        total = Decimal(total)
+        return Invoice.objects.create(
+            tutor=tutor or self.tutor,
+            student=student,
+            invoice_number=number,
+            full_invoice_code=f"RE-STAT-{number}",
+            invoice_date=invoice_date,
+            due_date=invoice_date + timedelta(days=14),
+            recipient_name="Statistik",
+            subtotal=(total / Decimal("1.19")).quantize(Decimal("0.01")),
+            vat_amount=total - (total / Decimal("1.19")).quantize(Decimal("0.01")),
+            total_amount=total,
+            is_finalized=fields.pop("is_finalized", True),
+            **fields,
+        )
+
+    def report(self, **params):
+        params = {"start": "2026-01-01", "end": "2026-06-30", **params}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/analytics/revenue/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data, len(context.captured_queries)
+
+    def test_monthly_aggregates_with_running_totals(self):
+        data, _queries = self.report()
+
+        self.assertEqual([row["month"] for row in data["months"]], ["2026-01", "2026-03"])
+        january, march = data["months"]
+        self.assertEqual(january["invoice_count"], 2)
+        self.assertEqual(january["invoiced"], Decimal("357.00"))
+        self.assertEqual(january["paid"], Decimal("119.00"))
+        self.assertEqual(january["outstanding"], Decimal("238.00"))
+        self.assertEqual(january["vat"], Decimal("57.00"))
+        self.assertIsNone(january["previous_invoiced"])
+        self.assertEqual(march["previous_invoiced"], Decimal("357.00"))
+        self.assertEqual(march["cumulative_invoiced"], Decimal("1011.50"))
+
+        totals = data["totals"]
+        self.assertEqual(totals["invoice_count"], 4)
+        self.assertEqual(totals["invoiced"], Decimal("1011.50"))
+        self.assertEqual(totals["paid"], Decimal("714.00"))
+        self.assertEqual(totals["outstanding"], Decimal("297.50"))
+        self.assertEqual(totals["overdue"], Decimal("297.50"))
+        self.assertEqual(totals["net"] + totals["vat"], Decimal("1011.50"))
+
+    def test_students_are_ranked_by_revenue(self):
+        data, _queries = self.report()
+
+        self.assertEqual(
+            [(row["student_name"], row["rank"], row["invoiced"]) for row in data["students"]],
+            [("Anna", 1, Decimal("714.00")), ("Bernd", 2, Decimal("297.50"))],
+        )
+        self.assertEqual(data["students"][1]["outstanding"], Decimal("297.50"))
+
+        data, _queries = self.report(limit=1)
+        self.assertEqual([row["student_name"] for row in data["students"]], ["Anna"])
+
+    def test_results_are_cached_until_an_invoice_changes(self):
+        _data, first = self.report()
+        data, second = self.report()
+
+        self.assertLess(second, first)
+        self.assertEqual(data["totals"]["paid"], Decimal("714.00"))
+
+        Invoice.objects.filter(full_invoice_code="RE-STAT-2").update(
+            is_paid=True, updated_at=timezone.now() + timedelta(seconds=1)
+        )
+        data, _queries = self.report()
+        self.assertEqual(data["totals"]["paid"], Decimal("952.00"))
+
+    def test_invalid_range(self):
+        response = self.client.get(
+            "/api/analytics/revenue/", {"start": "2026-06-01", "end": "2026-01-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class InvoiceRecalculationTests(TestCase):
+    """
+    Tests for the bulk invoice recalculation (`tutor.recalculation`, `recalculate_invoices`).
+
+    영수증 일괄 재계산(`tutor.recalculation`, `recalculate_invoices`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="recalc-tutor", email="recalc@example.com", password="password123"
+        )
+
+    def create_invoice(self, number, items, adjustments=(), **fields):
+        invoice = Invoice.objects.create(
+            tutor=self.tutor,
+            invoice_number=number,
+            full_invoice_code=f"RE-CALC-{number}",
+            due_date=date(2026, 10, 31),
+            recipient_name="Neuberechnung",
+            subtotal=Decimal("1.00"),
+            vat_amount=Decimal("1.00"),
+            total_amount=Decimal("1.00"),
+            **fields,
+        )
+        for position, (quantity, unit_price, discount, discount_unit, vat_rate) in enumerate(
+            items, 1
+        ):
+            InvoiceItem.objects.create(
+                invoice=invoice,
+                position_number=position,
+                description=f"Position {position}",
+                quantity=Decimal(quantity),
+                unit_price=Decimal(unit_price),
+                discount_value=Decimal(discount),
+                discount_unit=discount_unit,
+                vat_rate=Decimal(vat_rate),
+                total_price=Decimal("0.00"),
+            )
+        for adj_type, value, unit in adjustments:
+            InvoiceAdjustment.objects.create(
+                invoice=invoice, label=adj_type, type=adj_type, value=Decimal(value), unit=unit
+            )
+        return invoice
+
+    def expected(self, invoice):
+        calculated = Invoice.calculate_financials(
+            list(invoice.items.order_by("position_number", "pk")),
+            list(invoice.adjustments.order_by("pk")),
+            is_small_business=invoice.is_small_business,
+        )
+        return {
+            "items": [to_cents(item["total_price"]) for item in calculated["items"]],
+            "adjustments": [to_cents(row["amount"]) for row in calculated["adjustments"]],
+            **{field: to_cents(calculated[field]) for field in INVOICE_FIELDS},
+        }
+
+    def test_matches_calculate_financials(self):
+        rng = random.Random(46)
+        for _case in range(500):
+            items = [
+                {
+                    "quantity": Decimal(rng.randint(1, 4000)) / 100,
+                    "unit_price": Decimal(rng.randint(0, 999999)) / 100,
+                    "discount_value": Decimal(rng.choice([0, 0, rng.randint(0, 10000)])) / 100,
+                    "discount_unit": rng.choice(["PERCENT", "CURRENCY"]),
+                    "vat_rate": Decimal(rng.choice(["19.00", "7.00", "0.00", "16.00"])),
+                }
+                for _item in range(rng.randint(0, 6))
+            ]
+            adjustments = [
+                {
+                    "type": rng.choice(["DISCOUNT", "SURCHARGE"]),
+                    "value": Decimal(rng.randint(0, 5000)) / 100,
+                    "unit": rng.choice(["PERCENT", "CURRENCY"]),
+                }
+                for _adjustment in range(rng.choice([0, 0, 1, 2]))
+            ]
+            is_small_business = rng.random() < 0.2
+
+            calculated = Invoice.calculate_financials(items, adjustments, is_small_business)
+            result = calculate_invoice(
+                [
+                    (
+                        item["quantity"],
+                        item["unit_price"],
+                        item["discount_value"],
+                        item["discount_unit"],
+                        item["vat_rate"],
+                    )
+                    for item in items
+                ],
+                [(row["type"], row["value"], row["unit"]) for row in adjustments],
+                is_small_business,
+            )
+
+            self.assertEqual(
+                result["items"], [to_cents(item["total_price"]) for item in calculated["items"]]
+            )
+            self.assertEqual(
+                result["adjustments"],
+                [to_cents(row["amount"]) for row in calculated["adjustments"]],
+            )
+            for field in INVOICE_FIELDS:
+                self.assertEqual(result[field], to_cents(calculated[field]), (field, items))
+
+    def test_bulk_recalculation_writes_changed_rows_only(self):
+        invoices = [
+            self.create_invoice(
+                number,
+                [
+                    ("1.50", "40.00", "10.00", "PERCENT", "19.00"),
+                    ("1.00", "12.35", "2.00", "CURRENCY", "7.00"),
+                ],
+                [("DISCOUNT", "5.00", "PERCENT"), ("SURCHARGE", "3.00", "CURRENCY")],
+            )
+            for number in range(1, 6)
+        ]
+        small = self.create_invoice(
+            6, [("2.00", "33.33", "0.00", "PERCENT", "0.00")], is_small_business=True
+        )
+        expected = {invoice.pk: self.expected(invoice) for invoice in [*invoices, small]}
+
+        with CaptureQueriesContext(connection) as context:
+            totals = recalculate_invoices(batch_size=100)
+        # ids, locked invoices, items, adjustments, three bulk updates, end of the ids
+        # ID 조회, 영수증 잠금, 항목, 조정 항목, bulk update 3회, ID 조회 종료
+        self.assertLessEqual(len(context.captured_queries), 10)
+        self.assertEqual(totals, {"invoices": 6, "changed": 6, "items": 11, "adjustments": 10})
+
+        for invoice in Invoice.objects.filter(tutor=self.tutor):
+            result = expected[invoice.pk]
+            for field in INVOICE_FIELDS:
+                self.assertEqual(getattr(invoice, field), result[field])
+            self.assertEqual(
+                [item.total_price for item in invoice.items.order_by("position_number")],
+                result["items"],
+            )
+            self.assertEqual(
+                [row.amount for row in invoice.adjustments.order_by("pk")], result["adjustments"]
+            )
+
+        updated_at = Invoice.objects.get(pk=small.pk).updated_at
+        self.assertEqual(recalculate_invoices(batch_size=2)["changed"], 0)
+        self.assertEqual(Invoice.objects.get(pk=small.pk).updated_at, updated_at)
+
+    def test_command_dry_run_does_not_write(self):
+        draft = self.create_invoice(1, [("1.00", "50.00", "0.00", "PERCENT", "19.00")])
+
+        out = StringIO()
+        call_command("recalculate_invoices", "--dry-run", stdout=out)
+        self.assertIn("Would change 1 invoice(s)", out.getvalue())
+        self.assertEqual(Invoice.objects.get(pk=draft.pk).total_amount, Decimal("1.00"))
+
+        call_command("recalculate_invoices", stdout=StringIO())
+        self.assertEqual(Invoice.objects.get(pk=draft.pk).total_amount, Decimal("59.50"))
+
+    def test_finalized_invoices_are_untouched_unless_included(self):
+        invoice = self.create_invoice(1, [("1.00", "100.00", "0.00", "PERCENT", "19.00")])
+        Invoice.objects.filter(pk=invoice.pk).update(
+            is_finalized=True, archived_pdf_status=Invoice.ArchiveStatusChoices.READY
+        )
+        item = invoice.items.get()
+        updated_at = Invoice.objects.get(pk=invoice.pk).updated_at
+
+        self.assertEqual(recalculate_invoices()["invoices"], 0)
+        call_command("recalculate_invoices", stdout=StringIO())
+        invoice.refresh_from_db()
+        item.refresh_from_db()
+        self.assertEqual(invoice.total_amount, Decimal("1.00"))
+        self.assertEqual(item.total_price, Decimal("0.00"))
+        self.assertEqual(invoice.updated_at, updated_at)
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.READY)
+
+        # Not archived yet: recalculated, and the pending archive renders the new totals
+        # 아직 보관되지 않음: 재계산되며, 대기 중인 보관 PDF가 새 총액으로 렌더링됨
+        Invoice.objects.filter(pk=invoice.pk).update(
+            archived_pdf_status=Invoice.ArchiveStatusChoices.PENDING
+        )
+        call_command("recalculate_invoices", "--include-finalized", stdout=StringIO())
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.total_amount, Decimal("119.00"))
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.PENDING)
+
+    def test_archived_invoices_are_never_recalculated(self):
+        invoice = self.create_invoice(1, [("1.00", "100.00", "0.00", "PERCENT", "19.00")])
+        Invoice.objects.filter(pk=invoice.pk).update(
+            is_finalized=True,
+            archived_pdf="blobs/ab/cd/abcd.pdf",
+            archived_pdf_status=Invoice.ArchiveStatusChoices.READY,
+        )
+
+        totals = recalculate_invoices(include_finalized=True)
+
+        self.assertEqual(totals["invoices"], 0)
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.total_amount, Decimal("1.00"))
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.READY)
+
+
+class InvoiceArchiveTests(APITestCase):
+    """
+    Tests for the archival PDF rendered once after finalization (`archive_invoice_pdfs`).
+
+    확정 후 한 번 렌더링되는 보관용 PDF(`archive_invoice_pdfs`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MEDIA_ACCEL_MODE="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tutor = get_user_model().objects.create_user(
+            username="archive-tutor", email="archive@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.tutor)
+        BusinessProfile.objects.create(
+            tutor=self.tutor, manager_name="Archiv", street="Weg 1", postcode="10115", city="Berlin"
+        )
+        self.student = Student.objects.create(tutor=self.tutor, name="Archiv Kunde")
+
+    def save_invoice(self, endpoint, **fields):
+        response = self.client.post(
+            f"/api/invoices/{endpoint}/",
+            {
+                "student": self.student.id,
+                "recipient_name": "Archiv Kunde",
+                "recipient_address": {"street": "Gasse 2", "zip": "50667", "city": "Koeln"},
+                "invoice_date": "2026-10-01",
+                "due_date": "2026-10-15",
+                "items": [
+                    {
+                        "description": "Unterricht",
+                        "quantity": "1.00",
+                        "unit": "HOUR",
+                        "unit_price": "50.00",
+                        "vat_rate": "19.00",
+                        "total_price": "50.00",
+                    }
+                ],
+                **fields,
+            },
+            format="json",
+        )
+        self.assertIn(response.status_code, (status.HTTP_200_OK, status.HTTP_201_CREATED))
+        return Invoice.objects.get(pk=response.data["id"])
+
+    def download(self, invoice):
+        response = self.client.get(f"/api/invoices/{invoice.pk}/download_pdf/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = (
+            b"".join(response.streaming_content) if response.streaming else response.content
+        )
+        return response, content
+
+    @patch("tutor.views.HTML")
+    def test_finalization_queues_one_archival_render(self, live_html_mock):
+        draft = self.save_invoice("save_draft")
+        self.assertEqual(draft.archived_pdf_status, Invoice.ArchiveStatusChoices.NONE)
+
+        invoice = self.save_invoice("create_full", id=draft.pk)
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.PENDING)
+
+        with patch("weasyprint.HTML") as html_mock:
+            html_mock.return_value.write_pdf.return_value = b"%PDF-1.4 archiviert"
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+        html_mock.return_value.write_pdf.assert_called_once_with(pdf_variant="pdf/a-3b")
+
+        invoice.refresh_from_db()
+        checksum = hashlib.sha256(b"%PDF-1.4 archiviert").hexdigest()
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.READY)
+        self.assertEqual(invoice.archived_pdf_sha256, checksum)
+
+        response, content = self.download(invoice)
+        self.assertEqual(content, b"%PDF-1.4 archiviert")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["ETag"], f'"{checksum}"')
+        self.assertIn(invoice.full_invoice_code, response["Content-Disposition"])
+        live_html_mock.assert_not_called()
+
+    @patch("tutor.views.HTML")
+    def test_failed_archive_falls_back_to_live_render(self, live_html_mock):
+        live_html_mock.return_value.write_pdf.return_value = b"%PDF-1.4 live"
+        invoice = self.save_invoice("create_full")
+
+        with patch("weasyprint.HTML", side_effect=RuntimeError("Schrift fehlt")):
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.FAILED)
+        self.assertEqual(self.download(invoice)[1], b"%PDF-1.4 live")
+
+        with patch("weasyprint.HTML") as html_mock:
+            html_mock.return_value.write_pdf.return_value = b"%PDF-1.4 archiviert"
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+            invoice.refresh_from_db()
+            self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.FAILED)
+
+            call_command("archive_invoice_pdfs", "--retry-failed", stdout=StringIO())
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.READY)
+        self.assertEqual(self.download(invoice)[1], b"%PDF-1.4 archiviert")
+
+    def test_issued_archive_is_never_replaced(self):
+        invoice = self.save_invoice("create_full")
+        with patch("weasyprint.HTML") as html_mock:
+            html_mock.return_value.write_pdf.return_value = b"%PDF-1.4 archiviert"
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+        invoice.refresh_from_db()
+        issued = invoice.archived_pdf.name
+
+        Invoice.objects.filter(pk=invoice.pk).update(
+            archived_pdf_status=Invoice.ArchiveStatusChoices.PENDING
+        )
+        with patch("weasyprint.HTML") as html_mock, self.assertLogs(
+            "tutor.invoice_archive", level="WARNING"
+        ):
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+        html_mock.assert_not_called()
+
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.archived_pdf.name, issued)
+        self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.READY)
+        self.assertEqual(self.download(invoice)[1], b"%PDF-1.4 archiviert")
+
+    def test_purge_releases_archived_pdf(self):
+        invoice = self.save_invoice("create_full")
+        with patch("weasyprint.HTML") as html_mock:
+            html_mock.return_value.write_pdf.return_value = b"%PDF-1.4 archiviert"
+            call_command("archive_invoice_pdfs", stdout=StringIO())
+        invoice.refresh_from_db()
+        path = invoice.archived_pdf.path
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_tutor(self.tutor)
+
+        self.assertFalse(StoredBlob.objects.filter(name=invoice.archived_pdf.name).exists())
+        self.assertFalse(os.path.exists(path))
+
+
+class InvoiceBulkStatusTests(APITestCase):
+    """
+    Tests for the bulk status endpoint (`/api/invoices/bulk/`).
+
+    일괄 상태 변경 엔드포인트(`/api/invoices/bulk/`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="bulk-tutor", email="bulk@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.tutor)
+        self.other = get_user_model().objects.create_user(
+            username="bulk-other", email="bulk-other@example.com", password="password123"
+        )
+
+    def create_invoice(self, number, tutor=None, **fields):
+        return Invoice.objects.create(
+            tutor=tutor or self.tutor,
+            invoice_number=number,
+            full_invoice_code=f"RE-BULK-{number}",
+            due_date=date(2026, 10, 31),
+            recipient_name="Sammel",
+            is_finalized=fields.pop("is_finalized", True),
+            **fields,
+        )
+
+    def bulk(self, payload):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post("/api/invoices/bulk/", payload, format="json")
+        return response, len(context.captured_queries)
+
+    def test_marks_owned_finalized_invoices_with_per_id_results(self):
+        first = self.create_invoice(1)
+        paid = self.create_invoice(2, is_paid=True)
+        draft = self.create_invoice(3, is_finalized=False)
+        foreign = self.create_invoice(4, tutor=self.other)
+        updated_at = paid.updated_at
+
+        response, _queries = self.bulk(
+            {"ids": [first.pk, paid.pk, draft.pk, foreign.pk, 9999, first.pk], "is_paid": True}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(
+            [(row["id"], row["status"]) for row in response.data["results"]],
+            [
+                (first.pk, "updated"),
+                (paid.pk, "unchanged"),
+                (draft.pk, "error"),
+                (foreign.pk, "error"),
+                (9999, "error"),
+            ],
+        )
+        self.assertTrue(Invoice.objects.get(pk=first.pk).is_paid)
+        self.assertEqual(Invoice.objects.get(pk=paid.pk).updated_at, updated_at)
+        self.assertFalse(Invoice.objects.get(pk=draft.pk).is_paid)
+        self.assertFalse(Invoice.objects.get(pk=foreign.pk).is_paid)
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        few = [self.create_invoice(number).pk for number in range(1, 4)]
+        many = [self.create_invoice(number).pk for number in range(4, 44)]
+
+        response, few_queries = self.bulk({"ids": few, "is_paid": True, "is_sent": True})
+        self.assertEqual(response.data["updated"], 3)
+        response, many_queries = self.bulk({"ids": many, "is_paid": True, "is_sent": True})
+        self.assertEqual(response.data["updated"], 40)
+
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(
+            Invoice.objects.filter(tutor=self.tutor, is_paid=True, is_sent=True).count(), 43
+        )
+
+    def test_finalizes_drafts_and_queues_their_archive(self):
+        drafts = [self.create_invoice(number, is_finalized=False) for number in (1, 2)]
+        for draft in drafts:
+            InvoiceItem.objects.create(
+                invoice=draft,
+                description="Unterricht",
+                quantity=Decimal("2.00"),
+                unit_price=Decimal("40.00"),
+                vat_rate=Decimal("19.00"),
+                total_price=Decimal("0.00"),
+            )
+        finalized = self.create_invoice(3)
+        ids = [draft.pk for draft in drafts] + [finalized.pk]
+
+        response, _queries = self.bulk({"ids": ids, "is_finalized": True, "is_sent": True})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Invoice.objects.filter(pk=drafts[0].pk, is_finalized=True).exists())
+
+        BusinessProfile.objects.create(
+            tutor=self.tutor, manager_name="Sammel", street="Weg 1", postcode="10115", city="Berlin"
+        )
+        response, _queries = self.bulk({"ids": ids, "is_finalized": True, "is_sent": True})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["updated"], 3)
+        for draft in drafts:
+            invoice = Invoice.objects.get(pk=draft.pk)
+            self.assertTrue(invoice.is_finalized)
+            self.assertTrue(invoice.is_sent)
+            self.assertEqual(invoice.total_amount, Decimal("95.20"))
+            self.assertEqual(invoice.sender_data["manager_name"], "Sammel")
+            self.assertEqual(invoice.archived_pdf_status, Invoice.ArchiveStatusChoices.PENDING)
+
+    def test_requires_a_status(self):
+        invoice = self.create_invoice(1)
+
+        response, _queries = self.bulk({"ids": [invoice.pk]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response, _queries = self.bulk({"ids": [], "is_paid": True})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response, _queries = self.bulk({"ids": [invoice.pk], "is_finalized": False})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LessonBulkTests(APITestCase):
+    """
+    Tests for the lesson batch endpoint (`/api/lessons/bulk/`).
+
+    수업 일괄 변경 엔드포인트(`/api/lessons/bulk/`)에 대한 테스트입니다.
+    """
+
+    def setUp(self):
+        self.tutor = get_user_model().objects.create_user(
+            username="lesson-bulk", email="lesson-bulk@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.tutor)
+        self.student = Student.objects.create(tutor=self.tutor, name="Ferien Schüler")
+
+    def create_lesson(self, day, start, end, student=None, **fields):
+        return Lesson.objects.create(
+            student=student or self.student,
+            date=date(2026, 1, day),
+            start_time=time(*start),
+            end_time=time(*end),
+            **fields,
+        )
+
+    def bulk(self, payload):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post("/api/lessons/bulk/", payload, format="json")
+        return response, len(context.captured_queries)
+
+    def test_cancel_many_lessons(self):
+        lessons = [self.create_lesson(day, (10, 0), (11, 0)) for day in range(2, 12)]
+        foreign_student = Student.objects.create(
+            tutor=get_user_model().objects.create_user(
+                username="lesson-bulk-other", email="lbo@example.com", password="password123"
+            ),
+            name="Fremd",
+        )
+        foreign = self.create_lesson(2, (10, 0), (11, 0), student=foreign_student)
+
+        response, _queries = self.bulk({"ids": [foreign.pk], "status": "CANCELLED"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["results"][0]["status"], "error")
+
+        response, few_queries = self.bulk(
+            {"ids": [lesson.pk for lesson in lessons[:2]], "status": "CANCELLED"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        response, many_queries = self.bulk(
+            {"ids": [lesson.pk for lesson in lessons], "status": "CANCELLED"}
+        )
+        self.assertEqual(response.data["updated"], 8)
+        self.assertEqual(
+            [row["status"] for row in response.data["results"]][:3],
+            ["unchanged", "unchanged", "updated"],
+        )
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(Lesson.objects.filter(status="CANCELLED").count(), 10)
+        self.assertEqual(Lesson.objects.get(pk=foreign.pk).status, "SCHEDULED")
+
+    def test_shift_validates_overlaps_across_the_batch(self):
+        monday = self.create_lesson(5, (9, 0), (10, 0))
+        tuesday = self.create_lesson(6, (9, 0), (10, 0))
+        # Occupies the new slot of `tuesday`; cancelled lessons do not block
+        # `tuesday`의 새 시간대를 차지함; 취소된 수업은 막지 않음
+        blocker = self.create_lesson(7, (9, 30), (10, 30))
+        self.create_lesson(6, (9, 0), (10, 0), status="CANCELLED")
+
+        response, _queries = self.bulk({"ids": [monday.pk, tuesday.pk], "shift_days": 1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [row["status"] for row in response.data["results"]], ["updated", "error"]
+        )
+        self.assertIn("09:30", response.data["results"][1]["detail"])
+        self.assertEqual(Lesson.objects.get(pk=monday.pk).date, date(2026, 1, 5))
+
+        # Moving the blocker along frees the slot: lessons in the batch see each other's new times
+        # 방해 수업도 함께 이동하면 시간대가 비워짐: 배치 안의 수업은 서로의 새 시간을 기준으로 검증됨
+        response, _queries = self.bulk(
+            {"ids": [monday.pk, tuesday.pk, blocker.pk], "shift_days": 1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            sorted(Lesson.objects.filter(status="SCHEDULED").values_list("date", flat=True)),
+            [date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 8)],
+        )
+
+    def test_shift_time_and_reject_midnight_and_reactivation_conflicts(self):
+        evening = self.create_lesson(5, (22, 30), (23, 30))
+        morning = self.create_lesson(5, (8, 0), (9, 0))
+
+        response, _queries = self.bulk({"ids": [evening.pk], "shift_minutes": 45})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response, _queries = self.bulk({"ids": [morning.pk], "shift_minutes": 90})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        morning.refresh_from_db()
+        self.assertEqual((morning.start_time, morning.end_time), (time(9, 30), time(10, 30)))
+
+        cancelled = self.create_lesson(5, (10, 0), (11, 0), status="CANCELLED")
+        response, _queries = self.bulk({"ids": [cancelled.pk], "status": "SCHEDULED"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response, _queries = self.bulk({"ids": [cancelled.pk]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_many_lessons_with_per_id_results(self):
+        lessons = [self.create_lesson(day, (10, 0), (11, 0)) for day in range(2, 6)]
+        foreign_student = Student.objects.create(
+            tutor=get_user_model().objects.create_user(
+                username="lesson-delete-other", email="ldo@example.com", password="password123"
+            ),
+            name="Fremd",
+        )
+        foreign = self.create_lesson(2, (10, 0), (11, 0), student=foreign_student)
+
+        response, _queries = self.bulk(
+            {"ids": [lessons[0].pk], "delete": True, "status": "CANCELLED"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response, few_queries = self.bulk({"ids": [lessons[0].pk], "delete": True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        response, many_queries = self.bulk(
+            {"ids": [lesson.pk for lesson in lessons[1:]] + [foreign.pk], "delete": True}
+        )
+        self.assertEqual(response.data["deleted"], 3)
+        self.assertEqual(
+            [row["status"] for row in response.data["results"]],
+            ["deleted", "deleted", "deleted", "error"],
+        )
+        self.assertEqual(few_queries, many_queries)
+        self.assertFalse(Lesson.objects.filter(student=self.student).exists())
+        self.assertTrue(Lesson.objects.filter(pk=foreign.pk).exists())
@@ -0,0 +1,147 @@
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import ExamAttachment
+from .storage import thumbnail_name
+
+
+logger = logging.getLogger("tutor.thumbnails")
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"}
+PDF_EXTENSIONS = {".pdf"}
+THUMBNAIL_QUALITY = 80
+
+Status = ExamAttachment.ThumbnailStatusChoices
+
+
+def _supported_extensions():
+    """
+    PDF previews need pypdfium2; without it only images are thumbnailed.
+
+    PDF 미리보기에는 pypdfium2가 필요하며, 없으면 이미지만 썸네일을 생성합니다.
+    """
+    try:
+        import pypdfium2  # noqa: F401
+    except ImportError:
+        return IMAGE_EXTENSIONS
+    return IMAGE_EXTENSIONS | PDF_EXTENSIONS
+
+
+def _open_pdf_first_page(fh, size):
+    """
+    Rasterize the first page of a PDF at roughly the target size.
+
+    PDF의 첫 페이지를 목표 크기에 가깝게 래스터화합니다.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(fh)
+    try:
+        page = pdf[0]
+        width, height = page.get_size()
+        # Render at twice the target size so the final downscale stays sharp
+        # 최종 축소 시 선명도를 유지하도록 목표 크기의 두 배로 렌더링
+        scale = (2 * size) / max(width, height, 1)
+        return page.render(scale=scale).to_pil()
+    finally:
+        pdf.close()
+
+
+def render_thumbnail(fh, extension, size):
+    """
+    Render a JPEG thumbnail (longest side `size` px) from an image or PDF file.
+
+    이미지 또는 PDF 파일로부터 JPEG 썸네일(긴 변 `size` px)을 생성합니다.
+    """
+    if extension in PDF_EXTENSIONS:
+        image = _open_pdf_first_page(fh, size)
+    else:
+        image = Image.open(fh)
+        # Let the JPEG decoder downscale while decoding (much faster for large scans)
+        # JPEG 디코더가 디코딩 단계에서 축소하도록 함 (대용량 스캔본에서 훨씬 빠름)
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+
+    image.thumbnail((size, size))
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def generate_thumbnail(attachment, size=None):
+    """
+    Create (or reuse) the cached thumbnail of an attachment and record its status.
+    Attachments sharing a blob share the thumbnail stored next to it.
+
+    첨부파일의 캐시 썸네일을 생성(또는 재사용)하고 상태를 기록합니다.
+    같은 블롭을 공유하는 첨부파일은 그 옆에 저장된 썸네일도 공유합니다.
+    """
+    size = size or settings.ATTACHMENT_THUMBNAIL_SIZE
+    name = attachment.file.name
+    extension = os.path.splitext(name or "")[1].lower()
+
+    if not name or extension not in _supported_extensions():
+        status, thumbnail = Status.UNSUPPORTED, ""
+    else:
+        storage = attachment.file.storage
+        thumbnail = thumbnail_name(name)
+        try:
+            if not storage.exists(thumbnail):
+                with storage.open(name, "rb") as fh:
+                    data = render_thumbnail(fh, extension, size)
+                storage.save_derived(thumbnail, ContentFile(data))
+            status = Status.READY
+        except Exception:
+            logger.exception("Thumbnail generation failed for attachment %s", attachment.pk)
+            status, thumbnail = Status.FAILED, ""
+
+    # Queryset update skips the save signals; `updated_at` is bumped by hand (with the
+    # exam record's) so conditional GETs return the new thumbnail
+    # QuerySet update로 저장 시그널을 건너뛰고, 조건부 GET이 새 썸네일을 반환하도록
+    # `updated_at`(시험 기록 포함)은 직접 갱신함
+    updated = ExamAttachment.objects.filter(pk=attachment.pk, file=name).update(
+        thumbnail=thumbnail, thumbnail_status=status, updated_at=timezone.now()
+    )
+    if updated:
+        attachment.touch_parent_row()
+    attachment.thumbnail.name = thumbnail
+    attachment.thumbnail_status = status
+    return status
+
+
+def generate_pending_thumbnails(limit=None, retry_failed=False, chunk_size=100):
+    """
+    Generate thumbnails for all attachments waiting for one.
+    Returns a dict with the number of attachments per resulting status.
+
+    썸네일 생성을 기다리는 모든 첨부파일에 대해 썸네일을 생성합니다.
+    결과 상태별 첨부파일 수를 담은 dict를 반환합니다.
+    """
+    statuses = [Status.PENDING]
+    if retry_failed:
+        statuses.append(Status.FAILED)
+
+    queryset = ExamAttachment.objects.filter(thumbnail_status__in=statuses).order_by("pk")
+    if limit:
+        queryset = queryset[:limit]
+
+    results = {}
+    for attachment in queryset.iterator(chunk_size=chunk_size):
+        status = generate_thumbnail(attachment)
+        results[status] = results.get(status, 0) + 1
+    return results
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import shutil
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .models import AttachmentUpload, ExamAttachment
+
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """
+    Raised when a chunk or completion request cannot be applied.
+    Carries the current offset so the client can resume from there.
+
+    청크 또는 완료 요청을 적용할 수 없을 때 발생합니다.
+    클라이언트가 이어서 업로드할 수 있도록 현재 오프셋을 함께 전달합니다.
+    """
+
+    MESSAGES = {
+        "offset_mismatch": _("Upload-Offset stimmt nicht überein."),
+        "size_exceeded": _("Der Datenblock überschreitet die angegebene Dateigröße."),
+        "concurrent_upload": _("Für diesen Upload läuft bereits eine andere Übertragung."),
+        "interrupted": _("Die Übertragung wurde unterbrochen."),
+        "incomplete": _("Der Upload ist noch nicht vollständig."),
+        "checksum_mismatch": _("Prüfsumme stimmt nicht überein."),
+    }
+
+    def __init__(self, code, offset):
+        super().__init__(code)
+        self.code = code
+        self.offset = offset
+
+    @property
+    def message(self):
+        return self.MESSAGES[self.code]
+
+
+def lock_upload(upload):
+    """
+    Lock the upload row (`SELECT ... FOR UPDATE NOWAIT`) inside the current transaction
+    and refresh its offset. Another request holding the lock, or a session completed in
+    the meantime, is reported as a concurrent upload.
+
+    현재 트랜잭션 안에서 업로드 행을 잠그고(`SELECT ... FOR UPDATE NOWAIT`) 오프셋을
+    갱신합니다. 다른 요청이 잠금을 보유하고 있거나 그 사이 세션이 완료된 경우
+    동시 업로드로 보고합니다.
+    """
+    try:
+        upload.received_size = (
+            AttachmentUpload.objects.select_for_update(nowait=True)
+            .values_list("received_size", flat=True)
+            .get(pk=upload.pk)
+        )
+    except (AttachmentUpload.DoesNotExist, DatabaseError):
+        raise UploadError("concurrent_upload", upload.received_size)
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Append one chunk to the staging file of an upload session.
+    The chunk is first copied from the request stream in small blocks into a file of
+    its own, without any transaction or lock, so a slow client never holds a database
+    connection. The upload row is then locked only to verify the offset, append the
+    received bytes to the staging file and advance the offset; a concurrent request
+    for the same upload is rejected there without touching the staging file.
+    If the connection drops mid-chunk, the bytes already received are kept and the
+    session offset reflects them, so the client can resume from the reported offset.
+    Returns the new offset.
+
+    업로드 세션의 임시 파일에 청크 하나를 이어 붙입니다.
+    청크는 먼저 트랜잭션이나 잠금 없이 요청 스트림에서 작은 블록 단위로 별도 파일에
+    복사되므로, 느린 클라이언트가 DB 연결을 점유하지 않습니다. 이후 오프셋 확인,
+    수신한 바이트를 임시 파일에 추가, 오프셋 증가 동안에만 업로드 행을 잠그며,
+    같은 업로드에 대한 동시 요청은 이 단계에서 임시 파일을 건드리지 않고 거부됩니다.
+    청크 도중 연결이 끊기면 이미 수신한 바이트는 유지되고 세션 오프셋에 반영되므로,
+    클라이언트는 보고된 오프셋부터 이어서 업로드할 수 있습니다. 새 오프셋을 반환합니다.
+    """
+    # Cheap early check so a stale request does not upload its body first
+    # 오래된 요청이 본문을 먼저 업로드하지 않도록 하는 간단한 사전 확인
+    upload.refresh_from_db(fields=["received_size"])
+    if offset != upload.received_size:
+        raise UploadError("offset_mismatch", upload.received_size)
+    if offset + length > upload.total_size:
+        raise UploadError("size_exceeded", upload.received_size)
+
+    path = upload.staging_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chunk_path = path.with_name(f"{upload.pk}.{uuid.uuid4().hex}.chunk")
+
+    try:
+        written = 0
+        interrupted = False
+        with open(chunk_path, "wb") as fh:
+            try:
+                while written < length:
+                    block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                    if not block:
+                        interrupted = True
+                        break
+                    fh.write(block)
+                    written += len(block)
+            except OSError:
+                interrupted = True
+
+        with transaction.atomic():
+            lock_upload(upload)
+            if offset != upload.received_size:
+                raise UploadError("offset_mismatch", upload.received_size)
+
+            with open(path, "r+b" if path.exists() else "w+b") as fh, open(chunk_path, "rb") as chunk:
+                # Drop bytes beyond the confirmed offset (e.g. from a crashed request)
+                # 확인된 오프셋 이후의 바이트 제거 (예: 비정상 종료된 요청의 잔여 데이터)
+                fh.truncate(offset)
+                fh.seek(offset)
+                shutil.copyfileobj(chunk, fh, READ_BLOCK_SIZE)
+
+            new_offset = offset + written
+            AttachmentUpload.objects.filter(pk=upload.pk).update(
+                received_size=new_offset, updated_at=timezone.now()
+            )
+    finally:
+        discard_staging_file(chunk_path)
+
+    # Raised after the commit, so the bytes received before the interruption are kept
+    # 커밋 이후에 발생시켜 중단 전까지 수신한 바이트가 유지되도록 함
+    upload.received_size = new_offset
+    if interrupted:
+        raise UploadError("interrupted", new_offset)
+    return new_offset
+
+
+def complete_upload(upload, sha256=None):
+    """
+    Assemble the uploaded file into storage and create the ExamAttachment.
+    The upload row is locked for the whole completion, so a second concurrent
+    completion is rejected as a concurrent upload instead of racing on the staging file.
+    The staging file is streamed into the storage backend and removed afterwards.
+
+    업로드된 파일을 스토리지로 옮기고 ExamAttachment를 생성합니다.
+    완료 처리 동안 업로드 행을 잠그므로, 동시에 들어온 두 번째 완료 요청은 임시 파일을
+    두고 경합하지 않고 동시 업로드로 거부됩니다.
+    임시 파일은 스토리지 백엔드로 스트리밍된 후 삭제됩니다.
+    """
+    path = upload.staging_path
+
+    with transaction.atomic():
+        lock_upload(upload)
+        if upload.received_size != upload.total_size:
+            raise UploadError("incomplete", upload.received_size)
+
+        try:
+            if sha256:
+                digest = hashlib.sha256()
+                with open(path, "rb") as fh:
+                    for block in iter(lambda: fh.read(READ_BLOCK_SIZE), b""):
+                        digest.update(block)
+                if digest.hexdigest() != sha256.lower():
+                    raise UploadError("checksum_mismatch", upload.received_size)
+
+            attachment = ExamAttachment(
+                exam_record=upload.exam_record, original_name=upload.original_name
+            )
+            with open(path, "rb") as fh:
+                attachment.file.save(upload.original_name, File(fh), save=True)
+        except FileNotFoundError:
+            # Databases without row locks (SQLite): another completion removed the file
+            # 행 잠금이 없는 DB(SQLite): 다른 완료 요청이 파일을 삭제함
+            raise UploadError("concurrent_upload", upload.received_size)
+        upload.delete()
+
+    discard_staging_file(path)
+    return attachment
+
+
+def discard_staging_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def discard_uploads(queryset):
+    """
+    Delete upload sessions together with their staging files.
+    Returns the number of removed sessions.
+
+    업로드 세션을 임시 파일과 함께 삭제합니다.
+    삭제된 세션 수를 반환합니다.
+    """
+    removed = 0
+    for upload in queryset.iterator():
+        discard_staging_file(upload.staging_path)
+        upload.delete()
+        removed += 1
+    return removed
+
+
+def purge_stale_uploads(now=None):
+    """
+    Delete unfinished upload sessions older than CHUNKED_UPLOAD_EXPIRY_HOURS.
+    Returns the number of removed sessions.
+
+    CHUNKED_UPLOAD_EXPIRY_HOURS보다 오래된 미완료 업로드 세션을 삭제합니다.
+    삭제된 세션 수를 반환합니다.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+
+    return discard_uploads(AttachmentUpload.objects.filter(updated_at__lt=cutoff))
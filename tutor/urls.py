@@ -12,6 +12,8 @@ from .views import (
     OfficialExamResultViewSet,
     LessonViewSet,
     DashboardStatsView,
+    SearchView,
+    RevenueAnalyticsView,
     TodoViewSet,
     CustomRegisterView,
     CustomVerifyEmailView,
@@ -20,6 +22,7 @@ from .views import (
     social_login_callback,
     BusinessProfileDetailView,
     InvoiceViewSet,
+    DataExportViewSet,
 )
 
 # Initialize DefaultRouter to automatically generate URLs for ViewSets
@@ -73,6 +76,10 @@ router.register(r"todos", TodoViewSet, basename="todo")
 # /api/invoices/ -> 영수증 CRUD 작업
 router.register(r"invoices", InvoiceViewSet, basename="invoice")
 
+# /api/exports/ -> Full data export (GDPR) jobs
+# /api/exports/ -> 전체 데이터 내보내기(GDPR) 작업
+router.register(r"exports", DataExportViewSet, basename="export")
+
 urlpatterns = [
     # Include all router-generated URLs
     # 라우터가 생성한 모든 URL을 포함합니다
@@ -106,6 +113,14 @@ urlpatterns = [
     # 시험 통계 엔드포인트
     path("exams/stats/", ExamStatsView.as_view(), name="exam-stats"),
     
+    # Unified Search Endpoint
+    # 통합 검색 엔드포인트
+    path("search/", SearchView.as_view(), name="search"),
+    
+    # Revenue Analytics Endpoint
+    # 매출 분석 엔드포인트
+    path("analytics/revenue/", RevenueAnalyticsView.as_view(), name="analytics-revenue"),
+    
     # social login callback endpoint
     # 소셜 로그인 콜백 엔드포인트
     path("social/callback/", social_login_callback, name="social_callback"),
@@ -1,19 +1,17 @@
-import json
+import os
 from datetime import date, datetime, timedelta
-from decimal import Decimal
 
 from django.utils.translation import gettext_lazy as _
-from django.shortcuts import redirect
+from django.shortcuts import redirect, get_object_or_404
 from django.conf import settings
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum, Count, Avg, Q
+from django.db.models import Sum, Count, Avg, Q, Prefetch
 from django.db.models.functions import TruncMonth
 from django.db import transaction
-from django.template.loader import render_to_string
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse, Http404, StreamingHttpResponse
 
-from rest_framework import viewsets, permissions, filters, status
+from rest_framework import viewsets, mixins, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -38,6 +36,7 @@ from .models import (
     ExamStandard,
     ExamRecord,
     ExamAttachment,
+    AttachmentUpload,
     ExamDetailResult,
     ExamScoreInput,
     OfficialExamResult,
@@ -45,6 +44,8 @@ from .models import (
     Todo,
     BusinessProfile,
     Invoice,
+    DataExport,
+    StoredBlob,
 )
 
 from .serializers import (
@@ -53,18 +54,48 @@ from .serializers import (
     ExamStandardSerializer,
     ExamRecordSerializer,
     ExamAttachmentSerializer,
+    AttachmentUploadSerializer,
     ExamDetailResultSerializer,
     ExamScoreInputSerializer,
     OfficialExamResultSerializer,
     LessonSerializer,
+    LessonBulkSerializer,
     TodoSerializer,
     BusinessProfileSerializer,
     InvoiceSerializer,
     InvoiceTemplateCandidateSerializer,
+    BillingRunSerializer,
+    InvoiceBulkStatusSerializer,
+    AccountingExportSerializer,
+    RevenueAnalyticsSerializer,
+    DataExportSerializer,
+)
+from .authentication import invalidate_cached_tutor
+from .uploads import UploadError, append_chunk, complete_upload
+from .exports import expire_stale_exports
+from .media import find_owned_file, media_response
+from .fieldsets import SparseFieldsetViewMixin
+from .conditional import ConditionalGetMixin
+from .search import SEARCH_DOCUMENTS, search
+from .billing import run_billing
+from .accounting import export_invoices, stream_datev_csv
+from .analytics import revenue_report
+from .scheduling import bulk_change_lessons, bulk_delete_lessons
+from .invoice_rendering import (
+    UNIT_LABELS,
+    build_invoice_context,
+    cached_preview,
+    format_date_de,
+    format_de,
+    infer_salutation,
+    invoice_pdf_filename,
+    normalize_recipient_address,
+    render_invoice_html,
+    sanitize_rich_text,
 )
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Student data.
     학생 데이터 관리를 위한 ViewSet입니다.
@@ -107,7 +138,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         serializer.save(tutor=self.request.user)
 
 
-class CourseRegistrationViewSet(viewsets.ModelViewSet):
+class CourseRegistrationViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Course Registrations.
     수강 등록 관리를 위한 ViewSet입니다.
@@ -116,6 +147,10 @@ class CourseRegistrationViewSet(viewsets.ModelViewSet):
     serializer_class = CourseRegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "student__updated_at")
+
     # Allow filtering by payment status and student
     # 'student' filter added to retrieve history for a specific student
     # 납부 상태 및 특정 학생에 따른 필터링을 허용
@@ -155,7 +190,7 @@ class ExamStandardViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ExamRecordViewSet(viewsets.ModelViewSet):
+class ExamRecordViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Exam Records.
     시험 기록 관리를 위한 ViewSet입니다.
@@ -164,6 +199,10 @@ class ExamRecordViewSet(viewsets.ModelViewSet):
     serializer_class = ExamRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "student__updated_at", "exam_standard__updated_at")
+
     filter_backends = [DjangoFilterBackend]
 
     # Define detailed filtering options including date components (year, month)
@@ -192,17 +231,25 @@ class ExamRecordViewSet(viewsets.ModelViewSet):
             .select_related("student", "exam_standard")
             
             # Optimize Many-to-Many or Reverse Foreign Keys (1:N): Uses separate queries
+            # Nested results read 'exam_section' fields, so the section is joined into the prefetch
             # 다대다 또는 역방향 외래 키 최적화 (1:N 관계): 별도의 쿼리를 사용합니다
+            # 중첩 결과는 'exam_section' 필드를 읽으므로 prefetch 쿼리에 섹션을 JOIN 합니다
             .prefetch_related(
                 "attachments",
-                "score_inputs",
-                "detail_results",
+                Prefetch(
+                    "score_inputs",
+                    queryset=ExamScoreInput.objects.select_related("exam_section"),
+                ),
+                Prefetch(
+                    "detail_results",
+                    queryset=ExamDetailResult.objects.select_related("exam_section"),
+                ),
                 "exam_standard__modules",
             )
         )
 
 
-class ExamAttachmentViewSet(viewsets.ModelViewSet):
+class ExamAttachmentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Exam Attachments.
     시험 첨부 파일 관리를 위한 ViewSet입니다.
@@ -223,8 +270,157 @@ class ExamAttachmentViewSet(viewsets.ModelViewSet):
             exam_record__student__tutor=self.request.user
         )
 
+    @action(detail=False, methods=["post"])
+    def from_hash(self, request):
+        """
+        Attach an already stored file by its SHA-256 hash without uploading it again.
+        Only files the tutor has uploaded before can be reused.
+        Returns 404 if the content is unknown, so the client falls back to a normal upload.
+
+        이미 저장된 파일을 SHA-256 해시로 다시 업로드하지 않고 첨부합니다.
+        튜터가 이전에 업로드한 파일만 재사용할 수 있습니다.
+        알 수 없는 내용이면 404를 반환하며, 클라이언트는 일반 업로드로 진행합니다.
+        """
+        user = request.user
+        record = get_object_or_404(
+            ExamRecord, pk=request.data.get("exam_record"), student__tutor=user
+        )
+        digest = str(request.data.get("sha256", "")).lower()
+        blob = StoredBlob.objects.filter(sha256=digest).first()
+
+        known = blob is not None and ExamAttachment.objects.filter(
+            exam_record__student__tutor=user, file=blob.name
+        ).exists()
+        if not known:
+            return Response(
+                {"detail": _("Datei ist nicht bekannt. Bitte laden Sie die Datei hoch.")},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        storage = ExamAttachment._meta.get_field("file").storage
+        with transaction.atomic():
+            storage.retain(blob.name)
+            attachment = ExamAttachment.objects.create(
+                exam_record=record,
+                file=blob.name,
+                original_name=request.data.get("original_name") or os.path.basename(blob.name),
+            )
+
+        serializer = self.get_serializer(attachment)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    # --- Resumable chunked upload (init / append / complete) ---
+    # --- 이어받기 가능한 청크 업로드 (시작 / 추가 / 완료) ---
+
+    def _get_upload(self, upload_id):
+        return get_object_or_404(
+            AttachmentUpload.objects.select_related("exam_record"),
+            pk=upload_id,
+            tutor=self.request.user,
+        )
+
+    def _upload_error_response(self, error, status_code=status.HTTP_409_CONFLICT):
+        response = Response(
+            {"detail": error.message, "code": error.code, "offset": error.offset},
+            status=status_code,
+        )
+        response["Upload-Offset"] = str(error.offset)
+        return response
+
+    @action(detail=False, methods=["post"], url_path="uploads")
+    def upload_init(self, request):
+        """
+        Start a chunked upload session.
+        Body: exam_record, original_name, total_size. Returns the session id and offset 0.
+
+        청크 업로드 세션을 시작합니다.
+        요청 본문: exam_record, original_name, total_size. 세션 ID와 오프셋 0을 반환합니다.
+        """
+        serializer = AttachmentUploadSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save(tutor=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=False,
+        methods=["get", "put"],
+        url_path=r"uploads/(?P<upload_id>[0-9a-f-]+)",
+    )
+    def upload_chunk(self, request, upload_id=None):
+        """
+        GET: Return the current offset to resume an interrupted upload.
+        PUT: Append the raw request body at the offset given in the Upload-Offset header.
+        The body is streamed to disk and never parsed into memory.
+
+        GET: 중단된 업로드를 이어가기 위한 현재 오프셋을 반환합니다.
+        PUT: Upload-Offset 헤더의 오프셋 위치에 요청 본문(raw)을 이어 붙입니다.
+        본문은 메모리로 파싱하지 않고 디스크로 바로 스트리밍됩니다.
+        """
+        upload = self._get_upload(upload_id)
+
+        if request.method == "GET":
+            response = Response(AttachmentUploadSerializer(upload).data)
+            response["Upload-Offset"] = str(upload.received_size)
+            return response
+
+        try:
+            offset = int(request.META.get("HTTP_UPLOAD_OFFSET", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return Response(
+                {"detail": _("Upload-Offset-Header fehlt oder ist ungültig.")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if length <= 0:
+            return Response(
+                {"detail": _("Der Datenblock ist leer.")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+            return Response(
+                {"detail": _("Der Datenblock ist zu groß.")},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        try:
+            new_offset = append_chunk(upload, offset, request.stream, length)
+        except UploadError as error:
+            return self._upload_error_response(error)
 
-class OfficialExamResultViewSet(viewsets.ModelViewSet):
+        response = Response({"id": upload.pk, "offset": new_offset})
+        response["Upload-Offset"] = str(new_offset)
+        return response
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path=r"uploads/(?P<upload_id>[0-9a-f-]+)/complete",
+    )
+    def upload_complete(self, request, upload_id=None):
+        """
+        Finish the upload: assemble the file in storage and create the ExamAttachment.
+        An optional `sha256` in the body is verified before the attachment is created.
+
+        업로드를 완료합니다: 파일을 스토리지에 저장하고 ExamAttachment를 생성합니다.
+        요청 본문에 `sha256`이 있으면 첨부파일 생성 전에 검증합니다.
+        """
+        upload = self._get_upload(upload_id)
+
+        try:
+            attachment = complete_upload(upload, sha256=request.data.get("sha256"))
+        except UploadError as error:
+            if error.code == "checksum_mismatch":
+                return self._upload_error_response(error, status.HTTP_400_BAD_REQUEST)
+            return self._upload_error_response(error)
+
+        serializer = self.get_serializer(attachment)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class OfficialExamResultViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Official Exam Results.
     Allows CRUD operations for certification exam records.
@@ -236,6 +432,10 @@ class OfficialExamResultViewSet(viewsets.ModelViewSet):
     serializer_class = OfficialExamResultSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "student__updated_at", "exam_standard__updated_at")
+
     # Added 'exam_mode' to allow filtering by exam type (Full/Written/Oral)
     # Crucial for analyzing partial pass statuses
     # 시험 유형(전체/필기/구술)별 필터링을 위해 'exam_mode' 추가
@@ -269,7 +469,7 @@ class OfficialExamResultViewSet(viewsets.ModelViewSet):
         )
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Lessons.
     Supports filtering by date range for calendar views.
@@ -281,6 +481,10 @@ class LessonViewSet(viewsets.ModelViewSet):
     serializer_class = LessonSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "student__updated_at")
+
     def get_queryset(self):
         """
         Retrieve lessons for the tutor's students.
@@ -324,6 +528,48 @@ class LessonViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Batch endpoint: set the status and/or shift the date/time of many lessons,
+        or delete them.
+        URL: /api/lessons/bulk/ (e.g. cancel or move all lessons after holidays)
+        All lessons are validated together and saved with one bulk_update;
+        if any lesson fails, nothing is saved and the per-ID errors are returned.
+        `delete` removes the owned lessons with one scoped DELETE and reports
+        unknown IDs per ID.
+
+        일괄 엔드포인트: 여러 수업의 상태를 설정하거나 날짜/시간을 이동하거나 삭제합니다.
+        (예: 휴가 후 모든 수업 취소 또는 이동)
+        모든 수업을 함께 검증하고 한 번의 bulk_update로 저장하며,
+        하나라도 실패하면 아무것도 저장하지 않고 ID별 오류를 반환합니다.
+        `delete`는 소유한 수업을 튜터 범위의 DELETE 한 번으로 삭제하고,
+        알 수 없는 ID는 ID별로 보고합니다.
+        """
+        serializer = LessonBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if data["delete"]:
+            results = bulk_delete_lessons(request.user, data["ids"])
+            deleted = sum(result["status"] == "deleted" for result in results)
+            return Response(
+                {"deleted": deleted, "results": results}, status=status.HTTP_200_OK
+            )
+
+        applied, results = bulk_change_lessons(
+            request.user,
+            data["ids"],
+            status=data.get("status"),
+            delta=timedelta(days=data["shift_days"], minutes=data["shift_minutes"]),
+        )
+        if not applied:
+            return Response(
+                {"updated": 0, "results": results}, status=status.HTTP_400_BAD_REQUEST
+            )
+        updated = sum(result["status"] == "updated" for result in results)
+        return Response({"updated": updated, "results": results}, status=status.HTTP_200_OK)
+
 
 class DashboardStatsView(APIView):
     """
@@ -422,7 +668,66 @@ class DashboardStatsView(APIView):
         )
 
 
-class TodoViewSet(viewsets.ModelViewSet):
+class SearchView(APIView):
+    """
+    Unified full-text search across students, lessons, todos and invoices.
+    Results are ranked and grouped by type (one query per type).
+    URL: /api/search/?q=grammatik&types=lessons,todos&limit=10
+
+    학생, 수업, 투두, 영수증을 통합 검색하는 전문 검색 API.
+    결과는 순위순으로 정렬되어 유형별로 묶임 (유형별 쿼리 하나).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+
+        types = [
+            name.strip()
+            for name in request.query_params.get("types", "").split(",")
+            if name.strip()
+        ]
+        unknown = [name for name in types if name not in SEARCH_DOCUMENTS]
+        if unknown:
+            return Response(
+                {"types": _("Unbekannte Suchtypen: %(names)s") % {"names": ", ".join(unknown)}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            return Response(
+                {"limit": _("Ungültiges Limit.")}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {"query": query, "results": search(request.user, query, types or None, limit)}
+        )
+
+
+class RevenueAnalyticsView(APIView):
+    """
+    Revenue and receivables analytics over an arbitrary range of finalized invoices:
+    monthly invoiced/paid/outstanding amounts and VAT (with running totals),
+    overall totals and a per-student revenue ranking.
+    URL: /api/analytics/revenue/?start=2025-01-01&end=2026-12-31&limit=10
+
+    확정 영수증에 대한 임의 기간의 매출 및 미수금 분석 API:
+    월별 청구액/입금액/미수금 및 부가세(누적 합계 포함), 전체 합계,
+    학생별 매출 순위를 반환함.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        serializer = RevenueAnalyticsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(revenue_report(request.user, **serializer.validated_data))
+
+
+class TodoViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Todos.
     Allows Tutors to manage their own tasks with advanced filtering and sorting.
@@ -626,7 +931,7 @@ class ExamStatsView(APIView):
         )
 
 
-class ExamDetailResultViewSet(viewsets.ModelViewSet):
+class ExamDetailResultViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing detailed exam results (O/X).
     Handles creation and updates of individual question results.
@@ -638,6 +943,10 @@ class ExamDetailResultViewSet(viewsets.ModelViewSet):
     serializer_class = ExamDetailResultSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "exam_section__updated_at")
+
     # 대량 생성을 위한 필터링 등은 필요 시 추가, 기본 CRUD만 있어도 됨
     def get_queryset(self):
         """
@@ -647,7 +956,7 @@ class ExamDetailResultViewSet(viewsets.ModelViewSet):
 
         return ExamDetailResult.objects.filter(
             exam_record__student__tutor=self.request.user
-        )
+        ).select_related("exam_section")
 
     def create(self, request, *args, **kwargs):
         """
@@ -676,7 +985,7 @@ class ExamDetailResultViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status_code)
 
 
-class ExamScoreInputViewSet(viewsets.ModelViewSet):
+class ExamScoreInputViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing subjective score inputs.
     Handles scores for Writing/Speaking sections where partial points are possible.
@@ -688,6 +997,10 @@ class ExamScoreInputViewSet(viewsets.ModelViewSet):
     serializer_class = ExamScoreInputSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "exam_section__updated_at")
+
     def get_queryset(self):
         """
         Retrieve score inputs only for the logged-in tutor's students.
@@ -699,7 +1012,7 @@ class ExamScoreInputViewSet(viewsets.ModelViewSet):
 
         return ExamScoreInput.objects.filter(
             exam_record__student__tutor=self.request.user
-        )
+        ).select_related("exam_section")
 
     def create(self, request, *args, **kwargs):
         """
@@ -771,7 +1084,10 @@ class CustomUserDetailsView(UserDetailsView):
         user = self.request.user
 
         if user.is_authenticated:
-            user.delete()
+            # Deactivate now; the data is purged in chunks by `purge_deleted_accounts`
+            # 즉시 비활성화하고, 데이터는 `purge_deleted_accounts`가 청크 단위로 삭제
+            user.mark_for_deletion()
+            invalidate_cached_tutor(user.pk)
             response = Response(
                 {"detail": _("Ihr Konto wurde erfolgreich gelöscht.")},
                 status=status.HTTP_204_NO_CONTENT,
@@ -847,9 +1163,8 @@ class BusinessProfileDetailView(APIView):
         if data.get("logo") == "DELETE":
             try:
                 profile = BusinessProfile.objects.get(tutor=user)
-                # Delete file from storage but keep the record
-                # 저장소에서 파일은 삭제하지만 DB 레코드는 유지
-                profile.logo.delete(save=False)
+                # Clear the logo but keep the record (the stored blob is released on save)
+                # 로고만 비우고 DB 레코드는 유지 (저장 시 블롭 참조가 해제됨)
                 profile.logo = None
                 profile.save()
             except BusinessProfile.DoesNotExist:
@@ -879,7 +1194,7 @@ class BusinessProfileDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class InvoiceViewSet(viewsets.ModelViewSet):
+class InvoiceViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Invoices.
     Handles CRUD operations, PDF generation, and sequence management.
@@ -891,6 +1206,10 @@ class InvoiceViewSet(viewsets.ModelViewSet):
     serializer_class = InvoiceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Related rows read by the serializer also count for the ETag
+    # 시리얼라이저가 읽는 관련 행도 ETag에 반영
+    conditional_timestamps = ("updated_at", "student__updated_at")
+
     def get_queryset(self):
         """
         Retrieve invoices only for the logged-in tutor.
@@ -1064,7 +1383,9 @@ class InvoiceViewSet(viewsets.ModelViewSet):
                     next_sequence,
                     self._extract_invoice_code_suffix(draft_invoice.full_invoice_code),
                 )
-                draft_invoice.save(update_fields=["invoice_number", "full_invoice_code"])
+                draft_invoice.save(
+                    update_fields=["invoice_number", "full_invoice_code", "updated_at"]
+                )
 
             assigned_numbers.add(next_sequence)
             next_sequence += 1
@@ -1078,7 +1399,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         next_sequence = self._find_next_available_sequence(profile, start_sequence)
         if profile.next_invoice_number != next_sequence:
             profile.next_invoice_number = next_sequence
-            profile.save(update_fields=["next_invoice_number"])
+            profile.save(update_fields=["next_invoice_number", "updated_at"])
 
     def _normalize_recipient_address(self, raw_address):
         """
@@ -1088,20 +1409,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         수신자 주소를 JSON 문자열 또는 객체 입력 모두에서 정규화합니다.
         렌더링과 저장에 사용할 고정된 딕셔너리 형태로 반환합니다.
         """
-        if isinstance(raw_address, str):
-            try:
-                raw_address = json.loads(raw_address)
-            except json.JSONDecodeError:
-                raw_address = {}
-        elif not isinstance(raw_address, dict):
-            raw_address = {}
-
-        return {
-            "street": str(raw_address.get("street", "") or ""),
-            "zip": str(raw_address.get("zip", "") or ""),
-            "city": str(raw_address.get("city", "") or ""),
-            "country": str(raw_address.get("country", "") or ""),
-        }
+        return normalize_recipient_address(raw_address)
 
     def _save_invoice(self, request, finalize):
         """
@@ -1192,7 +1500,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             seq = self._find_next_available_sequence(profile, profile.next_invoice_number)
             if seq != profile.next_invoice_number:
                 profile.next_invoice_number = seq
-                profile.save(update_fields=["next_invoice_number"])
+                profile.save(update_fields=["next_invoice_number", "updated_at"])
             now = datetime.now()
             # YYMM format
             # YYMM 포맷 (예: 2602)
@@ -1271,47 +1579,193 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         """
         return self._save_invoice(request, finalize=True)
 
+    def _finalize_draft(self, invoice, profile):
+        """
+        Finalize a stored draft through the same serializer validation and save path as
+        `create_full`. Returns the validation errors, or None once the draft is finalized.
+
+        저장된 드래프트를 `create_full`과 동일한 시리얼라이저 검증 및 저장 흐름으로
+        확정합니다. 검증 오류를 반환하며, 확정에 성공하면 None을 반환합니다.
+        """
+        sender_data = BusinessProfileSerializer(profile).data
+        data = dict(InvoiceSerializer(invoice).data)
+        data["sender_data"] = sender_data
+        data["is_small_business"] = profile.is_small_business
+        data["is_finalized"] = True
+
+        serializer = InvoiceSerializer(
+            invoice, data=data, context=self.get_serializer_context()
+        )
+        if not serializer.is_valid():
+            return serializer.errors
+        serializer.save(
+            sender_data=sender_data,
+            is_small_business=profile.is_small_business,
+            is_finalized=True,
+        )
+        return None
+
     @action(detail=False, methods=["post"])
-    def preview_pdf(self, request):
+    @transaction.atomic
+    def bulk(self, request):
+        """
+        Finalize drafts and change the payment/sent status of many invoices in one
+        transaction. One SELECT reads the owned invoices and a single
+        `UPDATE ... WHERE id IN` scoped to the tutor changes the status flags; the
+        response lists a result per requested ID.
+        Drafts are only accepted with `is_finalized` and are finalized one by one
+        through `_finalize_draft`, since finalization validates and recalculates each
+        invoice and queues its archival PDF.
+
+        여러 영수증의 드래프트 확정과 결제/발송 상태 변경을 하나의 트랜잭션으로 처리합니다.
+        소유한 영수증을 한 번의 SELECT로 조회하고, 튜터 범위로 제한된 단일
+        `UPDATE ... WHERE id IN`으로 상태 값을 변경하며, 응답에 요청한 ID별 결과를 반환합니다.
+        드래프트는 `is_finalized`를 지정한 경우에만 허용되며, 확정 시 영수증마다 검증과
+        재계산, 보관용 PDF 대기열 등록이 필요하므로 `_finalize_draft`로 하나씩 확정합니다.
+        """
+        serializer = InvoiceBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.pop("ids")
+        finalize = serializer.validated_data.pop("is_finalized", False)
+        changes = serializer.validated_data
+
+        owned = {
+            row["pk"]: row
+            for row in Invoice.objects.filter(tutor=request.user, pk__in=ids).values(
+                "pk", "is_finalized", *changes
+            )
+        }
+
+        drafts = {}
+        profile = None
+        draft_ids = [pk for pk, row in owned.items() if not row["is_finalized"]]
+        if finalize and draft_ids:
+            try:
+                profile = self._get_business_profile(request.user)
+            except BusinessProfile.DoesNotExist:
+                return Response(
+                    {
+                        "detail": _(
+                            "Bitte vervollständigen Sie zuerst Ihr Geschäftsprofil (Einstellungen)."
+                        )
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            drafts = Invoice.objects.select_for_update().filter(
+                tutor=request.user, is_finalized=False, pk__in=draft_ids
+            ).in_bulk()
+
+        results = []
+        changed_ids = []
+        for pk in ids:
+            row = owned.get(pk)
+            if row is None:
+                results.append(
+                    {"id": pk, "status": "error", "detail": _("Rechnung nicht gefunden.")}
+                )
+                continue
+            if not row["is_finalized"]:
+                if not finalize:
+                    results.append(
+                        {
+                            "id": pk,
+                            "status": "error",
+                            "detail": _("Der Status von Entwürfen kann nicht geändert werden."),
+                        }
+                    )
+                    continue
+                if pk not in drafts:
+                    results.append(
+                        {"id": pk, "status": "error", "detail": _("Rechnung nicht gefunden.")}
+                    )
+                    continue
+                errors = self._finalize_draft(drafts[pk], profile)
+                if errors:
+                    results.append({"id": pk, "status": "error", "detail": errors})
+                    continue
+                results.append({"id": pk, "status": "updated"})
+                if any(row[field] != value for field, value in changes.items()):
+                    changed_ids.append(pk)
+            elif all(row[field] == value for field, value in changes.items()):
+                results.append({"id": pk, "status": "unchanged"})
+            else:
+                results.append({"id": pk, "status": "updated"})
+                changed_ids.append(pk)
+
+        if changed_ids:
+            # Queryset update skips auto_now; `updated_at` is set for ETags and analytics keys
+            # QuerySet update는 auto_now를 건너뛰므로 ETag 및 분석 캐시 키를 위해 직접 설정
+            Invoice.objects.filter(
+                tutor=request.user, is_finalized=True, pk__in=changed_ids
+            ).update(**changes, updated_at=timezone.now())
+
+        updated = sum(result["status"] == "updated" for result in results)
+        return Response({"updated": updated, "results": results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"])
+    def billing_run(self, request):
         """
-        Generate a PDF preview for the invoice without saving it.
-        Uses WeasyPrint to render HTML to PDF.
+        Monthly billing run: create draft invoices for all unbilled course registrations
+        (or completed lessons) of a month in one transaction.
+        With `preview` the invoices that would be created are listed without saving.
 
-        저장하지 않고 영수증 PDF 미리보기를 생성함.
-        WeasyPrint를 사용하여 HTML을 PDF로 렌더링함.
+        월간 일괄 정산: 해당 월의 모든 미청구 수강 등록(또는 완료된 수업)에 대한
+        임시저장 영수증을 하나의 트랜잭션으로 생성합니다.
+        `preview`이면 저장하지 않고 생성될 영수증 목록만 반환합니다.
         """
-        if HTML is None:
+        serializer = BillingRunSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            result = run_billing(request.user, **serializer.validated_data)
+        except BusinessProfile.DoesNotExist:
             return Response(
-                {"detail": _("WeasyPrint-Bibliothek ist nicht installiert.")},
-                status=500,
+                {
+                    "detail": _(
+                        "Bitte vervollständigen Sie zuerst Ihr Geschäftsprofil (Einstellungen)."
+                    )
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = request.data
-        user = request.user
+        created = not result["preview"] and result["invoices"]
+        return Response(
+            result, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
 
-        # Helper function: Format number to German standard (e.g., 1.000,00)
-        # 헬퍼 함수: 독일 표준 숫자 형식으로 변환 (예: 1.000,00)
-        def format_de(value):
-            if value is None:
-                return "0,00"
-            try:
-                val = Decimal(str(value))
-            except:
-                return "0,00"
-            s = "{:,.2f}".format(val)
-            # Swap dots and commas
-            # 점과 쉼표를 교체
-            return s.replace(",", "X").replace(".", ",").replace("X", ".")
-
-        # Helper function: Format date to German standard (DD.MM.YYYY)
-        # 헬퍼 함수: 독일 표준 날짜 형식으로 변환 (DD.MM.YYYY)
-        def format_date_de(date_str):
-            if not date_str:
-                return ""
-            try:
-                return datetime.strptime(date_str, "%Y-%m-%d").strftime("%d.%m.%Y")
-            except:
-                return date_str
+    @action(detail=False, methods=["get"])
+    def datev_export(self, request):
+        """
+        Stream the finalized invoices of a quarter (?year=&quarter=) or date range
+        (?start=&end=) as DATEV-style CSV, one booking row per invoice and VAT rate.
+        Rows are generated while the response is sent, so memory and time to first
+        byte stay flat for long periods.
+
+        분기(?year=&quarter=) 또는 기간(?start=&end=)의 확정 영수증을 DATEV 형식 CSV로
+        스트리밍하며, 영수증 및 부가세율마다 분개 행 하나를 생성합니다.
+        응답 전송 중에 행을 생성하므로 긴 기간에도 메모리 사용량과 첫 바이트까지의
+        시간이 일정하게 유지됩니다.
+        """
+        serializer = AccountingExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        start = serializer.validated_data["start"]
+        end = serializer.validated_data["end"]
+
+        response = StreamingHttpResponse(
+            stream_datev_csv(export_invoices(request.user, start, end)),
+            content_type="text/csv; charset=windows-1252",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="DATEV_Buchungsstapel_{start:%Y%m%d}_{end:%Y%m%d}.csv"'
+        )
+        return response
+
+    def _preview_context(self, data, user):
+        """
+        Build the invoice template context from an unsaved invoice payload.
+
+        저장되지 않은 영수증 요청 데이터로 영수증 템플릿 컨텍스트를 생성함.
+        """
 
         # Fetch Business Profile for sender data
         # 발신자 데이터 구성을 위한 비즈니스 프로필 조회
@@ -1373,10 +1827,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         # Infer salutation from header text if not set
         # 설정되지 않은 경우 헤더 텍스트에서 인사말 추론
         if not recipient_salutation:
-            if "Frau" in header_text and "Herr" not in header_text:
-                recipient_salutation = "Frau"
-            elif "Herr" in header_text and "Frau" not in header_text:
-                recipient_salutation = "Herr"
+            recipient_salutation = infer_salutation(header_text)
 
         recipient_data = {
             "name": recipient_name,
@@ -1423,13 +1874,6 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         )
         items_data = []
 
-        UNIT_TRANS = {
-            "DAY": "Tag(e)",
-            "HOUR": "Std.",
-            "PIECE": "Stk.",
-            "FLAT_RATE": "pauschal",
-        }
-
         for item in calculated["items"]:
             raw_unit = item["unit"]
 
@@ -1437,7 +1881,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
                 {
                     "description": item["description"],
                     "quantity": format_de(item["quantity"]),
-                    "unit_display": UNIT_TRANS.get(raw_unit, raw_unit),
+                    "unit_display": UNIT_LABELS.get(raw_unit, raw_unit),
                     "unit_price": format_de(item["unit_price"]),
                     "discount_value": format_de(item["discount_value"]),
                     "discount_unit": item["discount_unit"],
@@ -1469,7 +1913,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             "invoice_date": invoice_date,
             "delivery_date": delivery_text,
             "subject": data.get("subject", ""),
-            "header_text": header_text,
+            "header_text": sanitize_rich_text(header_text),
             "footer_text": raw_footer,
             "sender": sender_data,
             "recipient": recipient_data,
@@ -1483,10 +1927,46 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             "due_date": formatted_due_date,
         }
 
-        # Render HTML and create PDF
-        # HTML 렌더링 및 PDF 생성
-        html_string = render_to_string("invoices/invoice_pdf.html", context)
-        pdf_file = HTML(string=html_string).write_pdf()
+        return context
+
+    @action(detail=False, methods=["post"])
+    def preview_html(self, request):
+        """
+        Render the invoice preview as HTML without saving it (no PDF rendering).
+        Identical previews are rendered once and served from the cache.
+
+        저장하지 않고 영수증 미리보기를 HTML로 렌더링함 (PDF 렌더링 없음).
+        동일한 미리보기는 한 번만 렌더링되고 이후에는 캐시에서 제공됨.
+        """
+        context = self._preview_context(request.data, request.user)
+        html_string = cached_preview("html", context, render_invoice_html)
+        response = HttpResponse(html_string, content_type="text/html; charset=utf-8")
+        # The preview contains user-entered rich text; never run it with the app's privileges
+        # 미리보기에는 사용자가 입력한 서식 텍스트가 포함되므로 앱 권한으로 실행되지 않도록 함
+        response["Content-Security-Policy"] = "sandbox"
+        return response
+
+    @action(detail=False, methods=["post"])
+    def preview_pdf(self, request):
+        """
+        Generate a PDF preview for the invoice without saving it.
+        Uses WeasyPrint to render HTML to PDF; identical previews are rendered once.
+
+        저장하지 않고 영수증 PDF 미리보기를 생성함.
+        WeasyPrint를 사용하여 HTML을 PDF로 렌더링하며, 동일한 미리보기는 한 번만 렌더링함.
+        """
+        if HTML is None:
+            return Response(
+                {"detail": _("WeasyPrint-Bibliothek ist nicht installiert.")},
+                status=500,
+            )
+
+        context = self._preview_context(request.data, request.user)
+        pdf_file = cached_preview(
+            "pdf",
+            context,
+            lambda context: HTML(string=render_invoice_html(context)).write_pdf(),
+        )
 
         # Return PDF file response
         # PDF 파일 응답 반환
@@ -1498,17 +1978,13 @@ class InvoiceViewSet(viewsets.ModelViewSet):
     def download_pdf(self, request, pk=None):
         """
         Download PDF for an existing invoice.
-        Fetches data from the database and renders the PDF.
+        Serves the archived PDF/A when it exists, otherwise (archive still pending)
+        fetches data from the database and renders the PDF.
 
         기존 영수증에 대한 PDF 다운로드.
-        데이터베이스에서 데이터를 가져와 PDF를 렌더링함.
+        보관된 PDF/A가 있으면 저장된 파일을 제공하고,
+        없으면(보관 대기 중) 데이터베이스에서 데이터를 가져와 PDF를 렌더링함.
         """
-        if HTML is None:
-            return Response(
-                {"detail": _("WeasyPrint-Bibliothek ist nicht installiert.")},
-                status=500,
-            )
-
         invoice = self.get_object()
 
         if not invoice.is_finalized:
@@ -1517,140 +1993,102 @@ class InvoiceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Helper: Format Number
-        # 헬퍼: 숫자 포맷팅
-        def format_de(value):
-            if value is None:
-                return "0,00"
-            try:
-                val = Decimal(str(value))
-            except:
-                return "0,00"
-            s = "{:,.2f}".format(val)
-            return s.replace(",", "X").replace(".", ",").replace("X", ".")
-
-        # Helper: Format Date
-        # 헬퍼: 날짜 포맷팅
-        def format_date_de(d):
-            if not d:
-                return ""
-            return d.strftime("%d.%m.%Y")
-
-        # Use stored snapshot data if available, else fetch current profile
-        # 저장된 스냅샷 데이터가 있으면 사용하고, 없으면 현재 프로필 조회
-        sender_data = invoice.sender_data
-
-        if not sender_data:
-            try:
-                profile = BusinessProfile.objects.get(tutor=invoice.tutor)
-                sender_data = BusinessProfileSerializer(profile).data
-            except BusinessProfile.DoesNotExist:
-                sender_data = {}
+        filename = invoice_pdf_filename(invoice)
+        if invoice.archived_pdf_status == Invoice.ArchiveStatusChoices.READY:
+            response = media_response(
+                request, invoice.archived_pdf.storage, invoice.archived_pdf.name, filename
+            )
+            response["ETag"] = f'"{invoice.archived_pdf_sha256}"'
+            return response
 
-        r_addr = self._normalize_recipient_address(invoice.recipient_address)
+        if HTML is None:
+            return Response(
+                {"detail": _("WeasyPrint-Bibliothek ist nicht installiert.")},
+                status=500,
+            )
 
-        # Determine Salutation
-        # 인사말 결정
-        header_text = invoice.header_text or ""
-        recipient_salutation = ""
-        if "Frau" in header_text and "Herr" not in header_text:
-            recipient_salutation = "Frau"
-        elif "Herr" in header_text and "Frau" not in header_text:
-            recipient_salutation = "Herr"
+        context = build_invoice_context(invoice)
 
-        customer_no = ""
-        if invoice.student and invoice.student.customer_number:
-            customer_no = invoice.student.customer_number
+        html_string = render_invoice_html(context)
+        pdf_file = HTML(string=html_string).write_pdf()
 
-        recipient_data = {
-            "name": invoice.recipient_name,
-            "salutation": recipient_salutation,
-            "customer_no": customer_no,
-            "street": r_addr.get("street", ""),
-            "zip": r_addr.get("zip", ""),
-            "city": r_addr.get("city", ""),
-            "country": r_addr.get("country", ""),
-        }
+        response = HttpResponse(pdf_file, content_type="application/pdf")
+        response["Content-Disposition"] = f'inline; filename="{filename}"'
+        return response
 
-        # Footer Processing
-        # 푸터 처리
-        raw_footer = invoice.footer_text or ""
-        formatted_due_date = format_date_de(invoice.due_date)
-        raw_footer = raw_footer.replace("[%ZAHLUNGSZIEL%]", formatted_due_date)
-        raw_footer = raw_footer.replace(
-            "[%KONTAKTPERSON%]", sender_data.get("manager_name", "")
-        )
 
-        delivery_text = format_date_de(invoice.delivery_date_start)
-        if invoice.delivery_date_end:
-            delivery_text += f" - {format_date_de(invoice.delivery_date_end)}"
+class DataExportViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    ViewSet for full data exports (GDPR).
+    POST queues an export that is built in the background by `run_data_exports`;
+    GET reports status/progress and `download` returns the finished ZIP archive.
 
-        items_data = []
-        items_sum_decimal = Decimal("0.00")
+    전체 데이터 내보내기(GDPR)를 위한 ViewSet.
+    POST로 내보내기를 요청하면 `run_data_exports`가 백그라운드에서 생성하고,
+    GET으로 상태/진행률을 확인하며 `download`로 완성된 ZIP 파일을 받음.
+    """
 
-        UNIT_TRANS = {
-            "DAY": "Tag(e)",
-            "HOUR": "Std.",
-            "PIECE": "Stk.",
-            "FLAT_RATE": "pauschal",
-        }
+    serializer_class = DataExportSerializer
+    permission_classes = [permissions.IsAuthenticated]
 
-        for item in invoice.items.all():
-            items_sum_decimal += item.total_price
+    def get_queryset(self):
+        return DataExport.objects.filter(tutor=self.request.user)
 
-            items_data.append(
-                {
-                    "description": item.description,
-                    "quantity": format_de(item.quantity),
-                    "unit_display": UNIT_TRANS.get(item.unit, item.unit),
-                    "unit_price": format_de(item.unit_price),
-                    "discount_value": format_de(item.discount_value),
-                    "vat_rate": format_de(item.vat_rate),
-                    "total_price": format_de(item.total_price),
-                    "discount_unit": item.discount_unit,
-                }
-            )
+    def create(self, request, *args, **kwargs):
+        # Reuse an export that is still queued or running; abandoned ones do not count
+        # 대기 중이거나 진행 중인 내보내기가 있으면 재사용하며, 중단된 내보내기는 제외
+        expire_stale_exports(tutor=request.user)
+        active = self.get_queryset().filter(
+            status__in=[DataExport.StatusChoices.PENDING, DataExport.StatusChoices.RUNNING]
+        ).first()
+        if active:
+            return Response(self.get_serializer(active).data, status=status.HTTP_200_OK)
+
+        export = DataExport.objects.create(tutor=request.user)
+        return Response(self.get_serializer(export).data, status=status.HTTP_202_ACCEPTED)
 
-        processed_adjustments = []
-        for adj in invoice.adjustments.all():
-            processed_adjustments.append(
-                {
-                    "label": adj.label,
-                    "type": adj.type,
-                    "value": format_de(adj.value),
-                    "unit": adj.unit,
-                    "amount": format_de(adj.amount),
-                }
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        Download the finished export archive.
+        완성된 내보내기 아카이브를 다운로드합니다.
+        """
+        export = self.get_object()
+
+        if export.status != DataExport.StatusChoices.COMPLETED or not export.file:
+            return Response(
+                {"detail": _("Der Export ist noch nicht verfügbar.")},
+                status=status.HTTP_409_CONFLICT,
             )
 
-        filename = f"Rechnung_{invoice.full_invoice_code}.pdf"
+        return FileResponse(
+            export.file.open("rb"),
+            as_attachment=True,
+            filename=export.file.name.rsplit("/", 1)[-1],
+            content_type="application/zip",
+        )
 
-        context = {
-            "document_title": filename,
-            "invoice_number": invoice.full_invoice_code,
-            "invoice_date": format_date_de(invoice.invoice_date) or invoice.created_at.strftime("%d.%m.%Y"),
-            "delivery_date": delivery_text,
-            "subject": invoice.subject,
-            "header_text": invoice.header_text,
-            "footer_text": raw_footer,
-            "sender": sender_data,
-            "recipient": recipient_data,
-            "items": items_data,
-            "items_total": format_de(items_sum_decimal),
-            "subtotal": format_de(invoice.subtotal),
-            "vat_amount": format_de(invoice.vat_amount),
-            "total_amount": format_de(invoice.total_amount),
-            "adjustments": processed_adjustments,
-            "is_small_business": invoice.is_small_business,
-            "due_date": formatted_due_date,
-        }
 
-        html_string = render_to_string("invoices/invoice_pdf.html", context)
-        pdf_file = HTML(string=html_string).write_pdf()
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def protected_media(request, path):
+    """
+    Serve a file under MEDIA_ROOT only to the tutor who owns it.
+    Unknown files and files of other tutors both return 404.
 
-        response = HttpResponse(pdf_file, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{filename}"'
-        return response
+    MEDIA_ROOT 아래의 파일을 소유한 튜터에게만 제공합니다.
+    존재하지 않는 파일과 다른 튜터의 파일은 모두 404를 반환합니다.
+    """
+    owned = find_owned_file(request.user, path)
+    if owned is None:
+        raise Http404
+    storage, filename = owned
+    return media_response(request, storage, path, filename=filename)
 
 
 @api_view(["GET"])